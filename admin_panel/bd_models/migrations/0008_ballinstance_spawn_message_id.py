@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0007_player_trade_cooldown_policy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballinstance",
+            name="spawn_message_id",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="Discord message ID of the spawn this ball was caught from",
+                null=True,
+                unique=True,
+            ),
+        ),
+    ]
@@ -5,7 +5,7 @@ from typing import Iterable, cast
 
 from django.contrib import admin
 from django.core.cache import cache
-from django.db import models
+from django.db import connection, models
 from django.utils.safestring import SafeText, mark_safe
 from django.utils.timezone import now
 
@@ -22,6 +22,27 @@ def image_display(image_link: str) -> SafeText:
     return mark_safe(f'<img src="/media/{transform_media(image_link)}" width="80%" />')
 
 
+# listened to by the bot to drop its cached copy of a player, see PlayerCache
+PLAYER_CHANGE_CHANNEL = "ballsdex_player_change"
+
+
+def notify_player_change(discord_id: int):
+    # delivered when the transaction commits
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [PLAYER_CHANGE_CHANNEL, str(discord_id)])
+
+
+# listened to by the bot to reload the countryballs owned by a player, see OwnedBalls
+OWNED_CHANGE_CHANNEL = "ballsdex_owned_change"
+
+
+def notify_owned_change(*player_ids: int | None):
+    # delivered when the transaction commits
+    with connection.cursor() as cursor:
+        for player_id in set(player_ids) - {None}:
+            cursor.execute("SELECT pg_notify(%s, %s)", [OWNED_CHANGE_CHANNEL, str(player_id)])
+
+
 class GuildConfig(models.Model):
     guild_id = models.BigIntegerField(unique=True, help_text="Discord guild ID")
     spawn_channel = models.BigIntegerField(
@@ -105,6 +126,21 @@ class Player(models.Model):
             f"{self.pk} ({self.discord_id})"
         )
 
+    def save(
+        self,
+        force_insert: bool = False,
+        force_update: bool = False,
+        using: str | None = None,
+        update_fields: Iterable[str] | None = None,
+    ) -> None:
+        super().save(force_insert, force_update, using, update_fields)
+        notify_player_change(self.discord_id)
+
+    def delete(self, using: str | None = None, keep_parents: bool = False):
+        result = super().delete(using, keep_parents)
+        notify_player_change(self.discord_id)
+        return result
+
     class Meta:
         managed = True
         db_table = "player"
@@ -294,6 +330,35 @@ class BallInstance(models.Model):
         blank=True, null=True, help_text="If the instance was locked for a trade and when"
     )
     spawned_time = models.DateTimeField(blank=True, null=True)
+    spawn_message_id = models.BigIntegerField(
+        blank=True,
+        null=True,
+        unique=True,
+        help_text="Discord message ID of the spawn this ball was caught from",
+    )
+
+    @classmethod
+    def from_db(cls, db: str | None, field_names: list[str], values: list) -> BallInstance:
+        instance = super().from_db(db, field_names, values)
+        # the owner when loaded, who loses this countryball if it is given to another player
+        instance._loaded_player_id = instance.__dict__.get("player_id")
+        return instance
+
+    def save(
+        self,
+        force_insert: bool = False,
+        force_update: bool = False,
+        using: str | None = None,
+        update_fields: Iterable[str] | None = None,
+    ) -> None:
+        super().save(force_insert, force_update, using, update_fields)
+        notify_owned_change(self.player_id, getattr(self, "_loaded_player_id", None))
+        self._loaded_player_id = self.player_id
+
+    def delete(self, using: str | None = None, keep_parents: bool = False):
+        result = super().delete(using, keep_parents)
+        notify_owned_change(self.player_id)
+        return result
 
     def __str__(self) -> str:
         text = ""
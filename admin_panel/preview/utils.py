@@ -3,6 +3,7 @@ import os
 from tortoise import Tortoise
 
 from ballsdex.__main__ import init_tortoise
+from ballsdex.core.image_generator.service import RenderService
 from ballsdex.core.models import (
     Ball,
     Economy,
@@ -13,6 +14,11 @@ from ballsdex.core.models import (
     regimes,
     specials,
 )
+from ballsdex.settings import settings
+
+render_service = RenderService(
+    settings.render_workers, settings.render_queue_size, settings.render_layer_cache_size
+)
 
 
 async def refresh_cache():
@@ -1,10 +1,10 @@
 from django.contrib import messages
 from django.http import HttpRequest, HttpResponse
 
-from ballsdex.core.image_generator.image_gen import draw_card
+from ballsdex.core.image_generator.image_gen import build_card_spec
 from ballsdex.core.models import Ball, BallInstance, Special
 
-from .utils import refresh_cache
+from .utils import refresh_cache, render_service
 
 
 async def render_ballinstance(request: HttpRequest, ball_pk: int) -> HttpResponse:
@@ -12,11 +12,9 @@ async def render_ballinstance(request: HttpRequest, ball_pk: int) -> HttpRespons
 
     ball = await Ball.get(pk=ball_pk)
     instance = BallInstance(ball=ball)
-    image, kwargs = draw_card(instance, media_path="./media/")
+    buffer = await render_service.render(build_card_spec(instance, media_path="./media/"))
 
-    response = HttpResponse(content_type="image/png")
-    image.save(response, **kwargs)  # type: ignore
-    return response
+    return HttpResponse(buffer.getvalue(), content_type="image/webp")
 
 
 async def render_special(request: HttpRequest, special_pk: int) -> HttpResponse:
@@ -32,8 +30,6 @@ async def render_special(request: HttpRequest, special_pk: int) -> HttpResponse:
 
     special = await Special.get(pk=special_pk)
     instance = BallInstance(ball=ball, special=special)
-    image, kwargs = draw_card(instance, media_path="./media/")
+    buffer = await render_service.render(build_card_spec(instance, media_path="./media/"))
 
-    response = HttpResponse(content_type="image/png")
-    image.save(response, **kwargs)  # type: ignore
-    return response
+    return HttpResponse(buffer.getvalue(), content_type="image/webp")
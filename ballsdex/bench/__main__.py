@@ -0,0 +1,21 @@
+import argparse
+
+from ballsdex.bench import gateway, names, proposals, rarity, render, spawn, text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m ballsdex.bench", description="Performance benchmarks of BallsDex"
+    )
+    subparsers = parser.add_subparsers(required=True)
+    for module in (gateway, names, proposals, rarity, render, spawn, text):
+        name = module.__name__.rsplit(".", 1)[-1]
+        subparser = subparsers.add_parser(name, help=module.__doc__.strip().splitlines()[0])
+        module.add_arguments(subparser)
+        subparser.set_defaults(func=module.run)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
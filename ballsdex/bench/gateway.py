@@ -0,0 +1,261 @@
+"""
+Spawn message handling benchmark, with and without the gateway fast path.
+
+Feeds synthetic MESSAGE_CREATE payloads through the discord.py parser of a bot running the
+countryballs cog, for a mix of guilds with and without spawn and a share of bot messages.
+Each mode runs in a fresh process to report its events per second and memory usage.
+
+Usage: python -m ballsdex.bench gateway [-n 200000] [--guilds 5000] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+import discord
+from discord.ext import commands
+
+from ballsdex import __version__ as bot_version
+from ballsdex.bench.spawn import VirtualClockLoop
+from ballsdex.packages.countryballs.spawn import SpawnManager
+from ballsdex.settings import settings
+
+if TYPE_CHECKING:
+    from ballsdex.core.bot import BallsDexBot
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+BATCH_SIZE = 5000
+CONTENTS = ("hi", "lol", "what are you all doing today?", "https://example.com/some/link", "ok")
+
+
+class BenchBot(commands.Bot):
+    def __init__(self, fast_path: bool):
+        # same intents and prefix as BallsDexBot
+        intents = discord.Intents(
+            guilds=True, guild_messages=True, emojis_and_stickers=True, message_content=True
+        )
+        super().__init__(
+            commands.when_mentioned_or("b."),
+            intents=intents,
+            max_messages=None if fast_path else 1000,
+        )
+        self.blacklist_guild: set[int] = set()
+        self.owner_ids = set()
+
+
+class CountingManager(SpawnManager):
+    """
+    Runs the default spawn logic but never spawns, since there is no database here.
+    """
+
+    handled = 0
+
+    async def handle_message(self, message: discord.Message) -> bool:
+        self.handled += 1
+        await super().handle_message(message)
+        return False
+
+
+def guild_payload(guild_id: int, members: int) -> dict[str, Any]:
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {guild_id}",
+        "member_count": members,
+        "channels": [
+            {
+                "id": str(guild_id + 1),
+                "type": 0,
+                "name": "general",
+                "position": 0,
+                "permission_overwrites": [],
+            }
+        ],
+        "roles": [],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "members": [],
+    }
+
+
+def message_payload(
+    message_id: int, guild_id: int, author_id: int, bot: bool, content: str
+) -> dict[str, Any]:
+    # what discord sends for a plain message in a guild text channel
+    return {
+        "id": str(message_id),
+        "channel_id": str(guild_id + 1),
+        "guild_id": str(guild_id),
+        "author": {
+            "id": str(author_id),
+            "username": f"user{author_id}",
+            "discriminator": "0",
+            "avatar": "a" * 32,
+            "global_name": f"User {author_id}",
+            "public_flags": 0,
+            "bot": bot,
+        },
+        "member": {
+            "roles": [],
+            "joined_at": "2024-01-01T00:00:00.000000+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+            "nick": None,
+        },
+        "content": content,
+        "timestamp": "2025-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+        "components": [],
+    }
+
+
+def rss_kb() -> int | None:
+    # current resident memory, Linux only
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * resource.getpagesize() // 1024
+
+
+async def bench_mode(args: argparse.Namespace, fast_path: bool) -> dict[str, Any]:
+    # imported here so that the setting is read by the cog
+    from ballsdex.packages.countryballs.cog import CountryBallsSpawner
+
+    settings.spawn_fast_path = fast_path
+    settings.spawn_state_path = None
+    rng = random.Random(args.seed)
+
+    bot = BenchBot(fast_path)
+    # normally done on login
+    await bot._async_setup_hook()
+    state = bot._connection
+    state.user = discord.ClientUser(
+        state=state,
+        data={"id": "1", "username": "BallsDex", "discriminator": "0", "avatar": None},
+    )
+
+    cog = CountryBallsSpawner(cast("BallsDexBot", bot))
+    manager = CountingManager(cast("BallsDexBot", bot))
+    cog.spawn_manager = manager
+    await bot.add_cog(cog)
+
+    guild_ids: list[int] = []
+    for i in range(args.guilds):
+        guild_id = (i + 1) << 32
+        state._add_guild_from_data(guild_payload(guild_id, rng.randint(2, 20000)))  # type: ignore
+        guild_ids.append(guild_id)
+        if rng.random() < args.enabled:
+            cog.cache[guild_id] = guild_id + 1
+
+    rss_before = rss_kb()
+    parser = state.parsers["MESSAGE_CREATE"]
+    duration = 0.0
+    done = 0
+    while done < args.n:
+        batch = []
+        for i in range(done, min(done + BATCH_SIZE, args.n)):
+            created_at = EPOCH + timedelta(seconds=i / args.rate)
+            batch.append(
+                message_payload(
+                    discord.utils.time_snowflake(created_at) + i % 4096,
+                    rng.choice(guild_ids),
+                    rng.randint(10, 10_000_000),
+                    rng.random() < args.bots,
+                    rng.choice(CONTENTS),
+                )
+            )
+        t1 = time.perf_counter()
+        for data in batch:
+            parser(data)
+        # run the dispatched listeners, the clock is virtual so the cooldowns pass instantly
+        await asyncio.sleep(11)
+        duration += time.perf_counter() - t1
+        done += len(batch)
+
+    rss_after = rss_kb()
+    await bot.remove_cog(cog.qualified_name)
+    return {
+        "fast_path": fast_path,
+        "events": args.n,
+        "events_per_second": round(args.n / duration),
+        "handled_messages": manager.handled,
+        "message_cache": len(state._messages) if state._messages is not None else None,
+        "rss_before_kb": rss_before,
+        "rss_after_kb": rss_after,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_mode(args: argparse.Namespace, fast_path: bool) -> dict[str, Any]:
+    return asyncio.run(bench_mode(args, fast_path), loop_factory=VirtualClockLoop)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=200_000, help="Number of messages")
+    parser.add_argument("--guilds", type=int, default=5000, help="Number of guilds")
+    parser.add_argument(
+        "--enabled", type=float, default=0.3, help="Fraction of guilds with spawn enabled"
+    )
+    parser.add_argument(
+        "--bots", type=float, default=0.1, help="Fraction of messages sent by bots"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=100, help="Messages per second across all guilds"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated messages")
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON results to this file instead of stdout"
+    )
+
+
+def run(args: argparse.Namespace):
+    results: dict[str, Any] = {
+        "version": bot_version,
+        "python": sys.version.split()[0],
+        "discord.py": discord.__version__,
+        "modes": [],
+    }
+    for fast_path in (False, True):
+        print(f"Benchmarking with fast path {'on' if fast_path else 'off'}...", file=sys.stderr)
+        # a fresh process for each mode, so that memory usage is comparable
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results["modes"].append(pool.submit(run_mode, args, fast_path).result())
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    for mode in results["modes"]:
+        print(
+            f"fast path {'on ' if mode['fast_path'] else 'off'}: "
+            f"{mode['events_per_second']} events/s  peak RSS {mode['peak_rss_kb']} KB",
+            file=sys.stderr,
+        )
+    handled = {mode["handled_messages"] for mode in results["modes"]}
+    if len(handled) > 1:
+        print("Both modes did not handle the same messages", file=sys.stderr)
+        sys.exit(1)
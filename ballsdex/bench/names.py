@@ -0,0 +1,199 @@
+"""
+Catch name matching benchmark.
+
+Generates guesses the way players type them (case, spacing, accents, curly quotes, dashes,
+fullwidth forms, typos and other balls' names) and compares the previous matching code with
+the normalized name index, for both speed and which guesses are accepted. Autocompletion
+searches are timed as well.
+
+Usage: python -m ballsdex.bench names [-n 200000] [--balls 800]
+"""
+
+import argparse
+import json
+import random
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Callable, cast
+
+from ballsdex.core.models import Ball
+from ballsdex.core.utils.names import NameIndex, normalize_name
+
+COUNTRIES = (
+    "Côte d'Ivoire",
+    "São Tomé and Príncipe",
+    "Curaçao",
+    "Åland",
+    "Réunion",
+    "Guinea-Bissau",
+    "Timor-Leste",
+    "Türkiye",
+    "México",
+    "España",
+    "Perú",
+    "Österreich",
+    "Saint Barthélemy",
+    "Bosnia and Herzegovina",
+    "United Kingdom",
+    "Papua New Guinea",
+    "Trinidad and Tobago",
+    "Hawai'i",
+    "Antigua and Barbuda",
+    "Saint Kitts and Nevis",
+    "France",
+    "Germany",
+    "Japan",
+    "Brazil",
+    "Iceland",
+    "Liechtenstein",
+)
+TRANSLATIONS = ("Elfenbeinküste", "Costa d'Avorio", "Kôte-d'Ivwar", "Perù", "Ísland", "Türkei")
+
+
+@dataclass(frozen=True)
+class FakeBall:
+    pk: int
+    country: str
+    catch_names: str | None
+    translations: str | None
+
+
+def build_balls(count: int, rng: random.Random) -> list[FakeBall]:
+    balls: list[FakeBall] = []
+    for i in range(count):
+        country = COUNTRIES[i % len(COUNTRIES)]
+        if i >= len(COUNTRIES):
+            country += f" {i // len(COUNTRIES)}"
+        # stored lowercased, like the save signal of Ball does
+        catch_names = ";".join(rng.sample((country[:4], country.split()[0], "cb"), k=2)).lower()
+        translations = ";".join(rng.sample(TRANSLATIONS, k=2)).lower()
+        balls.append(FakeBall(i, country, catch_names, translations))
+    return balls
+
+
+def strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def fullwidth(text: str) -> str:
+    return "".join(chr(ord(c) + 0xFEE0) if "!" <= c <= "~" else c for c in text)
+
+
+def typo(text: str) -> str:
+    return text[:-1] if len(text) > 3 else text + "x"
+
+
+MUTATIONS: dict[str, Callable[[str], str]] = {
+    "exact": lambda x: x,
+    "lowercase": str.lower,
+    "uppercase": str.upper,
+    "spacing": lambda x: "  " + x.replace(" ", "   ") + " ",
+    "curly_quotes": lambda x: x.replace("'", "’"),
+    "no_accents": strip_accents,
+    "en_dash": lambda x: x.replace("-", "–"),
+    "fullwidth": fullwidth,
+    "typo": typo,
+}
+
+
+def legacy_is_name_valid(ball: FakeBall, text: str) -> bool:
+    # BallSpawnView.is_name_valid before the name index
+    if ball.catch_names:
+        possible_names = (ball.country.lower(), *ball.catch_names.split(";"))
+    else:
+        possible_names = (ball.country.lower(),)
+    if ball.translations:
+        possible_names += tuple(x.lower() for x in ball.translations.split(";"))
+    cname = text.lower().strip()
+    cname = cname.replace("’", "'")
+    cname = cname.replace("‘", "'")
+    cname = cname.replace("“", '"')
+    cname = cname.replace("”", '"')
+    return cname in possible_names
+
+
+def build_guesses(
+    balls: list[FakeBall], n: int, rng: random.Random
+) -> list[tuple[str, FakeBall, str]]:
+    guesses: list[tuple[str, FakeBall, str]] = []
+    for _ in range(n):
+        ball = rng.choice(balls)
+        if rng.random() < 0.1:
+            # someone guessing another ball
+            guesses.append(("other_ball", ball, rng.choice(balls).country))
+            continue
+        kind = rng.choice(tuple(MUTATIONS))
+        name = rng.choice((ball.country, *(ball.translations or "").split(";")))
+        guesses.append((kind, ball, MUTATIONS[kind](name)))
+    return guesses
+
+
+def bench_match(
+    guesses: list[tuple[str, FakeBall, str]], match: Callable[[FakeBall, str], bool]
+) -> tuple[int, dict[str, float]]:
+    t1 = time.perf_counter()
+    results = [match(ball, text) for _, ball, text in guesses]
+    duration = time.perf_counter() - t1
+
+    accepted: dict[str, list[bool]] = {}
+    for (kind, _, _), result in zip(guesses, results):
+        accepted.setdefault(kind, []).append(result)
+    return round(len(guesses) / duration), {
+        kind: round(sum(x) / len(x), 3) for kind, x in sorted(accepted.items())
+    }
+
+
+def bench_search(balls: list[FakeBall], index: NameIndex, queries: list[str]) -> dict[str, Any]:
+    # TTLModelTransformer before the index: lowercased country names only
+    search_map = {ball: ball.country.lower() for ball in balls}
+    t1 = time.perf_counter()
+    for query in queries:
+        [ball for ball in balls if query.lower() in search_map[ball]][:25]
+    legacy = time.perf_counter() - t1
+
+    t1 = time.perf_counter()
+    for query in queries:
+        index.search(cast(list[Ball], balls), query)
+    duration = time.perf_counter() - t1
+    return {
+        "queries": len(queries),
+        "legacy_queries_per_second": round(len(queries) / legacy),
+        "index_queries_per_second": round(len(queries) / duration),
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=200_000, help="Number of guesses")
+    parser.add_argument("--balls", type=int, default=800, help="Number of generated balls")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated guesses")
+
+
+def run(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    balls = build_balls(args.balls, rng)
+    t1 = time.perf_counter()
+    index = NameIndex(cast(list[Ball], balls))
+    build_ms = (time.perf_counter() - t1) * 1000
+
+    guesses = build_guesses(balls, args.n, rng)
+    legacy_speed, legacy_accepted = bench_match(guesses, legacy_is_name_valid)
+    normalize_name.cache_clear()
+    index_speed, index_accepted = bench_match(
+        guesses, lambda ball, text: index.matches(cast(Ball, ball), text)
+    )
+    cache = normalize_name.cache_info()
+    queries = [text[: rng.randint(1, 6)] for _, _, text in guesses[:2000]]
+    results = {
+        "balls": len(balls),
+        "index_build_ms": round(build_ms, 2),
+        "guesses": len(guesses),
+        "legacy": {"guesses_per_second": legacy_speed, "accepted": legacy_accepted},
+        "index": {
+            "guesses_per_second": index_speed,
+            "accepted": index_accepted,
+            "normalize_cache_hit_rate": round(cache.hits / (cache.hits + cache.misses), 3),
+        },
+        "autocomplete": bench_search(balls, index, queries),
+    }
+    print(json.dumps(results, indent=2))
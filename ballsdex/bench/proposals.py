@@ -0,0 +1,216 @@
+"""
+Trade and bet embed building benchmark.
+
+Builds the embed of a trade between two proposals of countryballs, with the previous code
+which renders every line on each refresh (and a second time when the embed is too long), then
+with the cached proposal text: from scratch, unchanged, and with one side changing.
+
+Usage: python -m ballsdex.bench proposals [-n 50] [--balls 1000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, cast
+
+import discord
+from tortoise import Tortoise
+
+from ballsdex.core.models import Ball, BallInstance, Special, balls, specials
+from ballsdex.core.utils.proposals import ProposalText
+from ballsdex.packages.trade import display
+from ballsdex.packages.trade.trade_user import TradingUser
+
+COUNTRIES = (
+    "France",
+    "Germany",
+    "United Kingdom",
+    "Bosnia and Herzegovina",
+    "Saint Kitts and Nevis",
+    "Papua New Guinea",
+    "Côte d'Ivoire",
+    "Japan",
+    "Trinidad and Tobago",
+    "Iceland",
+)
+
+
+@dataclass(frozen=True)
+class FakeEmoji:
+    name: str
+    id: int
+
+    def __str__(self) -> str:
+        return f"<:{self.name}:{self.id}>"
+
+
+@dataclass(frozen=True)
+class FakeUser:
+    name: str
+    id: int
+
+
+class FakeBot:
+    def __init__(self, emojis: dict[int, FakeEmoji]):
+        self.emojis = emojis
+        self.locked_balls: set[int] = set()
+        self.proposal_text = ProposalText()
+
+    def get_emoji(self, emoji_id: int) -> FakeEmoji | None:
+        return self.emojis.get(emoji_id)
+
+
+def build_fixtures(count: int, rng: random.Random) -> tuple[FakeBot, list[BallInstance]]:
+    emojis: dict[int, FakeEmoji] = {}
+    for i, country in enumerate(COUNTRIES):
+        ball = Ball(country=country, emoji_id=1000 + i, attack=1000, health=1000)
+        ball.pk = i
+        balls[i] = ball
+        emojis[1000 + i] = FakeEmoji(country.replace(" ", "_").lower(), 1000 + i)
+    special = Special(name="Shiny", emoji="2000")
+    special.pk = 1
+    specials[1] = special
+    emojis[2000] = FakeEmoji("shiny", 2000)
+
+    instances: list[BallInstance] = []
+    row = dict.fromkeys(BallInstance._meta.fields_db_projection.values())
+    for i in range(count):
+        row.update(
+            id=rng.randrange(1, 2**31),
+            ball_id=rng.randrange(len(COUNTRIES)),
+            special_id=1 if rng.random() < 0.1 else None,
+            attack_bonus=rng.randint(-20, 20),
+            health_bonus=rng.randint(-20, 20),
+            favorite=False,
+            tradeable=True,
+        )
+        instances.append(BallInstance._init_from_db(**row))
+    return FakeBot(emojis), instances
+
+
+def legacy_list_of_strings(trader: TradingUser, bot: FakeBot, short: bool = False) -> list[str]:
+    proposal: list[str] = [""]
+    i = 0
+    for countryball in trader.proposal:
+        cb_text = countryball.description(
+            short=short, include_emoji=True, bot=cast(discord.Client, bot), is_trade=True
+        )
+        if trader.locked:
+            text = f"- *{cb_text}*\n"
+        else:
+            text = f"- {cb_text}\n"
+        if trader.cancelled:
+            text = f"~~{text}~~"
+        if len(text) + len(proposal[i]) > 950:
+            i += 1
+            proposal.append("")
+        proposal[i] += text
+    if not proposal[0]:
+        proposal[0] = "*Empty*"
+    return proposal
+
+
+def legacy_fill(
+    embed: discord.Embed,
+    bot: FakeBot,
+    trader1: TradingUser,
+    trader2: TradingUser,
+    compact: bool = False,
+):
+    embed.clear_fields()
+    proposal1 = legacy_list_of_strings(trader1, bot, compact)
+    proposal2 = legacy_list_of_strings(trader2, bot, compact)
+    embed.add_field(name=display._get_trader_name(trader1), value=proposal1[0], inline=True)
+    embed.add_field(name=display._get_trader_name(trader2), value=proposal2[0], inline=True)
+    if len(proposal1) > 1 or len(proposal2) > 1:
+        for i in range(1, max(len(proposal1), len(proposal2))):
+            embed.add_field(name="​", value="​", inline=True)
+            for proposal in (proposal1, proposal2):
+                value = proposal[i] if i < len(proposal) else "​"
+                embed.add_field(name="​", value=value, inline=True)
+        embed.add_field(name="​", value="​", inline=True)
+    if len(embed) > 6000:
+        if not compact:
+            return legacy_fill(embed, bot, trader1, trader2, compact=True)
+        embed.clear_fields()
+        for trader, proposal in ((trader1, proposal1), (trader2, proposal2)):
+            embed.add_field(
+                name=display._get_trader_name(trader),
+                value=f"Trade too long, only showing last page:\n{proposal[-1]}"
+                f"\nTotal: {len(trader.proposal)}",
+                inline=True,
+            )
+
+
+def measure(func: Callable[[], None], n: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(n):
+        t1 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t1)
+    return timings
+
+
+def report(name: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<16} mean {statistics.mean(timings) * 1000:8.3f}ms   "
+        f"p50 {statistics.median(timings) * 1000:8.3f}ms   p95 {p95 * 1000:8.3f}ms"
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=50, help="Number of embeds to build")
+    parser.add_argument("--balls", type=int, default=1000, help="Countryballs in each proposal")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def run(args: argparse.Namespace):
+    asyncio.run(main(args))
+
+
+async def main(args: argparse.Namespace):
+    # the models need a connection to be built, nothing is queried
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["ballsdex.core.models"]})
+    try:
+        bench(args)
+    finally:
+        await Tortoise.close_connections()
+
+
+def bench(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    bot, instances = build_fixtures(args.balls * 2 + args.n, rng)
+    client = cast(discord.Client, bot)
+    trader1 = TradingUser(FakeUser("trader1", 1), None, instances[: args.balls])  # type: ignore
+    trader2 = TradingUser(
+        FakeUser("trader2", 2), None, instances[args.balls : args.balls * 2]  # type: ignore
+    )
+    extra = iter(instances[args.balls * 2 :])
+    embed = discord.Embed(title="Trade", description="Benchmark")
+
+    def build():
+        display.fill_trade_embed_fields(embed, client, trader1, trader2)  # type: ignore
+
+    def build_cold():
+        bot.proposal_text.clear()
+        build()
+
+    def build_changed():
+        trader2.proposal.append(next(extra))
+        build()
+
+    legacy = discord.Embed(title="Trade", description="Benchmark")
+    legacy_fill(legacy, bot, trader1, trader2)
+    build_cold()
+    print(f"{args.balls} countryballs on each side, embed of {len(embed)} characters")
+    print(f"same fields as the previous code: {legacy.fields == embed.fields}")
+
+    report("previous", measure(lambda: legacy_fill(legacy, bot, trader1, trader2), args.n))
+    report("cached (cold)", measure(build_cold, args.n))
+    report("unchanged", measure(build, args.n))
+    report("one side", measure(build_changed, args.n))
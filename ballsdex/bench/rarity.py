@@ -0,0 +1,127 @@
+"""
+Rarity sampler distribution check and throughput benchmark.
+
+Draws millions of samples from synthetic rarity tables and runs a chi-squared goodness of
+fit test against the exact probabilities, then compares the draw time with random.choices.
+Exits with a non-zero code if a distribution does not match.
+
+Usage: python -m ballsdex.bench rarity [-n 5000000] [--balls 500]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, cast
+
+from ballsdex.core.models import Ball
+from ballsdex.core.utils.sampler import ALL, RARE, RaritySampler, regime_pool
+
+# the test fails if the statistic is above this quantile of the chi-squared distribution
+SIGNIFICANCE = 0.001
+
+
+@dataclass(frozen=True)
+class FakeBall:
+    pk: int
+    rarity: float
+    regime_id: int
+    enabled: bool = True
+
+
+def build_balls(count: int, rng: random.Random) -> list[FakeBall]:
+    # a long tail of rare balls, some disabled or with a rarity of 0 like real tables
+    return [
+        FakeBall(
+            pk=i,
+            rarity=round(rng.choice((0, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10)) * rng.random(), 3),
+            regime_id=i % 7,
+            enabled=rng.random() > 0.05,
+        )
+        for i in range(count)
+    ]
+
+
+def chi2_critical(dof: int, significance: float) -> float:
+    # Wilson-Hilferty approximation of the chi-squared quantile, accurate enough for the
+    # hundreds of degrees of freedom used here
+    z = _normal_quantile(1 - significance)
+    return dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
+
+
+def _normal_quantile(p: float) -> float:
+    # bisection on the error function, we only need a few digits
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        mid = (low + high) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def check_pool(sampler: RaritySampler, pool: str, n: int, rng: random.Random) -> dict[str, Any]:
+    probabilities = sampler.probabilities(pool)
+    t1 = time.perf_counter()
+    counts = Counter(cast(Ball, sampler.draw(pool, rng)).pk for _ in range(n))
+    duration = time.perf_counter() - t1
+
+    statistic = 0.0
+    max_error = 0.0
+    for pk, probability in probabilities.items():
+        expected = probability * n
+        statistic += (counts[pk] - expected) ** 2 / expected
+        max_error = max(max_error, abs(counts[pk] / n - probability))
+    unexpected = set(counts) - set(probabilities)
+    dof = max(len(probabilities) - 1, 1)
+    critical = chi2_critical(dof, SIGNIFICANCE)
+    return {
+        "balls": len(probabilities),
+        "draws": n,
+        "chi2": round(statistic, 2),
+        "chi2_critical": round(critical, 2),
+        "max_abs_error": max_error,
+        "unexpected_balls": len(unexpected),
+        "draws_per_second": round(n / duration),
+        "passed": statistic <= critical and not unexpected,
+    }
+
+
+def bench_choices(balls: list[FakeBall], n: int, rng: random.Random) -> int:
+    # what get_random used to do on every spawn
+    t1 = time.perf_counter()
+    for _ in range(n):
+        population = [x for x in balls if x.enabled]
+        rng.choices(population=population, weights=[x.rarity for x in population], k=1)
+    return round(n / (time.perf_counter() - t1))
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=5_000_000, help="Number of draws per pool")
+    parser.add_argument("--balls", type=int, default=500, help="Number of generated balls")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated table")
+
+
+def run(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    balls = build_balls(args.balls, rng)
+    t1 = time.perf_counter()
+    sampler = RaritySampler(cast(list[Ball], balls))
+    build_ms = (time.perf_counter() - t1) * 1000
+
+    results: dict[str, Any] = {"build_ms": round(build_ms, 2), "pools": {}}
+    for pool in (ALL, RARE, regime_pool(0)):
+        print(f"Drawing {args.n} samples from {pool}...", file=sys.stderr)
+        results["pools"][pool] = check_pool(sampler, pool, args.n, rng)
+    results["random_choices_per_second"] = bench_choices(balls, min(args.n, 100_000), rng)
+    print(json.dumps(results, indent=2))
+
+    failed = [name for name, pool in results["pools"].items() if not pool["passed"]]
+    if failed:
+        print(f"Distribution mismatch in {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
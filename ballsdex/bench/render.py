@@ -0,0 +1,229 @@
+"""
+Card rendering throughput benchmark.
+
+Builds synthetic regimes, economies, specials and balls from the bundled assets, renders
+them through the render service with an increasing number of worker processes, then
+compares the encoded size of the supported output formats. Results are written as JSON to
+track regressions between releases.
+
+Usage: python -m ballsdex.bench render [-n 200] [--workers 4] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from ballsdex import __version__ as bot_version
+from ballsdex.core.image_generator.assets import AssetStore
+from ballsdex.core.image_generator.image_gen import (
+    HEIGHT,
+    SOURCES_PATH,
+    WIDTH,
+    CardSpec,
+    render_card,
+)
+from ballsdex.core.image_generator.service import RenderService
+
+OVERLAY_PATH = Path(__file__).parent.parent / "packages" / "balls" / "overlay"
+
+FORMATS: dict[str, dict[str, Any]] = {
+    "webp": {"format": "WEBP"},
+    "webp-q90-m6": {"format": "WEBP", "quality": 90, "method": 6},
+    "webp-q75-m0": {"format": "WEBP", "quality": 75, "method": 0},
+    "webp-lossless": {"format": "WEBP", "lossless": True},
+    "png": {"format": "PNG"},
+    "png-c1": {"format": "PNG", "compress_level": 1},
+    "png-optimize": {"format": "PNG", "optimize": True},
+}
+
+
+@dataclass
+class Fixtures:
+    regimes: list[str]
+    economies: list[str]
+    specials: list[str]
+    frames: list[str]
+    artwork: str
+
+    def spec(
+        self,
+        i: int,
+        *,
+        economy: bool = False,
+        special: bool = False,
+        frame: bool = False,
+    ) -> CardSpec:
+        # a small set of balls so that layer caches behave like they would with popular balls
+        ball_id = i % 20
+        return CardSpec(
+            ball_id=ball_id,
+            special_id=1 if special else None,
+            title=f"Ball {ball_id}",
+            capacity_name=f"Capacity {ball_id}",
+            capacity_description="Synthetic capacity description used to benchmark the card "
+            f"rendering, long enough to be wrapped on a few lines. #{ball_id}",
+            rarity=round(random.uniform(0.1, 10), 2),
+            health=random.randint(500, 3000),
+            attack=random.randint(500, 3000),
+            background=(
+                self.specials[i % len(self.specials)]
+                if special
+                else self.regimes[i % len(self.regimes)]
+            ),
+            artwork=self.artwork,
+            economy_icon=self.economies[i % len(self.economies)] if economy else None,
+            frame_overlay=self.frames[i % len(self.frames)] if frame else None,
+        )
+
+
+def build_fixtures(path: Path) -> Fixtures:
+    def gradient(name: str, size: tuple[int, int], color: tuple[int, int, int]) -> str:
+        shade = Image.linear_gradient("L").resize(size)
+        image = Image.composite(
+            Image.new("RGBA", size, color + (255,)), Image.new("RGBA", size, (0, 0, 0, 255)), shade
+        )
+        file = path / name
+        image.save(file)
+        return str(file)
+
+    return Fixtures(
+        regimes=[
+            gradient(f"regime-{i}.png", (WIDTH, HEIGHT), color)
+            for i, color in enumerate(((200, 40, 40), (40, 200, 40), (40, 40, 200)))
+        ],
+        economies=[
+            gradient(f"economy-{i}.png", (512, 512), color)
+            for i, color in enumerate(((255, 200, 0), (0, 200, 255)))
+        ],
+        specials=[gradient("special.png", (WIDTH, HEIGHT), (230, 180, 255))],
+        frames=[str(x) for x in sorted(OVERLAY_PATH.glob("*.png"))[:2]],
+        artwork=str(SOURCES_PATH / "fr_test.png"),
+    )
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[max(int(len(values) * q) - 1, 0)]
+
+
+async def bench_workers(
+    fixtures: Fixtures, workers: int, n: int, asset_store: AssetStore, variant: dict[str, bool]
+) -> dict[str, Any]:
+    service = RenderService(workers, queue_size=n, asset_store=asset_store)
+    # warm up the pool, process startup is not what we're measuring
+    await asyncio.gather(*(service.render(fixtures.spec(i)) for i in range(workers or 1)))
+
+    timings: list[float] = []
+    sizes: list[int] = []
+
+    async def render(spec: CardSpec):
+        t1 = time.perf_counter()
+        buffer = await service.render(spec)
+        timings.append(time.perf_counter() - t1)
+        sizes.append(len(buffer.getvalue()))
+
+    t1 = time.perf_counter()
+    await asyncio.gather(*(render(fixtures.spec(i, **variant)) for i in range(n)))
+    duration = time.perf_counter() - t1
+    executor = service.executor
+    service.shutdown()
+    executor.shutdown(wait=True)
+
+    return {
+        "workers": workers,
+        "cards": n,
+        "cards_per_second": round(n / duration, 2),
+        "latency_p50_ms": round(percentile(timings, 0.5) * 1000, 1),
+        "latency_p95_ms": round(percentile(timings, 0.95) * 1000, 1),
+        "mean_size_bytes": round(statistics.mean(sizes)),
+    }
+
+
+def bench_formats(fixtures: Fixtures, variant: dict[str, bool]) -> dict[str, Any]:
+    image = render_card(fixtures.spec(0, **variant))
+    results: dict[str, Any] = {}
+    for name, kwargs in FORMATS.items():
+        buffer = BytesIO()
+        t1 = time.perf_counter()
+        image.save(buffer, **kwargs)
+        results[name] = {
+            "size_bytes": len(buffer.getvalue()),
+            "encode_ms": round((time.perf_counter() - t1) * 1000, 1),
+        }
+    return results
+
+
+async def bench(args: argparse.Namespace) -> dict[str, Any]:
+    variants: dict[str, dict[str, bool]] = {
+        "plain": {},
+        "economy": {"economy": True},
+        "special": {"special": True},
+        "frame": {"frame": True},
+        "full": {"economy": True, "special": True, "frame": True},
+    }
+    results: dict[str, Any] = {
+        "version": bot_version,
+        "python": sys.version.split()[0],
+        "cards": args.n,
+        "variants": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        fixtures = build_fixtures(path)
+        asset_store = AssetStore(path / "assets")
+        for name, variant in variants.items():
+            print(f"Benchmarking {name} cards...", file=sys.stderr)
+            results["variants"][name] = {
+                "pool": [
+                    await bench_workers(fixtures, workers, args.n, asset_store, variant)
+                    for workers in range(1, args.workers + 1)
+                ],
+                "formats": bench_formats(fixtures, variant),
+            }
+
+    results["peak_rss_kb"] = {
+        "bot": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "worker": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=200, help="Number of cards rendered per run")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Benchmark from 1 up to this many processes"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated stats")
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON results to this file instead of stdout"
+    )
+
+
+def run(args: argparse.Namespace):
+    random.seed(args.seed)
+    results = asyncio.run(bench(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    for name, variant in results["variants"].items():
+        for pool in variant["pool"]:
+            print(
+                f"{name:<8} {pool['workers']} workers: {pool['cards_per_second']:7.2f} cards/s  "
+                f"p50 {pool['latency_p50_ms']:7.1f}ms  p95 {pool['latency_p95_ms']:7.1f}ms",
+                file=sys.stderr,
+            )
@@ -0,0 +1,379 @@
+"""
+Offline spawn algorithm simulator and throughput benchmark.
+
+Feeds a synthetic or recorded message stream through one or more spawn managers, with a
+virtual clock so that the cooldowns and the ten minutes rule run instantly. Reports the
+spawn rate per guild-hour, how often the spam penalty applies and the handler throughput.
+Passing several managers compares them on the same stream.
+
+Usage: python -m ballsdex.bench spawn [--guilds 1000] [--hours 6] [--manager path.Class]...
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import random
+import selectors
+import sys
+import time
+from bisect import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+
+import discord
+
+from ballsdex.packages.countryballs.ab_spawn import ABSpawner
+from ballsdex.packages.countryballs.spawn import BaseSpawnManager, SpawnCooldown
+
+if TYPE_CHECKING:
+    from ballsdex.core.bot import BallsDexBot
+
+DEFAULT_MANAGER = "ballsdex.packages.countryballs.spawn.SpawnManager"
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# same buckets as the time multiplier of SpawnManager
+MEMBER_BUCKETS = ((5, "1-4"), (100, "5-99"), (1000, "100-999"), (math.inf, "1000+"))
+
+# (seconds since the start, guild ID, author ID, content length)
+type Event = tuple[float, int, int, int]
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop with a clock that jumps to the next scheduled callback whenever there is
+    nothing left to run, instead of waiting for it.
+    """
+
+    def __init__(self):
+        self.clock = 0.0
+        super().__init__(_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self.clock
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    def __init__(self, loop: VirtualClockLoop):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout: float | None = None):
+        # never block, the timeout is how long the loop would have waited for its next timer
+        events = super().select(0)
+        if not events and timeout:
+            self.loop.clock += timeout
+        return events
+
+
+@dataclass(slots=True)
+class FakeGuild:
+    id: int
+    member_count: int
+    spam: bool = False
+    name: str = ""
+    icon: None = None
+
+
+@dataclass(slots=True)
+class FakeAuthor:
+    id: int
+    bot: bool = False
+
+
+@dataclass(slots=True)
+class FakeMessage:
+    guild: FakeGuild
+    author: FakeAuthor
+    content: str
+    created_at: datetime
+    _state: Any
+    webhook_id: None = None
+
+
+@dataclass
+class Stream:
+    guilds: dict[int, FakeGuild]
+    events: list[Event]
+    hours: float
+    authors: dict[int, FakeAuthor] = field(default_factory=dict)
+
+    def author(self, author_id: int) -> FakeAuthor:
+        author = self.authors.get(author_id)
+        if author is None:
+            author = self.authors[author_id] = FakeAuthor(author_id)
+        return author
+
+
+def generate_stream(args: argparse.Namespace, rng: random.Random) -> Stream:
+    guilds: dict[int, FakeGuild] = {}
+    events: list[Event] = []
+    duration = args.hours * 3600
+    for i in range(args.guilds):
+        # snowflake-like IDs so that ABSpawner splits the guilds like in production
+        guild_id = (rng.getrandbits(41) << 22) | i
+        members = int(math.exp(rng.uniform(math.log(2), math.log(args.max_members))))
+        guild = guilds[guild_id] = FakeGuild(guild_id, members, rng.random() < args.spam)
+        # a fraction of the members chat, with a few of them writing most messages
+        chatters = max(1, int(members**0.6))
+        cum_weights = list(accumulate(1 / (k + 1) ** args.zipf for k in range(chatters)))
+        rate = math.exp(rng.uniform(math.log(args.min_rate), math.log(args.max_rate))) / 3600
+
+        t = rng.expovariate(rate)
+        while t < duration:
+            chatter = bisect(cum_weights, rng.random() * cum_weights[-1])
+            length = min(int(rng.lognormvariate(3, 1)), 2000)
+            events.append((t, guild_id, (i << 20) | chatter, length))
+            t += rng.expovariate(rate)
+
+        if guild.spam:
+            # one member flooding short messages in bursts, a couple of times per hour
+            t = rng.expovariate(2 / 3600)
+            while t < duration:
+                for _ in range(rng.randint(20, 60)):
+                    events.append((t, guild_id, i << 20, rng.randint(1, 4)))
+                    t += rng.uniform(0.5, 3)
+                t += rng.expovariate(2 / 3600)
+
+    events.sort()
+    return Stream(guilds, events, args.hours)
+
+
+def load_stream(path: Path) -> Stream:
+    guilds: dict[int, FakeGuild] = {}
+    events: list[Event] = []
+    with path.open() as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            guild_id = int(record["guild"])
+            if guild_id not in guilds:
+                guilds[guild_id] = FakeGuild(
+                    guild_id, int(record["members"]), bool(record.get("spam", False))
+                )
+            events.append(
+                (float(record["time"]), guild_id, int(record["author"]), int(record["length"]))
+            )
+    events.sort()
+    start = events[0][0] if events else 0
+    events = [(t - start, guild, author, length) for t, guild, author, length in events]
+    hours = max(events[-1][0] / 3600 if events else 0, 1 / 3600)
+    return Stream(guilds, events, hours)
+
+
+def save_stream(stream: Stream, path: Path):
+    with path.open("w") as f:
+        for t, guild_id, author_id, length in stream.events:
+            guild = stream.guilds[guild_id]
+            record = {
+                "time": round(t, 3),
+                "guild": guild_id,
+                "members": guild.member_count,
+                "author": author_id,
+                "length": length,
+            }
+            if guild.spam:
+                record["spam"] = True
+            f.write(json.dumps(record) + "\n")
+
+
+def load_manager(path: str) -> BaseSpawnManager:
+    module_path, class_name = path.rsplit(".", 1)
+    module = importlib.import_module(module_path)
+    return getattr(module, class_name)(cast("BallsDexBot", None))
+
+
+def find_cooldown(manager: BaseSpawnManager, guild: FakeGuild) -> SpawnCooldown | None:
+    # the spam penalty can only be observed on managers built on SpawnCooldown
+    if isinstance(manager, ABSpawner):
+        manager = manager.get_manager(cast(discord.Guild, guild))
+    cooldowns = getattr(manager, "cooldowns", None)
+    if not isinstance(cooldowns, dict):
+        return None
+    cooldown = cooldowns.get(guild.id)
+    return cooldown if isinstance(cooldown, SpawnCooldown) else None
+
+
+def member_bucket(member_count: int) -> str:
+    return next(name for limit, name in MEMBER_BUCKETS if member_count < limit)
+
+
+async def simulate(
+    manager: BaseSpawnManager, stream: Stream, message_content: bool
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    # run handlers synchronously up to their first suspension, so that rate limited
+    # messages never hit the scheduler and the penalty can be read right after
+    loop.set_task_factory(asyncio.eager_task_factory)
+    intents = discord.Intents.default()
+    intents.message_content = message_content
+    state = SimpleNamespace(intents=intents)
+    contents: dict[int, str] = {}
+
+    spawns: Counter[int] = Counter()
+    counted = penalized = 0
+    observed = False
+    pending: set[asyncio.Task] = set()
+
+    async def handle(message: FakeMessage):
+        result = await manager.handle_message(cast(discord.Message, message))
+        if result is not False:
+            spawns[message.guild.id] += 1
+
+    t1 = time.perf_counter()
+    for at, guild_id, author_id, length in stream.events:
+        if at > loop.time():
+            await asyncio.sleep(at - loop.time())
+        guild = stream.guilds[guild_id]
+        author = stream.author(author_id)
+        if not message_content:
+            length = 0
+        content = contents.get(length)
+        if content is None:
+            content = contents[length] = "x" * length
+        message = FakeMessage(
+            guild, author, content, EPOCH + timedelta(seconds=loop.time()), state
+        )
+
+        cooldown = find_cooldown(manager, guild)
+        ready = cooldown is None or not cooldown.lock.locked()
+        task = asyncio.create_task(handle(message))
+        if not task.done():
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if ready and (cooldown := find_cooldown(manager, guild)):
+            observed = True
+            counted += 1
+            cache = cooldown.message_cache
+            if cache.chatters < 4 or cache.share(author.id) > 0.4:
+                penalized += 1
+    await asyncio.gather(*pending)
+    duration = time.perf_counter() - t1
+
+    guild_hours = len(stream.guilds) * stream.hours
+
+    def rate(guilds: list[FakeGuild]) -> float | None:
+        if not guilds:
+            return None
+        return round(sum(spawns[x.id] for x in guilds) / (len(guilds) * stream.hours), 4)
+
+    by_members: dict[str, list[FakeGuild]] = {name: [] for _, name in MEMBER_BUCKETS}
+    for guild in stream.guilds.values():
+        by_members[member_bucket(guild.member_count)].append(guild)
+    return {
+        "manager": f"{type(manager).__module__}.{type(manager).__qualname__}",
+        "messages": len(stream.events),
+        "messages_per_second": round(len(stream.events) / duration),
+        "spawns": spawns.total(),
+        "spawns_per_guild_hour": round(spawns.total() / guild_hours, 4),
+        "spawns_per_guild_hour_by_members": {
+            name: rate(guilds) for name, guilds in by_members.items()
+        },
+        "spawns_per_guild_hour_spam": rate([x for x in stream.guilds.values() if x.spam]),
+        "guilds_without_spawn": sum(1 for x in stream.guilds if not spawns[x]),
+        "counted_messages": counted if observed else None,
+        "spam_penalty_rate": round(penalized / counted, 4) if observed and counted else None,
+    }
+
+
+def compare(baseline: dict[str, Any], other: dict[str, Any]) -> dict[str, Any]:
+    def change(key: str) -> float | None:
+        if not baseline[key] or other[key] is None:
+            return None
+        return round((other[key] - baseline[key]) / baseline[key] * 100, 2)
+
+    return {
+        "manager": other["manager"],
+        "spawns_per_guild_hour_change_percent": change("spawns_per_guild_hour"),
+        "spam_penalty_rate_change_percent": change("spam_penalty_rate"),
+        "messages_per_second_change_percent": change("messages_per_second"),
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--manager",
+        action="append",
+        help="Python path of a spawn manager class, repeat to compare several managers "
+        f"(default: {DEFAULT_MANAGER})",
+    )
+    parser.add_argument("--guilds", type=int, default=1000, help="Number of generated guilds")
+    parser.add_argument("--hours", type=float, default=6, help="Duration of the generated stream")
+    parser.add_argument("--max-members", type=int, default=20000, help="Largest generated guild")
+    parser.add_argument(
+        "--min-rate", type=float, default=2, help="Messages per hour of the quietest guilds"
+    )
+    parser.add_argument(
+        "--max-rate", type=float, default=600, help="Messages per hour of the busiest guilds"
+    )
+    parser.add_argument(
+        "--zipf", type=float, default=1.2, help="Skew of the messages between the chatters"
+    )
+    parser.add_argument(
+        "--spam", type=float, default=0.1, help="Fraction of guilds with a member flooding"
+    )
+    parser.add_argument(
+        "--no-message-content",
+        action="store_true",
+        help="Simulate a bot without the message content intent",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated stream")
+    parser.add_argument(
+        "--stream", type=Path, help="Replay a recorded stream (JSON lines) instead of generating"
+    )
+    parser.add_argument("--save-stream", type=Path, help="Write the generated stream to this file")
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON results to this file instead of stdout"
+    )
+
+
+def run(args: argparse.Namespace):
+    if args.stream:
+        stream = load_stream(args.stream)
+    else:
+        print(f"Generating {args.hours} hours of {args.guilds} guilds...", file=sys.stderr)
+        stream = generate_stream(args, random.Random(args.seed))
+    if args.save_stream:
+        save_stream(stream, args.save_stream)
+
+    results: dict[str, Any] = {
+        "guilds": len(stream.guilds),
+        "hours": round(stream.hours, 3),
+        "messages": len(stream.events),
+        "managers": [],
+    }
+    for path in args.manager or [DEFAULT_MANAGER]:
+        print(f"Simulating {path}...", file=sys.stderr)
+        # same seed for every manager, so thresholds are drawn the same way
+        random.seed(args.seed)
+        manager = load_manager(path)
+        results["managers"].append(
+            asyncio.run(
+                simulate(manager, stream, not args.no_message_content),
+                loop_factory=VirtualClockLoop,
+            )
+        )
+    if len(results["managers"]) > 1:
+        baseline = results["managers"][0]
+        results["comparison"] = [compare(baseline, x) for x in results["managers"][1:]]
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    for result in results["managers"]:
+        print(
+            f"{result['manager']}: {result['spawns_per_guild_hour']} spawns/guild-hour  "
+            f"penalty rate {result['spam_penalty_rate']}  "
+            f"{result['messages_per_second']} messages/s",
+            file=sys.stderr,
+        )
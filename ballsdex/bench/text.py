@@ -0,0 +1,96 @@
+"""
+Micro-benchmark of the text drawn on cards.
+
+Compares drawing the text directly on every render with compositing the cached text layers.
+
+Usage: python -m ballsdex.bench text [-n 200]
+"""
+
+import argparse
+import statistics
+import textwrap
+import time
+from typing import Callable
+
+from PIL import Image, ImageDraw
+
+from ballsdex.core.image_generator import image_gen
+from ballsdex.core.image_generator.image_gen import (
+    CAPACITY_DESCRIPTION_STYLE,
+    CAPACITY_NAME_STYLE,
+    HEIGHT,
+    TITLE_STYLE,
+    WIDTH,
+    TextStyle,
+    draw_text,
+)
+
+TITLE = "Ballsdex"
+CAPACITY_NAME = "Stroke of genius"
+CAPACITY_DESCRIPTION = (
+    "Scores a goal from the halfway line every time the opponent forgets about the offside "
+    "rule, then celebrates for a little too long."
+)
+
+# (position, lines, style, line height) of each text block of a card, stats excluded
+BLOCKS: list[tuple[tuple[int, int], list[str], TextStyle, int]] = [
+    ((30, 30), [TITLE], TITLE_STYLE, 0),
+    ((100, 1050), textwrap.wrap(f"CODE: {CAPACITY_NAME}", width=30), CAPACITY_NAME_STYLE, 100),
+    ((80, 1160), textwrap.wrap(CAPACITY_DESCRIPTION, width=44), CAPACITY_DESCRIPTION_STYLE, 60),
+]
+
+
+def draw_direct(image: Image.Image):
+    draw = ImageDraw.Draw(image)
+    for (x, y), lines, style, line_height in BLOCKS:
+        for i, line in enumerate(lines):
+            draw.text(
+                (x, y + line_height * i),
+                line,
+                font=style.font,
+                fill=style.fill,
+                stroke_width=style.stroke_width,
+                stroke_fill=style.stroke_fill,
+                anchor=style.anchor,
+            )
+
+
+def draw_cached(image: Image.Image):
+    for xy, lines, style, line_height in BLOCKS:
+        draw_text(image, xy, lines, style, line_height)
+
+
+def measure(func: Callable[[Image.Image], None], canvas: Image.Image, n: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(n):
+        image = canvas.copy()
+        t1 = time.perf_counter()
+        func(image)
+        timings.append(time.perf_counter() - t1)
+    return timings
+
+
+def report(name: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<16} mean {statistics.mean(timings) * 1000:8.3f}ms   "
+        f"p50 {statistics.median(timings) * 1000:8.3f}ms   p95 {p95 * 1000:8.3f}ms"
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("-n", type=int, default=200, help="Number of renders to measure")
+
+
+def run(args: argparse.Namespace):
+    canvas = Image.new("RGBA", (WIDTH, HEIGHT), (40, 90, 160, 255))
+
+    image_gen.text_cache.clear()
+    t1 = time.perf_counter()
+    draw_cached(canvas.copy())
+    cold = time.perf_counter() - t1
+
+    report("direct", measure(draw_direct, canvas, args.n))
+    print(f"{'cached (cold)':<16} once {cold * 1000:8.3f}ms")
+    report("cached (warm)", measure(draw_cached, canvas, args.n))
@@ -7,13 +7,13 @@ import math
 import time
 import types
 from datetime import datetime
+from pathlib import Path
 from typing import TYPE_CHECKING, Self, cast
 
 import aiohttp
 import discord
 import discord.gateway
 from aiohttp import ClientTimeout
-from cachetools import TTLCache
 from discord import app_commands
 from discord.app_commands.translator import TranslationContextTypes, locale_str
 from discord.enums import Locale
@@ -25,6 +25,10 @@ from rich.table import Table
 
 from ballsdex.core.commands import Core
 from ballsdex.core.dev import Dev
+from ballsdex.core.image_generator.assets import AssetStore, Slot
+from ballsdex.core.image_generator.cache import CardCache
+from ballsdex.core.image_generator.image_gen import ARTWORK_SLOT, ICON_SLOT, MEDIA_PATH
+from ballsdex.core.image_generator.service import RenderQueueFull, RenderService
 from ballsdex.core.metrics import PrometheusServer
 from ballsdex.core.models import (
     Ball,
@@ -38,6 +42,16 @@ from ballsdex.core.models import (
     regimes,
     specials,
 )
+from ballsdex.core.utils.locks import BallLocks
+from ballsdex.core.utils.names import NameIndex
+from ballsdex.core.utils.owned import OWNED_CHANGE_CHANNEL, OwnedBalls
+from ballsdex.core.utils.player_cache import PLAYER_CHANGE_CHANNEL, PlayerCache
+from ballsdex.core.utils.proposals import ProposalText
+from ballsdex.core.utils.refresher import MenuRefresher
+from ballsdex.core.utils.sampler import RaritySampler, SpecialSchedule
+from ballsdex.core.utils.social import SocialGraph
+from ballsdex.core.utils.tortoise import listen
+from ballsdex.core.utils.users import UserCache
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -157,6 +171,10 @@ class BallsDexBot(commands.AutoShardedBot):
             trace.on_request_end.append(on_request_end)
             options["http_trace"] = trace
 
+        if settings.spawn_fast_path:
+            # messages are read from the gateway payloads, nothing uses the message cache
+            options.setdefault("max_messages", None)
+
         super().__init__(command_prefix, intents=intents, tree_cls=CommandTree, **options)
         self.tree.disable_time_check = disable_time_check  # type: ignore
         self.skip_tree_sync = skip_tree_sync
@@ -174,7 +192,41 @@ class BallsDexBot(commands.AutoShardedBot):
         self.blacklist_guild: set[int] = set()
         self.catch_log: set[int] = set()
         self.command_log: set[int] = set()
-        self.locked_balls = TTLCache(maxsize=99999, ttl=60 * 30)
+        self.locked_balls = BallLocks()
+        self.menu_refresher = MenuRefresher()
+        self.proposal_text = ProposalText()
+        self.rarity_sampler = RaritySampler(())
+        self.name_index = NameIndex(())
+        self.special_schedule = SpecialSchedule(())
+        self.owned_balls = OwnedBalls(
+            settings.player_cache_owned_size * 1024**2, settings.player_cache_ttl
+        )
+        self.owned_balls.register()
+        self.player_cache = PlayerCache(settings.player_cache_players, settings.player_cache_ttl)
+        self.player_cache.register()
+        self.social_graph = SocialGraph(settings.player_cache_relations, settings.player_cache_ttl)
+        self.social_graph.register()
+        self.user_cache = UserCache(self)
+        self.notifications: asyncio.Task[None] | None = None
+        card_cache = (
+            CardCache(
+                Path(settings.render_disk_cache_path), settings.render_disk_cache_size * 1024**2
+            )
+            if settings.render_disk_cache_path
+            else None
+        )
+        asset_store = (
+            AssetStore(Path(settings.render_asset_cache_path))
+            if settings.render_asset_cache_path
+            else None
+        )
+        self.render_service = RenderService(
+            settings.render_workers,
+            settings.render_queue_size,
+            settings.render_layer_cache_size,
+            card_cache,
+            asset_store,
+        )
 
         self.owner_ids: set[int]
 
@@ -211,6 +263,22 @@ class BallsDexBot(commands.AutoShardedBot):
     def get_emoji(self, id: int) -> discord.Emoji | None:
         return self.application_emojis.get(id) or super().get_emoji(id)
 
+    def card_assets(self) -> set[tuple[str, Slot]]:
+        """
+        List the assets used by the cards in cache, along with the slot they are fitted to.
+        """
+        assets: set[tuple[str, Slot]] = set()
+        for regime in regimes.values():
+            assets.add((MEDIA_PATH + regime.background, None))
+        for special in specials.values():
+            if special.background:
+                assets.add((MEDIA_PATH + special.background, None))
+        for economy in economies.values():
+            assets.add((MEDIA_PATH + economy.icon, ICON_SLOT))
+        for ball in balls.values():
+            assets.add((MEDIA_PATH + ball.collection_card, ARTWORK_SLOT))
+        return assets
+
     async def load_cache(self):
         table = Table(box=box.SIMPLE)
         table.add_column("Model", style="cyan")
@@ -240,6 +308,28 @@ class BallsDexBot(commands.AutoShardedBot):
             specials[special.pk] = special
         table.add_row("Special events", str(len(specials)))
 
+        self.special_schedule.stop()
+        self.special_schedule = SpecialSchedule(specials.values())
+        self.special_schedule.start()
+
+        self.rarity_sampler = RaritySampler(balls.values())
+        self.name_index = NameIndex(balls.values())
+        self.proposal_text.clear()
+        table.add_row("Spawn pools", str(len(self.rarity_sampler.pools)))
+
+        if asset_store := self.render_service.asset_store:
+            if settings.render_preload_assets:
+                count, size, duration = await asyncio.to_thread(
+                    asset_store.preload, self.card_assets()
+                )
+                table.add_row("Card assets", str(count))
+                log.info(
+                    f"Preloaded {count} card assets in {duration:.2f}s, "
+                    f"holding {size / 1024**2:.1f}MB."
+                )
+            else:
+                table.add_row("Card assets", "lazy")
+
         self.blacklist = set()
         for blacklisted_id in await BlacklistedID.all().only("discord_id"):
             self.blacklist.add(blacklisted_id.discord_id)
@@ -254,6 +344,37 @@ class BallsDexBot(commands.AutoShardedBot):
         console = Console()
         console.print(table)
 
+    def _notifications_lost(self):
+        # admin panel edits may have been missed meanwhile
+        self.player_cache.cache.clear()
+        self.owned_balls.clear()
+
+    def listen_notifications(self):
+        """
+        Drop the cached players and owned countryballs edited from the admin panel, as they
+        are notified.
+        """
+        if self.notifications is None:
+            self.notifications = asyncio.create_task(
+                listen(
+                    {
+                        PLAYER_CHANGE_CHANNEL: self.player_cache.on_notification,
+                        OWNED_CHANGE_CHANNEL: self.owned_balls.on_notification,
+                    },
+                    self._notifications_lost,
+                ),
+                name="admin-panel-listener",
+            )
+
+    async def close(self) -> None:
+        self.special_schedule.stop()
+        if self.notifications is not None:
+            self.notifications.cancel()
+        self.locked_balls.stop()
+        self.menu_refresher.stop()
+        self.render_service.shutdown()
+        await super().close()
+
     async def gateway_healthy(self) -> bool:
         """Check whether or not the gateway proxy is ready and healthy."""
         if settings.gateway_url is None:
@@ -315,6 +436,8 @@ class BallsDexBot(commands.AutoShardedBot):
             )
 
         await self.load_cache()
+        await self.locked_balls.start()
+        self.listen_notifications()
         grammar = "" if len(self.blacklist) == 1 else "s"
         if self.blacklist:
             log.info(f"{len(self.blacklist)} blacklisted user{grammar}.")
@@ -497,6 +620,17 @@ class BallsDexBot(commands.AutoShardedBot):
                 )
                 return
 
+            if isinstance(error.original, RenderQueueFull):
+                await send(
+                    "The bot is currently busy generating cards, please try again in a few "
+                    "seconds."
+                )
+                log.warning(
+                    f"Card render rejected for {interaction.command.qualified_name}: "
+                    f"{error.original}"
+                )
+                return
+
             if isinstance(error.original, discord.InteractionResponded):
                 # most likely an interaction received twice (happens sometimes),
                 # or two instances are running on the same token.
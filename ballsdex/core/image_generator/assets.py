@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+log = logging.getLogger("ballsdex.core.image_generator.assets")
+
+# width and height of the image, followed by the raw RGBA pixels
+HEADER = struct.Struct("<II")
+
+type Slot = tuple[int, int] | None
+
+
+class AssetStore:
+    """
+    Decoded card assets, pre-fitted to the slot they are pasted in.
+
+    Assets are stored as raw RGBA files which are memory-mapped when used, so all render
+    workers share the same pages instead of each decoding its own copy. Files are named after
+    the source path, its modification time and the slot size, a replaced asset simply gets
+    a new file.
+
+    Assets that are not tied to the database models, such as frame overlays, can be pinned
+    so that they are kept when the store is pruned.
+
+    Parameters
+    ----------
+    path: Path
+        Directory holding the raw files, created if needed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mapped: dict[tuple[str, Slot], tuple[int, Image.Image]] = {}
+        self.pinned: set[tuple[str, Slot]] = set()
+
+    def file_for(self, source: str, slot: Slot) -> Path:
+        key = repr((source, os.stat(source).st_mtime_ns, slot))
+        return self.path / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.rgba"
+
+    def prepare(self, source: str, slot: Slot) -> tuple[Path, int]:
+        """
+        Decode and fit an asset, then write it to disk if not done already.
+
+        Returns
+        -------
+        tuple[Path, int]
+            The raw file and its size.
+        """
+        file = self.file_for(source, slot)
+        try:
+            return file, file.stat().st_size
+        except FileNotFoundError:
+            pass
+
+        image = decode(source, slot)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # another worker may be writing the same file, the rename keeps it consistent
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(*image.size))
+                f.write(image.tobytes())
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return file, file.stat().st_size
+
+    def open(self, source: str, slot: Slot) -> Image.Image:
+        """
+        Get a shared, read-only image of the asset. Copy it before drawing on it.
+        """
+        mtime = os.stat(source).st_mtime_ns
+        cached = self.mapped.get((source, slot))
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        file, _ = self.prepare(source, slot)
+        with open(file, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = HEADER.unpack_from(buffer)
+        image = Image.frombuffer(
+            "RGBA", size, memoryview(buffer)[HEADER.size :], "raw", "RGBA", 0, 1
+        )
+        self.mapped[(source, slot)] = (mtime, image)
+        return image
+
+    def pin(self, assets: set[tuple[str, Slot]]) -> tuple[int, int, float]:
+        """
+        Prepare assets and keep them across calls to `preload`.
+        This is blocking, run it in a thread.
+
+        Returns
+        -------
+        tuple[int, int, float]
+            The number of assets, the bytes held and the time spent.
+        """
+        self.pinned.update(assets)
+        t1 = time.perf_counter()
+        files = self._prepare_all(assets)
+        return len(files), sum(files.values()), time.perf_counter() - t1
+
+    def preload(self, assets: set[tuple[str, Slot]]) -> tuple[int, int, float]:
+        """
+        Prepare all the given assets and the pinned ones, then remove the files that are not
+        used anymore. This is blocking, run it in a thread.
+
+        Returns
+        -------
+        tuple[int, int, float]
+            The number of assets, the bytes held and the time spent.
+        """
+        t1 = time.perf_counter()
+        files = self._prepare_all(assets | self.pinned)
+        for file in self.path.glob("*.rgba"):
+            if file not in files:
+                file.unlink(missing_ok=True)
+        return len(files), sum(files.values()), time.perf_counter() - t1
+
+    def _prepare_all(self, assets: set[tuple[str, Slot]]) -> dict[Path, int]:
+        files: dict[Path, int] = {}
+        for source, slot in assets:
+            try:
+                file, size = self.prepare(source, slot)
+            except (OSError, ValueError):
+                log.warning(f"Failed to preload card asset {source}", exc_info=True)
+                continue
+            files[file] = size
+        return files
+
+
+def decode(source: str, slot: Slot) -> Image.Image:
+    with Image.open(source) as image:
+        image = image.convert("RGBA")
+    if slot:
+        image = ImageOps.fit(image, slot)
+    return image
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import astuple
+from pathlib import Path
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+from ballsdex.core.image_generator.image_gen import (
+    DEFAULT_SAVE_KWARGS,
+    RENDER_VERSION,
+    CardSpec,
+    asset_versions,
+)
+
+log = logging.getLogger("ballsdex.core.image_generator.cache")
+
+disk_cache_hits = Counter("card_disk_cache_hits", "Encoded cards served from the disk cache")
+disk_cache_misses = Counter("card_disk_cache_misses", "Encoded cards missing from the disk cache")
+disk_cache_evictions = Counter("card_disk_cache_evictions", "Encoded cards evicted from disk")
+disk_cache_size = Gauge("card_disk_cache_bytes", "Size of the encoded cards stored on disk")
+
+
+class CardCache:
+    """
+    Content-addressed cache of encoded cards on disk.
+
+    Files are named after a hash of everything that affects the output (card inputs, asset
+    modification times, thumbnail scale, encoding options and `RENDER_VERSION`), so an entry
+    never has to be invalidated, stale ones simply stop being requested and are evicted by
+    the LRU.
+    Files are stored as `<ball_id>/<special_id>-<hash>.<ext>` to allow purging by ball or
+    special, thumbnails included.
+
+    The methods are blocking, call them from a thread.
+
+    Parameters
+    ----------
+    path: Path
+        Directory where the cards are stored, created if needed.
+    max_size: int
+        Maximum size of the cache in bytes. The least recently used cards are removed when
+        this is exceeded.
+    """
+
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.size = 0
+        self._index: OrderedDict[Path, int] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> OrderedDict[Path, int]:
+        if self._index is None:
+            self._index = self._scan()
+            self.size = sum(self._index.values())
+            disk_cache_size.set(self.size)
+            log.debug(f"Card cache loaded with {len(self._index)} entries ({self.size} bytes)")
+        return self._index
+
+    def _scan(self) -> OrderedDict[Path, int]:
+        self.path.mkdir(parents=True, exist_ok=True)
+        entries: list[tuple[float, Path, int]] = []
+        for file in self.path.glob("*/*"):
+            if file.name.startswith("."):
+                # leftover temporary file of an interrupted write
+                file.unlink(missing_ok=True)
+                continue
+            stat = file.stat()
+            entries.append((stat.st_mtime, file, stat.st_size))
+        entries.sort()
+        return OrderedDict((file, size) for _, file, size in entries)
+
+    def file_for(self, spec: CardSpec, scale: int, save_kwargs: dict[str, Any]) -> Path:
+        save_kwargs = save_kwargs or DEFAULT_SAVE_KWARGS
+        key = repr(
+            (
+                RENDER_VERSION,
+                astuple(spec),
+                asset_versions(spec),
+                scale,
+                sorted(save_kwargs.items()),
+            )
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        extension = str(save_kwargs.get("format", "webp")).lower()
+        return self.path / str(spec.ball_id) / f"{spec.special_id or 0}-{digest}.{extension}"
+
+    def get(self, spec: CardSpec, scale: int, save_kwargs: dict[str, Any]) -> bytes | None:
+        file = self.file_for(spec, scale, save_kwargs)
+        with self._lock:
+            if file not in self.index:
+                disk_cache_misses.inc()
+                return None
+            self.index.move_to_end(file)
+        try:
+            data = file.read_bytes()
+        except FileNotFoundError:
+            # removed behind our back
+            with self._lock:
+                self.size -= self.index.pop(file, 0)
+            disk_cache_misses.inc()
+            return None
+        # the modification time keeps the LRU order across restarts
+        os.utime(file)
+        disk_cache_hits.inc()
+        return data
+
+    def put(self, spec: CardSpec, scale: int, save_kwargs: dict[str, Any], data: bytes):
+        file = self.file_for(spec, scale, save_kwargs)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file then rename, readers never see a partial card
+        fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            self.size += len(data) - self.index.pop(file, 0)
+            self.index[file] = len(data)
+            while self.size > self.max_size and self.index:
+                old_file, old_size = self.index.popitem(last=False)
+                old_file.unlink(missing_ok=True)
+                self.size -= old_size
+                disk_cache_evictions.inc()
+            disk_cache_size.set(self.size)
+
+    def purge(self, *, ball_id: int | None = None, special_id: int | None = None) -> int:
+        """
+        Remove the cached cards of a ball, a special, or both combined. Everything is removed
+        if no argument is given.
+
+        Returns
+        -------
+        int
+            The number of files removed.
+        """
+        ball_glob = str(ball_id) if ball_id is not None else "*"
+        special_glob = f"{special_id}-*" if special_id is not None else "*"
+        count = 0
+        with self._lock:
+            for file in self.path.glob(f"{ball_glob}/{special_glob}"):
+                if file.name.startswith("."):
+                    # being written by put, which would fail to rename it
+                    continue
+                file.unlink(missing_ok=True)
+                self.size -= self.index.pop(file, 0)
+                count += 1
+            disk_cache_size.set(self.size)
+        return count
@@ -1,9 +1,14 @@
 import os
 import textwrap
+from dataclasses import dataclass, replace
+from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from cachetools import LRUCache
+from PIL import Image, ImageDraw, ImageFont
+
+from ballsdex.core.image_generator.assets import AssetStore, Slot, decode
 
 if TYPE_CHECKING:
     from ballsdex.core.models import BallInstance
@@ -18,6 +23,10 @@ RECTANGLE_HEIGHT = (HEIGHT // 5) * 2
 
 CORNERS = ((0, 181), (1428, 948))
 artwork_size = [b - a for a, b in zip(*CORNERS)]
+ARTWORK_SLOT = (artwork_size[0], artwork_size[1])
+ICON_SLOT = (170, 170)
+
+MEDIA_PATH = "./admin_panel/media/"
 
 # ===== TIP =====
 #
@@ -40,103 +49,364 @@ credits_font = ImageFont.truetype(str(SOURCES_PATH / "demarunregular-ovpgo.ttf")
 credits_color_cache = {}
 
 
+class TextStyle(NamedTuple):
+    font: ImageFont.FreeTypeFont
+    fill: tuple[int, int, int, int] = (255, 255, 255, 255)
+    stroke_width: int = 0
+    stroke_fill: tuple[int, int, int, int] = (0, 0, 0, 255)
+    anchor: str | None = None
+
+
+TITLE_STYLE = TextStyle(title_font, stroke_width=3)
+CAPACITY_NAME_STYLE = TextStyle(capacity_name_font, fill=(230, 230, 230, 255), stroke_width=2)
+CAPACITY_DESCRIPTION_STYLE = TextStyle(capacity_description_font, stroke_width=1)
+RARITY_STYLE = TextStyle(stats_font, fill=(255, 191, 0, 255), stroke_width=5, anchor="ra")
+HEALTH_STYLE = TextStyle(stats_font, fill=(237, 115, 101, 255), stroke_width=1)
+ATTACK_STYLE = TextStyle(stats_font, fill=(252, 194, 76, 255), stroke_width=1, anchor="ra")
+CREDITS_STYLE = TextStyle(credits_font, fill=(230, 230, 230, 255))
+
+DEFAULT_SAVE_KWARGS: dict[str, Any] = {"format": "WEBP"}
+
+# downscaling factors of the card thumbnails
+THUMBNAIL_SCALES = (1, 2, 4, 8)
+SHEET_GAP = 8
+
+# bump this when changing the card design, cached cards are keyed on it
+RENDER_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class CardSpec:
+    """
+    Everything needed to render a card, detached from the ORM models so that it can be sent
+    to a worker process and used as a cache key.
+    """
+
+    ball_id: int
+    special_id: int | None
+    title: str
+    capacity_name: str
+    capacity_description: str
+    rarity: float
+    health: int
+    attack: int
+    background: str
+    artwork: str
+    economy_icon: str | None = None
+    frame_overlay: str | None = None
+
+
 def get_credit_color(image: Image.Image, region: tuple) -> tuple:
     image = image.crop(region)
     brightness = sum(image.convert("L").getdata()) / image.width / image.height  # type: ignore
     return (0, 0, 0, 255) if brightness > 100 else (255, 255, 255, 255)
 
-    
-def draw_card(ball_instance: "BallInstance", media_path: str = "./admin_panel/media/", frame_overlay: Image.Image = None):
+
+def build_card_spec(
+    ball_instance: "BallInstance",
+    media_path: str = MEDIA_PATH,
+    frame_overlay: str | None = None,
+) -> CardSpec:
+    """
+    Extract the rendering inputs of a ball instance. This must be called from the process
+    holding the cache, the returned object can then be rendered anywhere.
+
+    Parameters
+    ----------
+    ball_instance: BallInstance
+        The instance to render.
+    media_path: str
+        Folder containing the uploaded assets.
+    frame_overlay: str | None
+        Path to a PNG overlay applied on top of the background.
+    """
     ball = ball_instance.countryball
-    ball_health = (237, 115, 101, 255)
-    ball_credits = ball.credits
-    
     if special_image := ball_instance.special_card:
-        image = Image.open(media_path + special_image)
-        if ball_instance.specialcard and ball_instance.specialcard.credits:
-            ball_credits += f" • {ball_instance.specialcard.credits}"
+        background = media_path + special_image
     else:
-        image = Image.open(media_path + ball.cached_regime.background)
-    image = image.convert("RGBA")
-    if frame_overlay:
-        frame_overlay = frame_overlay.resize(image.size)
-        image = Image.alpha_composite(image, frame_overlay)
-    icon = (
-        Image.open(media_path + ball.cached_economy.icon).convert("RGBA")
-        if ball.cached_economy
-        else None
+        background = media_path + ball.cached_regime.background
+    economy = ball.cached_economy
+    return CardSpec(
+        ball_id=ball.pk,
+        special_id=ball_instance.special_id,
+        title=ball.short_name or ball.country,
+        capacity_name=ball.capacity_name,
+        capacity_description=ball.capacity_description,
+        rarity=ball.rarity,
+        health=ball_instance.health,
+        attack=ball_instance.attack,
+        background=background,
+        artwork=media_path + ball.collection_card,
+        economy_icon=media_path + economy.icon if economy else None,
+        frame_overlay=frame_overlay,
     )
 
-    draw = ImageDraw.Draw(image)
-    draw.text(
-        (30, 30),
-        ball.short_name or ball.country,
-        font=title_font,
-        stroke_width=3,
-        stroke_fill=(0, 0, 0, 255),
-    )
-    for i, line in enumerate(textwrap.wrap(f"CODE: {ball.capacity_name}", width=30)):
-        draw.text(
-            (100, 1050 + 100 * i),
+
+class LayerCache(LRUCache):
+    """
+    LRU cache of pre-composited card layers, bounded by the memory held by the images.
+
+    Hits, misses and evictions are counted locally since this lives in the worker processes,
+    use `pop_stats` to collect them.
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(maxsize=max_bytes, getsizeof=image_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def pop_stats(self) -> tuple[int, int, int]:
+        """
+        Return the hits, misses and evictions since the last call, then reset them.
+        """
+        stats = (self.hits, self.misses, self.evictions)
+        self.hits = self.misses = self.evictions = 0
+        return stats
+
+
+def image_size(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+base_cache = LayerCache(128 * 1024 * 1024)
+text_cache: LRUCache[Any, tuple[Image.Image, int, int]] = LRUCache(
+    maxsize=32 * 1024 * 1024, getsizeof=lambda item: image_size(item[0])
+)
+asset_store: AssetStore | None = None
+
+
+def configure_worker(layer_cache_bytes: int, asset_path: str | None = None):
+    """
+    Initializer of the render workers, sizing the caches of the process.
+    """
+    global base_cache, asset_store
+    base_cache = LayerCache(layer_cache_bytes)
+    asset_store = AssetStore(Path(asset_path)) if asset_path else None
+
+
+def open_asset(source: str, slot: Slot = None) -> Image.Image:
+    """
+    Open an asset fitted to its slot, shared from the asset store when enabled. The returned
+    image must not be modified.
+    """
+    if asset_store:
+        return asset_store.open(source, slot)
+    return decode(source, slot)
+
+
+def asset_versions(spec: CardSpec) -> tuple[int, ...]:
+    """
+    Modification times of the files used by a card, to invalidate caches when an asset is
+    replaced in the admin panel.
+    """
+    paths = (spec.background, spec.artwork, spec.economy_icon, spec.frame_overlay)
+    return tuple(os.stat(path).st_mtime_ns for path in paths if path)
+
+
+def render_text(
+    lines: tuple[str, ...], style: TextStyle, line_height: int
+) -> tuple[Image.Image, int, int]:
+    """
+    Render lines of text on a transparent layer cropped to the text.
+
+    Returns
+    -------
+    tuple[Image.Image, int, int]
+        The layer and its offset from the position the text is anchored to.
+    """
+    measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    boxes = [
+        measure.textbbox(
+            (0, line_height * i),
             line,
-            font=capacity_name_font,
-            fill=(230, 230, 230, 255),
-            stroke_width=2,
-            stroke_fill=(0, 0, 0, 255),
+            font=style.font,
+            anchor=style.anchor,
+            stroke_width=style.stroke_width,
         )
-    for i, line in enumerate(textwrap.wrap(ball.capacity_description, width=44)):
+        for i, line in enumerate(lines)
+    ]
+    left = min(box[0] for box in boxes)
+    top = min(box[1] for box in boxes)
+    right = max(box[2] for box in boxes)
+    bottom = max(box[3] for box in boxes)
+
+    # the transparent pixels take the color of the outer edge of the text, otherwise the
+    # antialiasing would blend with black once composited
+    edge = style.stroke_fill if style.stroke_width else style.fill
+    layer = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)), edge[:3] + (0,))
+    draw = ImageDraw.Draw(layer)
+    for i, line in enumerate(lines):
         draw.text(
-            (80, 1160 + 60 * i),
+            (-left, line_height * i - top),
             line,
-            font=capacity_description_font,
-            stroke_width=1,
-            stroke_fill=(0, 0, 0, 255),
+            font=style.font,
+            fill=style.fill,
+            stroke_width=style.stroke_width,
+            stroke_fill=style.stroke_fill,
+            anchor=style.anchor,
         )
-    rarity = ball_instance.countryball.rarity
-    draw.text(
-    (1280, 10),
-    str(rarity),
-    font=stats_font,
-    fill=(255, 191, 0),
-    stroke_width=5,
-    stroke_fill=(0, 0, 0, 255),
-    anchor="ra",
-    )
-    draw.text(
-        (301, 1615),
-        str(ball_instance.health),
-        font=stats_font,
-        fill=ball_health,
-        stroke_width=1,
-        stroke_fill=(0, 0, 0, 255),
+    return layer, left, top
+
+
+def draw_text(
+    image: Image.Image,
+    xy: tuple[int, int],
+    lines: list[str],
+    style: TextStyle,
+    line_height: int = 0,
+):
+    """
+    Draw lines of text on the image. Stroked text is one of the most expensive steps of the
+    rendering, so each block is rendered once on its own layer, then composited.
+    """
+    if not lines:
+        return
+    key = (tuple(lines), style, line_height)
+    try:
+        layer, left, top = text_cache[key]
+    except KeyError:
+        layer, left, top = text_cache[key] = render_text(key[0], style, line_height)
+    x, y = xy[0] + left, xy[1] + top
+    if x < 0 or y < 0:
+        layer = layer.crop((max(-x, 0), max(-y, 0), layer.width, layer.height))
+        x, y = max(x, 0), max(y, 0)
+    image.alpha_composite(layer, (x, y))
+
+
+def render_base(spec: CardSpec) -> Image.Image:
+    """
+    Render everything that doesn't depend on the instance, which is the whole card except
+    the health and attack stats.
+    """
+    image = open_asset(spec.background).copy()
+    if spec.frame_overlay:
+        # stretched to the card rather than fitted, overlays are drawn for its whole surface
+        overlay = open_asset(spec.frame_overlay)
+        if overlay.size != image.size:
+            overlay = overlay.resize(image.size)
+        image.alpha_composite(overlay)
+
+    draw_text(image, (30, 30), [spec.title], TITLE_STYLE)
+    draw_text(
+        image,
+        (100, 1050),
+        textwrap.wrap(f"CODE: {spec.capacity_name}", width=30),
+        CAPACITY_NAME_STYLE,
+        line_height=100,
     )
-    draw.text(
-        (1142, 1615),
-        str(ball_instance.attack),
-        font=stats_font,
-        fill=(252, 194, 76, 255),
-        stroke_width=1,
-        stroke_fill=(0, 0, 0, 255),
-        anchor="ra",
+    draw_text(
+        image,
+        (80, 1160),
+        textwrap.wrap(spec.capacity_description, width=44),
+        CAPACITY_DESCRIPTION_STYLE,
+        line_height=60,
     )
-    draw.text(
+    draw_text(image, (1280, 10), [str(spec.rarity)], RARITY_STYLE)
+    draw_text(
+        image,
         (30, 1870),
         # Modifying the line below is breaking the licence as you are removing credits
         # If you don't want to receive a DMCA, just don't
-        "Property & Licensed by El Laggron\n" f"Owners: Alfie,Snape",
-        font=credits_font,
-        fill=(230, 230, 230, 255),
-        stroke_width=0,
-        stroke_fill=(255, 255, 255, 255),
+        ["Property & Licensed by El Laggron\n" f"Owners: Alfie,Snape"],
+        CREDITS_STYLE,
     )
 
-    artwork = Image.open(media_path + ball.collection_card).convert("RGBA")
-    image.paste(ImageOps.fit(artwork, artwork_size), CORNERS[0])  # type: ignore
-
-    if icon:
-        icon = ImageOps.fit(icon, (170, 170))
+    image.paste(open_asset(spec.artwork, ARTWORK_SLOT), CORNERS[0])
+    if spec.economy_icon:
+        icon = open_asset(spec.economy_icon, ICON_SLOT)
         image.paste(icon, (1142, 1030), mask=icon)
-        icon.close()
-    artwork.close()
 
-    return image, {"format": "WEBP"}
\ No newline at end of file
+    return image
+
+
+def get_base(spec: CardSpec) -> Image.Image:
+    """
+    Fetch the static layer of a card from the cache, rendering it on a miss. The returned
+    image is shared and must not be modified.
+    """
+    key = (replace(spec, health=0, attack=0), asset_versions(spec))
+    try:
+        base = base_cache[key]
+    except KeyError:
+        base_cache.misses += 1
+    else:
+        base_cache.hits += 1
+        return base
+
+    base = render_base(spec)
+    try:
+        base_cache[key] = base
+    except ValueError:
+        pass  # larger than the whole cache
+    return base
+
+
+def render_card(spec: CardSpec, scale: int = 1) -> Image.Image:
+    """
+    Render a card, optionally downscaled by one of the `THUMBNAIL_SCALES` factors.
+    """
+    if scale not in THUMBNAIL_SCALES:
+        raise ValueError(f"Unsupported thumbnail scale {scale}")
+    image = get_base(spec).copy()
+    # the stats are drawn outside of the artwork and icon slots, so stamping them over the
+    # composited base gives the same result as drawing them in order
+    draw_text(image, (301, 1615), [str(spec.health)], HEALTH_STYLE)
+    draw_text(image, (1142, 1615), [str(spec.attack)], ATTACK_STYLE)
+    if scale > 1:
+        # box filter over integer factors, fast and good enough for thumbnails
+        image = image.reduce(scale)
+    return image
+
+
+def save_image(image: Image.Image, save_kwargs: dict[str, Any]) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, **(save_kwargs or DEFAULT_SAVE_KWARGS))
+    image.close()
+    return buffer.getvalue()
+
+
+def encode_card(spec: CardSpec, scale: int = 1, **save_kwargs: Any) -> bytes:
+    """
+    Render and encode a card. This is the entrypoint used by the render workers, the encoded
+    bytes are much cheaper to send back to the bot process than the raw image.
+    """
+    return save_image(render_card(spec, scale), save_kwargs)
+
+
+def compose_sheet(thumbnails: list[bytes], columns: int, **save_kwargs: Any) -> bytes:
+    """
+    Lay encoded thumbnails of the same size on a grid, left to right then top to bottom.
+    """
+    if not thumbnails:
+        raise ValueError("No thumbnail to compose")
+    images = [Image.open(BytesIO(data)) for data in thumbnails]
+    width, height = images[0].size
+    columns = min(columns, len(images))
+    rows = -(-len(images) // columns)
+    sheet = Image.new(
+        "RGBA",
+        (columns * (width + SHEET_GAP) - SHEET_GAP, rows * (height + SHEET_GAP) - SHEET_GAP),
+        (0, 0, 0, 0),
+    )
+    for i, image in enumerate(images):
+        with image:
+            sheet.paste(
+                image.convert("RGBA"),
+                ((i % columns) * (width + SHEET_GAP), (i // columns) * (height + SHEET_GAP)),
+            )
+    return save_image(sheet, save_kwargs)
+
+
+def draw_card(
+    ball_instance: "BallInstance",
+    media_path: str = MEDIA_PATH,
+    frame_overlay: str | None = None,
+) -> tuple[Image.Image, dict[str, Any]]:
+    spec = build_card_spec(ball_instance, media_path, frame_overlay)
+    return render_card(spec), dict(DEFAULT_SAVE_KWARGS)
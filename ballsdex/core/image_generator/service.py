@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from ballsdex.core.image_generator import image_gen
+from ballsdex.core.image_generator.assets import AssetStore
+from ballsdex.core.image_generator.cache import CardCache
+from ballsdex.core.image_generator.image_gen import (
+    CardSpec,
+    compose_sheet,
+    configure_worker,
+    encode_card,
+)
+
+log = logging.getLogger("ballsdex.core.image_generator.service")
+
+T = TypeVar("T")
+
+render_queue_depth = Gauge("card_render_queue_depth", "Cards waiting for or being rendered")
+render_duration = Histogram(
+    "card_render_seconds",
+    "Time spent rendering a card, including time spent in the queue",
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, float("inf")),
+)
+render_rejected = Counter("card_render_rejected", "Card renders rejected because of a full queue")
+layer_cache_hits = Counter("card_layer_cache_hits", "Card renders reusing a cached base layer")
+layer_cache_misses = Counter("card_layer_cache_misses", "Card renders composing a new base layer")
+layer_cache_evictions = Counter(
+    "card_layer_cache_evictions", "Base layers evicted from the worker caches"
+)
+
+
+class RenderQueueFull(Exception):
+    """
+    Raised when too many cards are already waiting to be rendered. Better tell the user to
+    retry than miss the interaction deadline.
+    """
+
+
+class RenderService:
+    """
+    Long-lived pool of worker processes rendering cards.
+
+    Pillow holds the GIL for most of the drawing work, rendering in a separate process keeps
+    the event loop responsive during bursts of card requests.
+
+    Parameters
+    ----------
+    workers: int
+        Number of worker processes. With 0, cards are rendered in a single thread of the
+        current process instead.
+    queue_size: int
+        Maximum number of cards waiting for or being rendered. Further requests are rejected
+        with `RenderQueueFull`.
+    layer_cache_size: int
+        Memory budget of the base layer cache of each worker, in megabytes.
+    disk_cache: CardCache | None
+        Cache of encoded cards, checked before rendering.
+    asset_store: AssetStore | None
+        Store of pre-fitted assets shared by the workers.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        queue_size: int = 64,
+        layer_cache_size: int = 128,
+        disk_cache: CardCache | None = None,
+        asset_store: AssetStore | None = None,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.layer_cache_size = layer_cache_size
+        self.disk_cache = disk_cache
+        self.asset_store = asset_store
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        # processes are spawned lazily on the first render
+        if self._executor is None:
+            initargs = (
+                self.layer_cache_size * 1024 * 1024,
+                str(self.asset_store.path) if self.asset_store else None,
+            )
+            if self.workers > 0:
+                # spawn instead of fork, we don't want to duplicate the bot's sockets and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=configure_worker,
+                    initargs=initargs,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="card-render",
+                    initializer=configure_worker,
+                    initargs=initargs,
+                )
+            log.debug(f"Started card render pool with {self.workers} workers")
+        return self._executor
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.queue_size:
+            render_rejected.inc()
+            raise RenderQueueFull(f"{self.pending} cards are already waiting to be rendered")
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        render_queue_depth.set(self.pending)
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            render_queue_depth.set(self.pending)
+
+    async def render(self, spec: CardSpec, scale: int = 1, **save_kwargs: Any) -> BytesIO:
+        """
+        Render and encode a card in the worker pool, or fetch it from the disk cache.
+
+        Parameters
+        ----------
+        spec: CardSpec
+            The card to render, obtained from `BallInstance.card_spec`.
+        scale: int
+            Downscaling factor for thumbnails, one of `THUMBNAIL_SCALES`.
+        **save_kwargs: Any
+            Arguments passed to `Image.save`, defaults to WEBP.
+
+        Returns
+        -------
+        BytesIO
+            A buffer holding the encoded image, seeked to the start.
+
+        Raises
+        ------
+        RenderQueueFull
+            Too many cards are already being rendered.
+        """
+        if self.disk_cache:
+            data = await asyncio.to_thread(self.disk_cache.get, spec, scale, save_kwargs)
+            if data is not None:
+                return BytesIO(data)
+
+        t1 = time.perf_counter()
+        data, stats = await self._submit(_encode_card, spec, scale, save_kwargs)
+        render_duration.observe(time.perf_counter() - t1)
+        hits, misses, evictions = stats
+        layer_cache_hits.inc(hits)
+        layer_cache_misses.inc(misses)
+        layer_cache_evictions.inc(evictions)
+
+        if self.disk_cache:
+            try:
+                await asyncio.to_thread(self.disk_cache.put, spec, scale, save_kwargs, data)
+            except OSError:
+                log.warning("Failed to store a card in the disk cache", exc_info=True)
+        return BytesIO(data)
+
+    async def render_sheet(
+        self, specs: list[CardSpec], scale: int = 4, columns: int = 5, **save_kwargs: Any
+    ) -> BytesIO:
+        """
+        Render a grid of card thumbnails as a single image, in a single job of the pool.
+        Thumbnails are cached on disk like cards, only the missing ones are rendered and they
+        are reused across pages and sheets.
+
+        Parameters
+        ----------
+        specs: list[CardSpec]
+            The cards to show, in order.
+        scale: int
+            Downscaling factor of the thumbnails, one of `THUMBNAIL_SCALES`.
+        columns: int
+            Maximum number of cards per row.
+        **save_kwargs: Any
+            Arguments passed to `Image.save` for the sheet, defaults to WEBP.
+
+        Raises
+        ------
+        RenderQueueFull
+            Too many cards are already being rendered.
+        """
+        thumbnails: list[bytes | None] = [None] * len(specs)
+        if disk_cache := self.disk_cache:
+            thumbnails = await asyncio.to_thread(
+                lambda: [disk_cache.get(spec, scale, {}) for spec in specs]
+            )
+
+        data, rendered, stats = await self._submit(
+            _render_sheet, specs, thumbnails, scale, columns, save_kwargs
+        )
+        hits, misses, evictions = stats
+        layer_cache_hits.inc(hits)
+        layer_cache_misses.inc(misses)
+        layer_cache_evictions.inc(evictions)
+
+        if disk_cache and rendered:
+
+            def store():
+                for index, thumbnail in rendered.items():
+                    disk_cache.put(specs[index], scale, {}, thumbnail)
+
+            try:
+                await asyncio.to_thread(store)
+            except OSError:
+                log.warning("Failed to store thumbnails in the disk cache", exc_info=True)
+        return BytesIO(data)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _encode_card(
+    spec: CardSpec, scale: int, save_kwargs: dict[str, Any]
+) -> tuple[bytes, tuple[int, int, int]]:
+    # run_in_executor does not accept keyword arguments
+    # the cache statistics of the worker are sent back along with the image
+    data = encode_card(spec, scale, **save_kwargs)
+    return data, image_gen.base_cache.pop_stats()
+
+
+def _render_sheet(
+    specs: list[CardSpec],
+    thumbnails: list[bytes | None],
+    scale: int,
+    columns: int,
+    save_kwargs: dict[str, Any],
+) -> tuple[bytes, dict[int, bytes], tuple[int, int, int]]:
+    # the thumbnails missing from the disk cache are rendered here and sent back to be stored
+    rendered = {
+        i: encode_card(spec, scale)
+        for i, (spec, thumbnail) in enumerate(zip(specs, thumbnails))
+        if thumbnail is None
+    }
+    sheet = compose_sheet(
+        [thumbnail or rendered[i] for i, thumbnail in enumerate(thumbnails)],
+        columns,
+        **save_kwargs,
+    )
+    return sheet, rendered, image_gen.base_cache.pop_stats()
@@ -16,6 +16,18 @@ log = logging.getLogger("ballsdex.core.metrics")
 caught_balls = Counter(
     "caught_cb", "Caught countryballs", ["country", "special", "guild_size", "spawn_algo"]
 )
+owned_balls_lookups = Counter(
+    "owned_balls_lookups", "Lookups of the owned countryballs cache", ["result"]
+)
+# each hit is a query saved
+player_cache_lookups = Counter("player_cache_lookups", "Lookups of the player cache", ["result"])
+# suppressed edits are the ones skipped because the menu did not change since the last tick
+menu_edits = Counter("menu_edits", "Edits of the trade and bet menus", ["result"])
+social_graph_lookups = Counter(
+    "social_graph_lookups", "Lookups of the friends and blocks of players", ["result"]
+)
+# each fetch is a rate-limited REST call
+user_lookups = Counter("user_lookups", "Lookups of Discord users by ID", ["result"])
 
 
 class PrometheusServer:
@@ -39,6 +51,9 @@ class PrometheusServer:
         self.shards_latecy = Histogram(
             "gateway_latency", "Shard latency with the Discord gateway", ["shard_id"]
         )
+        self.owned_balls_size = Gauge(
+            "owned_balls_cache_bytes", "Estimated memory used by the owned countryballs cache"
+        )
         self.asyncio_delay = Histogram(
             "asyncio_delay",
             "How much time asyncio takes to give back control",
@@ -73,6 +88,8 @@ class PrometheusServer:
         for size, count in guilds.items():
             self.guild_count.labels(size=size).set(count)
 
+        self.owned_balls_size.set(self.bot.owned_balls.cache.currsize)
+
         for shard_id, latency in self.bot.latencies:
             self.shards_latecy.labels(shard_id=shard_id).observe(latency)
 
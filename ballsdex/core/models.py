@@ -1,18 +1,17 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import IntEnum
 from io import BytesIO
 from typing import TYPE_CHECKING, Iterable, Tuple, Type
 
 import discord
 from discord.utils import format_dt
-from tortoise import exceptions, fields, models, signals, timezone, validators
+from tortoise import exceptions, fields, models, signals, validators
 from tortoise.contrib.postgres.indexes import PostgreSQLIndex
 from tortoise.expressions import Q
 
-from ballsdex.core.image_generator.image_gen import draw_card
+from ballsdex.core.image_generator.image_gen import CardSpec, build_card_spec, draw_card
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -203,6 +202,7 @@ Ball.register_listener(signals.Signals.pre_save, lower_translations)
 
 class BallInstance(models.Model):
     ball_id: int
+    player_id: int
     special_id: int
     trade_player_id: int
 
@@ -215,6 +215,11 @@ class BallInstance(models.Model):
     server_id = fields.BigIntField(
         description="Discord server ID where this ball was caught", null=True
     )
+    spawn_message_id = fields.BigIntField(
+        description="Discord message ID of the spawn this ball was caught from",
+        null=True,
+        unique=True,
+    )
     special: fields.ForeignKeyRelation[Special] | None = fields.ForeignKeyField(
         "models.Special", null=True, default=None, on_delete=fields.SET_NULL
     )
@@ -329,6 +334,9 @@ class BallInstance(models.Model):
                     text = f"{emoji} {text}"
         return text
 
+    def card_spec(self, frame_overlay: str | None = None) -> CardSpec:
+        return build_card_spec(self, frame_overlay=frame_overlay)
+
     def draw_card(self) -> BytesIO:
         image, kwargs = draw_card(self)
         buffer = BytesIO()
@@ -338,7 +346,7 @@ class BallInstance(models.Model):
         return buffer
 
     async def prepare_for_message(
-        self, interaction: discord.Interaction["BallsDexBot"]
+        self, interaction: discord.Interaction["BallsDexBot"], frame_overlay: str | None = None
     ) -> Tuple[str, discord.File, discord.ui.View]:
         # message content
         trade_content = ""
@@ -376,25 +384,11 @@ class BallInstance(models.Model):
         )
 
         # draw image
-        with ThreadPoolExecutor() as pool:
-            buffer = await interaction.client.loop.run_in_executor(pool, self.draw_card)
+        buffer = await interaction.client.render_service.render(self.card_spec(frame_overlay))
 
         view = discord.ui.View()
         return content, discord.File(buffer, "card.webp"), view
 
-    async def lock_for_trade(self):
-        self.locked = timezone.now()
-        await self.save(update_fields=("locked",))
-
-    async def unlock(self):
-        self.locked = None  # type: ignore
-        await self.save(update_fields=("locked",))
-
-    async def is_locked(self):
-        await self.refresh_from_db(fields=("locked",))
-        self.locked
-        return self.locked is not None and (self.locked + timedelta(minutes=30)) > timezone.now()
-
 
 class DonationPolicy(IntEnum):
     ALWAYS_ACCEPT = 1
@@ -539,6 +533,7 @@ class Trade(models.Model):
 
 class TradeObject(models.Model):
     trade_id: int
+    player_id: int
 
     trade: fields.ForeignKeyRelation[Trade] = fields.ForeignKeyField(
         "models.Trade", related_name="tradeobjects"
@@ -569,6 +564,8 @@ class Friendship(models.Model):
     player2: fields.ForeignKeyRelation[Player] = fields.ForeignKeyField(
         "models.Player", related_name="friend2"
     )
+    player1_id: int
+    player2_id: int
     since = fields.DatetimeField(auto_now_add=True)
 
     def __str__(self) -> str:
@@ -583,6 +580,8 @@ class Block(models.Model):
     player2: fields.ForeignKeyRelation[Player] = fields.ForeignKeyField(
         "models.Player", related_name="block2"
     )
+    player1_id: int
+    player2_id: int
     date = fields.DatetimeField(auto_now_add=True)
 
     def __str__(self) -> str:
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Iterable
+
+from tortoise import Tortoise
+
+log = logging.getLogger("ballsdex.core.utils.locks")
+
+# a lock older than this is ignored, in case it was never released
+LOCK_DURATION = timedelta(minutes=30)
+RECLAIM_INTERVAL = 5 * 60
+
+# only takes the instances which are free, a single statement cannot race with another one
+_LOCK = """
+UPDATE ballinstance SET locked = now()
+WHERE id = ANY($1::bigint[]) AND (locked IS NULL OR locked < now() - $2::interval)
+RETURNING id
+"""
+_UNLOCK = "UPDATE ballinstance SET locked = NULL WHERE id = ANY($1::bigint[])"
+_LOCKED = """
+SELECT id, extract(epoch FROM locked) AS locked FROM ballinstance
+WHERE locked >= now() - $1::interval
+"""
+_RECLAIM = "UPDATE ballinstance SET locked = NULL WHERE locked < now() - $1::interval"
+
+
+class BallLocks:
+    """
+    The countryballs locked for a trade, a bet, a donation or a spawn, by instance ID.
+
+    Locks are taken and released for many instances at once with a single statement each, and
+    mirrored in memory with their expiration so that checking them needs no query. The index is
+    loaded from the database on start, and expired locks are cleared in the background.
+
+    The instances unlocked by other statements (transfers, catches) must be released from the
+    index with `discard`.
+    """
+
+    def __init__(self):
+        # instance ID to expiration timestamp
+        self.expiry: dict[int, float] = {}
+        self.reclaimer: asyncio.Task[None] | None = None
+
+    def __contains__(self, instance_id: object) -> bool:
+        expiry = self.expiry.get(instance_id)  # type: ignore
+        return expiry is not None and expiry > time.time()
+
+    def __len__(self) -> int:
+        return len(self.expiry)
+
+    def locked_among(self, instance_ids: Iterable[int]) -> set[int]:
+        """
+        The instances which are currently locked, without querying the database.
+        """
+        now = time.time()
+        return {x for x in instance_ids if self.expiry.get(x, 0) > now}
+
+    async def lock(self, instance_ids: Iterable[int]) -> set[int]:
+        """
+        Lock the instances which are free, in a single statement.
+
+        Returns
+        -------
+        set[int]
+            The instances this call locked, the others were already locked.
+        """
+        free = [x for x in set(instance_ids) if x not in self]
+        if not free:
+            return set()
+        connection = Tortoise.get_connection("default")
+        rows = await connection.execute_query_dict(_LOCK, [free, LOCK_DURATION])
+        locked = {row["id"] for row in rows}
+        expiry = time.time() + LOCK_DURATION.total_seconds()
+        for instance_id in locked:
+            self.expiry[instance_id] = expiry
+        return locked
+
+    async def unlock(self, instance_ids: Iterable[int]):
+        """
+        Release the instances in a single statement.
+        """
+        ids = list(set(instance_ids))
+        if not ids:
+            return
+        self.discard(ids)
+        connection = Tortoise.get_connection("default")
+        await connection.execute_query(_UNLOCK, [ids])
+
+    def discard(self, instance_ids: Iterable[int]):
+        """
+        Forget the locks of instances released by another statement.
+        """
+        for instance_id in instance_ids:
+            self.expiry.pop(instance_id, None)
+
+    async def load(self):
+        """
+        Fill the index with the locks found in the database.
+        """
+        connection = Tortoise.get_connection("default")
+        rows = await connection.execute_query_dict(_LOCKED, [LOCK_DURATION])
+        duration = LOCK_DURATION.total_seconds()
+        self.expiry = {row["id"]: float(row["locked"]) + duration for row in rows}
+        log.info(f"{len(self.expiry)} locked countryballs loaded")
+
+    async def reclaim(self):
+        """
+        Clear the expired locks, from the index and the database.
+        """
+        now = time.time()
+        for instance_id in [x for x, expiry in self.expiry.items() if expiry <= now]:
+            del self.expiry[instance_id]
+        connection = Tortoise.get_connection("default")
+        await connection.execute_query(_RECLAIM, [LOCK_DURATION])
+
+    async def _reclaim_loop(self):
+        while True:
+            await asyncio.sleep(RECLAIM_INTERVAL)
+            try:
+                await self.reclaim()
+            except Exception:
+                log.exception("Failed to reclaim the expired locks")
+
+    async def start(self):
+        await self.load()
+        if self.reclaimer is None:
+            self.reclaimer = asyncio.create_task(self._reclaim_loop(), name="ball-locks-reclaim")
+
+    def stop(self):
+        if self.reclaimer is not None:
+            self.reclaimer.cancel()
+            self.reclaimer = None
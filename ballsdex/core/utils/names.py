@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Ball
+
+# every quote and dash variant is folded into its ASCII counterpart, fullwidth forms are
+# already handled by the compatibility decomposition
+_PUNCTUATION = str.maketrans(
+    {
+        **dict.fromkeys("\u2018\u2019\u201a\u201b\u2032\u2035\u02bb\u02bc`\u00b4", "'"),
+        **dict.fromkeys("\u201c\u201d\u201e\u201f\u2033\u2036\u00ab\u00bb", '"'),
+        **dict.fromkeys(
+            "\u2010\u2011\u2012\u2013\u2014\u2015\u2043\u2212\u2e3a\u2e3b\ufe58\ufe63", "-"
+        ),
+    }
+)
+# accents and other diacritics left apart by the decomposition
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+# joins the names of a ball for substring search, cannot be typed
+_SEPARATOR = "\0"
+
+
+# the same few names are guessed over and over while a ball is spawned
+@lru_cache(maxsize=4096)
+def normalize_name(text: str) -> str:
+    """
+    Fold a name for comparison: case, compatibility forms, accents, quote and dash variants
+    and whitespace are all normalized.
+    """
+    if text.isascii():
+        # fast path for most guesses, nothing to decompose
+        return " ".join(text.lower().translate(_PUNCTUATION).split())
+    text = _COMBINING.sub("", unicodedata.normalize("NFKD", text.casefold()))
+    return " ".join(text.translate(_PUNCTUATION).split())
+
+
+def ball_names(ball: Ball) -> frozenset[str]:
+    """
+    The normalized names a ball can be caught with.
+    """
+    names = [ball.country]
+    for field in (ball.catch_names, ball.translations):
+        if field:
+            names.extend(field.split(";"))
+    return frozenset(name for name in map(normalize_name, names) if name)
+
+
+class NameIndex:
+    """
+    Normalized names of the countryballs, built from the cache on load. Catch attempts and
+    autocompletion normalize the input the same way, then only compare strings.
+
+    Balls edited since the index was built are detected and indexed again on access.
+
+    Parameters
+    ----------
+    balls: Iterable[Ball]
+        The countryballs to index, usually the values of the `balls` cache.
+    """
+
+    def __init__(self, balls: Iterable[Ball]):
+        # (country, catch names, translations) the entry was built from, names, search text
+        self.entries: dict[int, tuple[tuple[str, str | None, str | None], frozenset[str], str]]
+        self.entries = {}
+        for ball in balls:
+            self._index(ball)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _index(self, ball: Ball) -> tuple[frozenset[str], str]:
+        names = ball_names(ball)
+        search = _SEPARATOR.join(sorted(names))
+        self.entries[ball.pk] = (
+            (ball.country, ball.catch_names, ball.translations),
+            names,
+            search,
+        )
+        return names, search
+
+    def _get(self, ball: Ball) -> tuple[frozenset[str], str]:
+        entry = self.entries.get(ball.pk)
+        if entry is None or entry[0] != (ball.country, ball.catch_names, ball.translations):
+            return self._index(ball)
+        return entry[1], entry[2]
+
+    def names(self, ball: Ball) -> frozenset[str]:
+        return self._get(ball)[0]
+
+    def matches(self, ball: Ball, text: str) -> bool:
+        """
+        Whether the text is one of the names of the ball.
+        """
+        return normalize_name(text) in self._get(ball)[0]
+
+    def search(self, balls: Iterable[Ball], text: str, limit: int = 25) -> list[Ball]:
+        """
+        Balls having a name which contains the text, in the given order.
+        """
+        query = normalize_name(text)
+        results: list[Ball] = []
+        for ball in balls:
+            if query in self._get(ball)[1]:
+                results.append(ball)
+                if len(results) == limit:
+                    break
+        return results
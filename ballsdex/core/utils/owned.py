@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import sys
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from cachetools import TTLCache
+from tortoise import signals
+
+from ballsdex.core.metrics import owned_balls_lookups
+from ballsdex.core.models import BallInstance
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+log = logging.getLogger("ballsdex.core.utils.owned")
+
+# notified by the admin panel with the primary key of each player whose countryballs changed
+OWNED_CHANGE_CHANNEL = "ballsdex_owned_change"
+
+# key, dict slot, LRU and expiry bookkeeping of a cache entry, on top of the bitset itself
+ENTRY_OVERHEAD = 200
+
+
+class BallSet:
+    """
+    A set of ball IDs stored as the bits of an integer. Set operations are bit operations,
+    and the size is a population count.
+
+    Parameters
+    ----------
+    bits: int
+        Bit `n` is set if the ball with ID `n` is in the set.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> BallSet:
+        ids = list(ids)
+        if not ids:
+            return cls()
+        # filling a buffer is linear, or-ing growing integers is not
+        buffer = bytearray((max(ids) >> 3) + 1)
+        for ball_id in ids:
+            buffer[ball_id >> 3] |= 1 << (ball_id & 7)
+        return cls(int.from_bytes(buffer, "little"))
+
+    def __contains__(self, ball_id: object) -> bool:
+        return isinstance(ball_id, int) and ball_id >= 0 and self.bits >> ball_id & 1 == 1
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        data = self.bits.to_bytes((self.bits.bit_length() + 7) >> 3, "little")
+        for index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield (index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BallSet) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __and__(self, other: BallSet) -> BallSet:
+        return BallSet(self.bits & other.bits)
+
+    def __or__(self, other: BallSet) -> BallSet:
+        return BallSet(self.bits | other.bits)
+
+    def __sub__(self, other: BallSet) -> BallSet:
+        return BallSet(self.bits & ~other.bits)
+
+    def __repr__(self) -> str:
+        return f"<BallSet {list(self)}>"
+
+
+def _entry_size(bits: int) -> int:
+    return sys.getsizeof(bits) + ENTRY_OVERHEAD
+
+
+class OwnedBalls:
+    """
+    The IDs of the countryballs owned by each player, as `BallSet` kept in an LRU cache within
+    a memory budget. A player is loaded with a single query on first use.
+
+    Created and saved instances are added to their owner through the signals of `BallInstance`,
+    call `add` for instances changed by raw queries. A player losing an instance may still own
+    another copy, so the previous owner must be invalidated with `invalidate`. The admin panel
+    notifies its edits on the `ballsdex_owned_change` channel, see `on_notification`. Entries
+    expire after a while in any case.
+
+    Parameters
+    ----------
+    max_size: int
+        Memory budget of the cache in bytes, 0 to disable.
+    ttl: float
+        Seconds after which a player is loaded again.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.cache: TTLCache[int, int] = TTLCache(max_size, ttl, getsizeof=_entry_size)
+        # players being loaded, with the bits added meanwhile and whether they were invalidated
+        self.loading: Counter[int] = Counter()
+        self.pending: dict[int, int] = {}
+        self.stale: set[int] = set()
+
+    def register(self):
+        """
+        Listen to the saves and deletions of ball instances.
+        """
+        BallInstance.register_listener(signals.Signals.post_save, self._on_save)
+        BallInstance.register_listener(signals.Signals.post_delete, self._on_delete)
+
+    async def _on_save(
+        self,
+        model: type[BallInstance],
+        instance: BallInstance,
+        created: bool,
+        using_db: "BaseDBAsyncClient | None" = None,
+        update_fields: Iterable[str] | None = None,
+    ):
+        self.add(instance.player_id, instance.ball_id)
+
+    async def _on_delete(
+        self,
+        model: type[BallInstance],
+        instance: BallInstance,
+        using_db: "BaseDBAsyncClient | None" = None,
+    ):
+        self.invalidate(instance.player_id)
+
+    def _store(self, player_id: int, bits: int):
+        try:
+            self.cache[player_id] = bits
+        except ValueError:
+            # larger than the whole budget, or the cache is disabled
+            pass
+
+    async def get(self, player_id: int) -> BallSet:
+        """
+        The IDs of the countryballs owned by a player, disabled ones included.
+
+        Parameters
+        ----------
+        player_id: int
+            The primary key of the player, not the Discord ID.
+        """
+        bits = self.cache.get(player_id)
+        if bits is not None:
+            owned_balls_lookups.labels(result="hit").inc()
+            return BallSet(bits)
+        owned_balls_lookups.labels(result="miss").inc()
+
+        self.loading[player_id] += 1
+        self.pending.setdefault(player_id, 0)
+        try:
+            ids: list[Any] = (
+                await BallInstance.filter(player_id=player_id)
+                .distinct()
+                .values_list("ball_id", flat=True)
+            )
+        finally:
+            bits = self.pending[player_id]
+            stale = player_id in self.stale
+            self.loading[player_id] -= 1
+            if not self.loading[player_id]:
+                del self.loading[player_id]
+                del self.pending[player_id]
+                self.stale.discard(player_id)
+
+        owned = BallSet.from_ids(ids)
+        owned.bits |= bits
+        if not stale:
+            self._store(player_id, owned.bits)
+        return owned
+
+    async def owns(self, player_id: int, ball_id: int) -> bool:
+        return ball_id in await self.get(player_id)
+
+    def add(self, player_id: int, ball_id: int):
+        """
+        Mark a countryball as owned by a player, if this player is cached.
+        """
+        bit = 1 << ball_id
+        if player_id in self.cache:
+            self._store(player_id, self.cache[player_id] | bit)
+        if player_id in self.loading:
+            self.pending[player_id] |= bit
+
+    def invalidate(self, player_id: int):
+        """
+        Forget a player after they lost countryballs, they will be loaded again on next use.
+        """
+        self.cache.pop(player_id, None)
+        if player_id in self.loading:
+            self.stale.add(player_id)
+
+    def on_notification(self, payload: str):
+        """
+        Forget a player whose countryballs were edited from the admin panel, notified on
+        `OWNED_CHANGE_CHANNEL`.
+        """
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            log.warning(f"Invalid owned countryballs notification: {payload!r}")
+
+    def clear(self):
+        self.cache.clear()
+        self.stale.update(self.loading)
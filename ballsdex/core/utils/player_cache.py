@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from cachetools import TTLCache
+from tortoise import Tortoise, signals
+
+from ballsdex.core.metrics import player_cache_lookups
+from ballsdex.core.models import (
+    DonationPolicy,
+    FriendPolicy,
+    MentionPolicy,
+    Player,
+    PrivacyPolicy,
+    TradeCooldownPolicy,
+)
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+log = logging.getLogger("ballsdex.core.utils.player_cache")
+
+# notified by the admin panel with the Discord ID of each edited or deleted player
+PLAYER_CHANGE_CHANNEL = "ballsdex_player_change"
+
+# Creates the player with the discord ID $1 and the policies $2 to $6 if missing. The inserted
+# row is not visible to the select of the same statement, so exactly one of the two returns the
+# player, unless another statement created them in the meantime.
+PLAYER_UPSERT = """
+WITH new_player AS (
+    INSERT INTO player (
+        discord_id, donation_policy, privacy_policy, mention_policy, friend_policy,
+        trade_cooldown_policy, extra_data
+    )
+    VALUES (
+        $1::bigint, $2::smallint, $3::smallint, $4::smallint, $5::smallint, $6::smallint, '{}'
+    )
+    ON CONFLICT (discord_id) DO NOTHING
+    RETURNING *
+), player_row AS (
+    SELECT * FROM new_player
+    UNION ALL
+    SELECT * FROM player WHERE discord_id = $1
+)"""
+
+GET_OR_CREATE = (
+    PLAYER_UPSERT
+    + """
+SELECT player_row.*, EXISTS (SELECT 1 FROM new_player) AS player_created FROM player_row
+"""
+)
+
+
+def player_values(discord_id: int) -> list[Any]:
+    """
+    The parameters of `PLAYER_UPSERT`, with the same defaults as the Player model.
+    """
+    return [
+        discord_id,
+        DonationPolicy.ALWAYS_ACCEPT.value,
+        PrivacyPolicy.DENY.value,
+        MentionPolicy.ALLOW.value,
+        FriendPolicy.ALLOW.value,
+        TradeCooldownPolicy.COOLDOWN.value,
+    ]
+
+
+class PlayerRecord(NamedTuple):
+    id: int
+    discord_id: int
+    donation_policy: int
+    privacy_policy: int
+    mention_policy: int
+    friend_policy: int
+    trade_cooldown_policy: int
+
+    @classmethod
+    def from_player(cls, player: Player) -> PlayerRecord:
+        return cls(
+            player.pk,
+            player.discord_id,
+            player.donation_policy,
+            player.privacy_policy,
+            player.mention_policy,
+            player.friend_policy,
+            player.trade_cooldown_policy,
+        )
+
+    def to_player(self) -> Player:
+        # extra_data is not kept, so the player is partial and can only be saved with
+        # update_fields, which prevents overwriting it with a stale copy
+        return Player._init_from_db(**self._asdict())
+
+
+class PlayerCache:
+    """
+    Read-through cache of the players by Discord ID, in front of `Player.get_or_create`.
+    Only the primary key and the policies are kept, the returned players are partial models
+    without `extra_data` and must be saved with `update_fields`.
+
+    Saved and deleted players are updated through the signals of `Player`, and the admin panel
+    notifies its edits on the `ballsdex_player_change` channel, see `on_notification`. Entries
+    expire after a while in any case.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of players kept, 0 to disable.
+    ttl: float
+        Seconds after which a player is fetched again.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache: TTLCache[int, PlayerRecord] = TTLCache(maxsize, ttl)
+
+    def register(self):
+        """
+        Listen to the saves and deletions of players.
+        """
+        Player.register_listener(signals.Signals.post_save, self._on_save)
+        Player.register_listener(signals.Signals.post_delete, self._on_delete)
+
+    async def _on_save(
+        self,
+        model: type[Player],
+        instance: Player,
+        created: bool,
+        using_db: "BaseDBAsyncClient | None" = None,
+        update_fields: Iterable[str] | None = None,
+    ):
+        self.put(instance)
+
+    async def _on_delete(
+        self,
+        model: type[Player],
+        instance: Player,
+        using_db: "BaseDBAsyncClient | None" = None,
+    ):
+        self.invalidate(instance.discord_id)
+
+    def _lookup(self, discord_id: int) -> PlayerRecord | None:
+        record = self.cache.get(discord_id)
+        player_cache_lookups.labels(result="miss" if record is None else "hit").inc()
+        return record
+
+    def put(self, player: Player):
+        try:
+            self.cache[player.discord_id] = PlayerRecord.from_player(player)
+        except ValueError:
+            # the cache is disabled
+            pass
+
+    def invalidate(self, discord_id: int):
+        self.cache.pop(discord_id, None)
+
+    async def get(self, discord_id: int) -> Player | None:
+        """
+        Get a player by Discord ID, or `None` if they were never registered.
+        """
+        if record := self._lookup(discord_id):
+            return record.to_player()
+        player = await Player.get_or_none(discord_id=discord_id)
+        if player:
+            self.put(player)
+        return player
+
+    async def get_or_create(self, discord_id: int) -> tuple[Player, bool]:
+        """
+        Get a player by Discord ID, creating them if needed with a single statement.
+
+        Returns
+        -------
+        tuple[Player, bool]
+            The player, and whether they were just created.
+        """
+        if record := self._lookup(discord_id):
+            return record.to_player(), False
+
+        connection = Tortoise.get_connection("default")
+        for _ in range(2):
+            _, rows = await connection.execute_query(GET_OR_CREATE, player_values(discord_id))
+            if rows:
+                break
+            # the player was created by a concurrent statement, it is visible now
+        else:
+            raise RuntimeError(f"Could not create the player {discord_id}")
+
+        row = dict(rows[0])
+        created = row.pop("player_created")
+        player = Player._init_from_db(**row)
+        self.put(player)
+        return player, created
+
+    def on_notification(self, payload: str):
+        """
+        Drop a player edited from the admin panel, notified on `PLAYER_CHANGE_CHANNEL`.
+        """
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            log.warning(f"Invalid player change notification: {payload!r}")
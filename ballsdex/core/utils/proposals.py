@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+from cachetools import LRUCache
+
+if TYPE_CHECKING:
+    import discord
+
+    from ballsdex.core.models import BallInstance
+
+# a field value is at most 1024 characters, lines are not split between fields
+FIELD_LENGTH = 950
+# the content of an embed above which it cannot fit even without the other text
+EMBED_LENGTH = 6000
+
+
+class ProposalText:
+    """
+    The text of the countryballs proposed in trades and bets, laid out in embed fields.
+
+    Each line is rendered once per instance, display mode and lock or cancel state, then reused
+    by every menu and refresh. The fields of a proposal are kept by its instance IDs and state,
+    so when only one side of a menu changes, the other one is not laid out again.
+
+    The text depends on the loaded countryballs, specials and emojis, `clear` must be called
+    when they are reloaded.
+
+    Parameters
+    ----------
+    lines: int
+        Maximum number of lines kept.
+    layouts: int
+        Maximum number of laid out proposals kept.
+    """
+
+    def __init__(self, lines: int = 50_000, layouts: int = 1024):
+        self.lines: LRUCache[tuple, str] = LRUCache(lines)
+        self.layouts: LRUCache[tuple, tuple[list[str], int]] = LRUCache(layouts)
+
+    def clear(self):
+        self.lines.clear()
+        self.layouts.clear()
+
+    def line(
+        self,
+        bot: "discord.Client",
+        instance: "BallInstance",
+        *,
+        short: bool = False,
+        locked: bool = False,
+        cancelled: bool = False,
+    ) -> str:
+        """
+        The line of a countryball in a proposal, with its emojis.
+        """
+        # everything the description reads from the instance, none of it changes in a trade
+        key = (
+            instance.pk,
+            instance.ball_id,
+            instance.special_id,
+            instance.attack_bonus,
+            instance.health_bonus,
+            short,
+            locked,
+            cancelled,
+        )
+        if (text := self.lines.get(key)) is not None:
+            return text
+        text = instance.description(short=short, include_emoji=True, bot=bot, is_trade=True)
+        if locked:
+            text = f"- *{text}*\n"
+        else:
+            text = f"- {text}\n"
+        if cancelled:
+            text = f"~~{text}~~"
+        self.lines[key] = text
+        return text
+
+    def fields(
+        self,
+        bot: "discord.Client",
+        proposal: Sequence["BallInstance"],
+        *,
+        short: bool = False,
+        locked: bool = False,
+        cancelled: bool = False,
+    ) -> tuple[list[str], int]:
+        """
+        Split a proposal in field values lower than 1024 characters, without cutting lines.
+
+        Returns
+        -------
+        tuple[list[str], int]
+            The field values, which must not be modified, and their total length.
+        """
+        key = (tuple(x.pk for x in proposal), short, locked, cancelled)
+        if (layout := self.layouts.get(key)) is not None:
+            return layout
+
+        fields: list[str] = []
+        current: list[str] = []
+        length = 0
+        for instance in proposal:
+            text = self.line(bot, instance, short=short, locked=locked, cancelled=cancelled)
+            if current and len(text) + length > FIELD_LENGTH:
+                # move to a new field
+                fields.append("".join(current))
+                current = []
+                length = 0
+            current.append(text)
+            length += len(text)
+        fields.append("".join(current) or "*Empty*")
+
+        layout = (fields, sum(map(len, fields)))
+        self.layouts[key] = layout
+        return layout
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Hashable, Protocol
+
+from ballsdex.core.metrics import menu_edits
+
+if TYPE_CHECKING:
+    import discord
+
+log = logging.getLogger("ballsdex.core.utils.refresher")
+
+# seconds between two checks of the menus
+TICK = 15
+# seconds between two edits in the same channel
+CHANNEL_INTERVAL = 5
+
+
+class RefreshableMenu(Protocol):
+    channel: "discord.abc.GuildChannel | discord.abc.PrivateChannel"
+
+    def refresh_state(self) -> Hashable:
+        """
+        A cheap snapshot of what the menu displays, compared between ticks.
+        """
+        ...
+
+    async def refresh(self):
+        """
+        Render the menu and edit its message.
+        """
+        ...
+
+    async def refresh_timeout(self):
+        """
+        Called once the menu expires, it is not refreshed anymore.
+        """
+        ...
+
+
+class MenuRefresher:
+    """
+    Keeps the messages of the trade and bet menus up to date with a single task.
+
+    Each tick, the state of every menu is compared with the one last displayed, and only the
+    changed menus are edited, at most once per `CHANNEL_INTERVAL` seconds in a channel; the
+    others wait for the next tick. Timeouts are bucketed by tick in a timer wheel, so expiring
+    menus does not depend on how many are running.
+    """
+
+    def __init__(self):
+        # menu to the state last displayed
+        self.menus: dict[RefreshableMenu, Hashable] = {}
+        # tick number to the menus expiring then
+        self.wheel: defaultdict[int, set[RefreshableMenu]] = defaultdict(set)
+        self.deadlines: dict[RefreshableMenu, int] = {}
+        self.last_edit: dict[int, float] = {}
+        self.tick = 0
+        self.task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.menus)
+
+    def add(self, menu: RefreshableMenu, timeout: float):
+        """
+        Start refreshing a menu, whose message displays its current state.
+
+        Parameters
+        ----------
+        menu: RefreshableMenu
+            The menu to refresh.
+        timeout: float
+            Seconds after which `refresh_timeout` is called.
+        """
+        self.menus[menu] = menu.refresh_state()
+        deadline = self.tick + max(1, math.ceil(timeout / TICK))
+        self.wheel[deadline].add(menu)
+        self.deadlines[menu] = deadline
+        if self.task is None:
+            self.task = asyncio.create_task(self.run(), name="menu-refresher")
+
+    def remove(self, menu: RefreshableMenu):
+        """
+        Stop refreshing a menu, without calling its timeout.
+        """
+        self.menus.pop(menu, None)
+        if (deadline := self.deadlines.pop(menu, None)) is not None:
+            self.wheel[deadline].discard(menu)
+
+    async def _refresh(self, menu: RefreshableMenu, state: Hashable):
+        try:
+            await menu.refresh()
+        except Exception:
+            log.exception(f"Failed to refresh the menu {menu!r}")
+        else:
+            if menu in self.menus:
+                self.menus[menu] = state
+
+    async def _expire(self, menu: RefreshableMenu):
+        try:
+            await menu.refresh_timeout()
+        except Exception:
+            log.exception(f"Failed to time out the menu {menu!r}")
+
+    async def step(self):
+        """
+        Run one tick: expire the menus due now, then edit the changed ones.
+        """
+        self.tick += 1
+        expired = self.wheel.pop(self.tick, set())
+        for menu in expired:
+            self.menus.pop(menu, None)
+            self.deadlines.pop(menu, None)
+
+        now = time.monotonic()
+        refreshes = []
+        for menu, displayed in list(self.menus.items()):
+            state = menu.refresh_state()
+            if state == displayed:
+                menu_edits.labels(result="suppressed").inc()
+                continue
+            channel_id = menu.channel.id
+            if now - self.last_edit.get(channel_id, 0) < CHANNEL_INTERVAL:
+                # still dirty, picked up next tick
+                menu_edits.labels(result="deferred").inc()
+                continue
+            self.last_edit[channel_id] = now
+            menu_edits.labels(result="sent").inc()
+            refreshes.append(self._refresh(menu, state))
+
+        for channel_id, edited in list(self.last_edit.items()):
+            if now - edited >= CHANNEL_INTERVAL:
+                del self.last_edit[channel_id]
+        await asyncio.gather(*refreshes, *map(self._expire, expired))
+
+    async def run(self):
+        try:
+            while self.menus:
+                await asyncio.sleep(TICK)
+                await self.step()
+        finally:
+            self.task = None
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Generic, Iterable, TypeVar
+
+from tortoise.timezone import now as tortoise_now
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Ball, Special
+
+log = logging.getLogger("ballsdex.core.utils.sampler")
+
+T = TypeVar("T")
+
+ALL = "all"
+RARE = "rare"
+# rarity band of /admin balls spawnrare
+RARE_RANGE = (0.03, 2.5)
+
+
+class AliasSampler(Generic[T]):
+    """
+    Weighted random sampling in constant time with Vose's alias method.
+
+    The table is built once in O(n), each draw then costs a single random number, compared
+    to the O(n) of `random.choices` which has to sum the weights every time.
+
+    Parameters
+    ----------
+    items: Iterable[tuple[T, float]]
+        Items and their weight. Items with a weight of 0 or less are never drawn.
+
+    Raises
+    ------
+    ValueError
+        There is no item with a positive weight.
+    """
+
+    __slots__ = ("items", "weights", "total", "prob", "alias")
+
+    def __init__(self, items: Iterable[tuple[T, float]]):
+        pairs = [(item, weight) for item, weight in items if weight > 0]
+        if not pairs:
+            raise ValueError("Cannot sample from an empty population")
+        self.items: list[T] = [item for item, _ in pairs]
+        self.weights: list[float] = [weight for _, weight in pairs]
+        self.total = sum(self.weights)
+
+        n = len(self.items)
+        scaled = [weight * n / self.total for weight in self.weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # whatever is left is 1 within floating point error
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw(self, rng: random.Random | None = None) -> T:
+        # the integer part picks a column, the fractional part decides between the column
+        # and its alias
+        u = (rng or random).random() * len(self.items)
+        i = int(u)
+        return self.items[i] if u - i < self.prob[i] else self.items[self.alias[i]]
+
+    def probabilities(self) -> list[tuple[T, float]]:
+        """
+        Exact probability of drawing each item.
+        """
+        return [(item, weight / self.total) for item, weight in zip(self.items, self.weights)]
+
+
+class RaritySampler:
+    """
+    Pools of spawnable countryballs weighted by rarity, built from the cache on load.
+
+    Every enabled ball with a positive rarity is in the `ALL` pool. Pre-built sub-pools are
+    `RARE` for the `RARE_RANGE` band and one pool per regime, named with `regime_pool`.
+
+    Parameters
+    ----------
+    balls: Iterable[Ball]
+        The countryballs to sample from, usually the values of the `balls` cache.
+    """
+
+    def __init__(self, balls: Iterable[Ball]):
+        self.pools: dict[str, AliasSampler[Ball]] = {}
+        spawnable = [ball for ball in balls if ball.enabled and ball.rarity > 0]
+        self._add(ALL, spawnable)
+        self._add(RARE, [x for x in spawnable if RARE_RANGE[0] <= x.rarity <= RARE_RANGE[1]])
+        regimes: dict[int, list[Ball]] = defaultdict(list)
+        for ball in spawnable:
+            regimes[ball.regime_id].append(ball)
+        for regime_id, pool in regimes.items():
+            self._add(regime_pool(regime_id), pool)
+
+    def _add(self, name: str, balls: list[Ball]):
+        if balls:
+            self.pools[name] = AliasSampler((ball, ball.rarity) for ball in balls)
+
+    def draw(self, pool: str = ALL, rng: random.Random | None = None) -> Ball | None:
+        """
+        Draw a countryball from a pool, or `None` if the pool is empty.
+        """
+        sampler = self.pools.get(pool)
+        return sampler.draw(rng) if sampler else None
+
+    def probabilities(self, pool: str = ALL) -> dict[int, float]:
+        """
+        Exact probability of drawing each countryball of a pool, keyed by ball ID.
+        """
+        sampler = self.pools.get(pool)
+        if not sampler:
+            return {}
+        return {ball.pk: probability for ball, probability in sampler.probabilities()}
+
+
+def regime_pool(regime_id: int) -> str:
+    return f"regime-{regime_id}"
+
+
+# special event selection policies
+SPAWN = "spawn"
+PACK = "pack"
+
+type SpecialSamplers = dict[str, AliasSampler[Special | None] | None]
+
+
+class SpecialSchedule:
+    """
+    Timeline of the special events, with a pre-built sampler for every period between two
+    start or end dates. A timer swaps in the sampler of the next period when a boundary
+    passes, so drawing a special never scans the events nor queries the database.
+
+    Two selection policies are supported:
+
+    - `SPAWN`: active specials are weighted by rarity, the remainder up to 1 being the
+      chance of no special at all.
+    - `PACK`: active, non-hidden specials are rolled one after another by ID, the first
+      success wins.
+
+    Parameters
+    ----------
+    specials: Iterable[Special]
+        The special events, usually the values of the `specials` cache.
+    """
+
+    def __init__(self, specials: Iterable[Special]):
+        self.specials = sorted(specials, key=lambda x: x.pk)
+        dates = {x.start_date for x in self.specials} | {x.end_date for x in self.specials}
+        # each boundary starts a period, the first period has no lower bound
+        self.boundaries: list[datetime] = sorted(x for x in dates if x is not None)
+        self.periods: list[SpecialSamplers] = [
+            self._build(start) for start in (None, *self.boundaries)
+        ]
+        self.index = 0
+        self.expires: datetime | None = None
+        self._task: asyncio.Task | None = None
+        self.refresh()
+
+    def _build(self, start: datetime | None) -> SpecialSamplers:
+        active = [x for x in self.specials if _is_active(x, start)]
+
+        spawn: list[tuple[Special | None, float]] = [(x, x.rarity) for x in active]
+        spawn.append((None, max(1 - sum(x.rarity for x in active), 0)))
+
+        pack: list[tuple[Special | None, float]] = []
+        remaining = 1.0
+        for special in active:
+            if special.hidden:
+                continue
+            chance = min(max(special.rarity, 0), 1)
+            pack.append((special, remaining * chance))
+            remaining *= 1 - chance
+        pack.append((None, remaining))
+
+        return {SPAWN: _sampler(spawn), PACK: _sampler(pack)}
+
+    def refresh(self, now: datetime | None = None):
+        """
+        Switch to the period containing the given time, now by default.
+        """
+        now = now or tortoise_now()
+        self.index = bisect.bisect_right(self.boundaries, now)
+        self.expires = self.boundaries[self.index] if self.index < len(self.boundaries) else None
+
+    def active(self, policy: str = SPAWN) -> list[Special]:
+        """
+        The special events that can currently be drawn with this policy.
+        """
+        sampler = self.periods[self.index][policy]
+        if not sampler:
+            return []
+        return [x for x in sampler.items if x is not None]
+
+    def draw(self, policy: str = SPAWN) -> Special | None:
+        """
+        Draw a special event with the given policy, or `None` for a regular countryball.
+        """
+        if self.expires and self.expires <= tortoise_now():
+            # the timer is late, don't serve an expired event
+            self.refresh()
+        sampler = self.periods[self.index][policy]
+        return sampler.draw() if sampler else None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while self.expires:
+            delay = (self.expires - tortoise_now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.refresh()
+            log.debug(
+                f"Special events changed: {', '.join(x.name for x in self.active()) or 'none'}"
+            )
+
+
+def _is_active(special: Special, start: datetime | None) -> bool:
+    # the period starting at `start` lasts until the next boundary, so an event is active
+    # for the whole period if it is active at its start
+    if start is None:
+        return special.start_date is None
+    return (special.start_date is None or special.start_date <= start) and (
+        special.end_date is None or start < special.end_date
+    )
+
+
+def _sampler(items: list[tuple[Special | None, float]]) -> AliasSampler[Special | None] | None:
+    try:
+        return AliasSampler(items)
+    except ValueError:
+        return None
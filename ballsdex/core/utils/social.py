@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from cachetools import TTLCache
+from tortoise import signals
+from tortoise.expressions import Q
+
+from ballsdex.core.metrics import social_graph_lookups
+from ballsdex.core.models import Block, Friendship, Player
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+
+class Relations(NamedTuple):
+    # primary keys of the players
+    friends: frozenset[int]
+    blocked: frozenset[int]
+
+
+class SocialGraph:
+    """
+    The friends and blocked users of each player, as sets of primary keys loaded on first use.
+    Friendship and block checks between cached players are set lookups, and the players missing
+    from the cache are loaded together with two queries.
+
+    Created and deleted relations are seen through the signals of `Friendship` and `Block`,
+    call `invalidate` for both players after deleting them with a queryset. Entries expire
+    after a while, for the changes made from the admin panel.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of players kept, 0 to disable.
+    ttl: float
+        Seconds after which the relations of a player are fetched again.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache: TTLCache[int, Relations] = TTLCache(maxsize, ttl)
+        # bumped by each invalidation, a load which saw it change cannot be trusted
+        self.generation = 0
+
+    def register(self):
+        """
+        Listen to the creations and deletions of relations.
+        """
+        for model in (Friendship, Block):
+            model.register_listener(signals.Signals.post_save, self._on_save)
+            model.register_listener(signals.Signals.post_delete, self._on_delete)
+        Player.register_listener(signals.Signals.post_delete, self._on_player_delete)
+
+    async def _on_save(
+        self,
+        model: type[Friendship | Block],
+        instance: Friendship | Block,
+        created: bool,
+        using_db: "BaseDBAsyncClient | None" = None,
+        update_fields: Iterable[str] | None = None,
+    ):
+        self.invalidate(instance.player1_id, instance.player2_id)
+
+    async def _on_delete(
+        self,
+        model: type[Friendship | Block],
+        instance: Friendship | Block,
+        using_db: "BaseDBAsyncClient | None" = None,
+    ):
+        self.invalidate(instance.player1_id, instance.player2_id)
+
+    async def _on_player_delete(
+        self,
+        model: type[Player],
+        instance: Player,
+        using_db: "BaseDBAsyncClient | None" = None,
+    ):
+        # the relations are deleted in cascade, and primary keys are never reused, so the
+        # deleted player left in the sets of others is harmless
+        self.invalidate(instance.pk)
+
+    def invalidate(self, *player_ids: int):
+        """
+        Forget the relations of these players, they will be loaded again on next use.
+        """
+        self.generation += 1
+        for player_id in player_ids:
+            self.cache.pop(player_id, None)
+
+    def _store(self, player_id: int, relations: Relations):
+        try:
+            self.cache[player_id] = relations
+        except ValueError:
+            # the cache is disabled
+            pass
+
+    async def load(self, *player_ids: int) -> dict[int, Relations]:
+        """
+        The relations of several players, fetching the missing ones at once.
+
+        Parameters
+        ----------
+        *player_ids: int
+            The primary keys of the players, not the Discord IDs.
+        """
+        result: dict[int, Relations] = {}
+        missing: set[int] = set()
+        for player_id in player_ids:
+            if (relations := self.cache.get(player_id)) is not None:
+                result[player_id] = relations
+            else:
+                missing.add(player_id)
+        social_graph_lookups.labels(result="hit").inc(len(result))
+        if not missing:
+            return result
+        social_graph_lookups.labels(result="miss").inc(len(missing))
+
+        generation = self.generation
+        friends: dict[int, set[int]] = {x: set() for x in missing}
+        blocked: dict[int, set[int]] = {x: set() for x in missing}
+        friendships = await Friendship.filter(
+            Q(player1_id__in=missing) | Q(player2_id__in=missing)
+        ).values_list("player1_id", "player2_id")
+        for player1_id, player2_id in friendships:
+            if player1_id in friends:
+                friends[player1_id].add(player2_id)
+            if player2_id in friends:
+                friends[player2_id].add(player1_id)
+        blocks = await Block.filter(player1_id__in=missing).values_list("player1_id", "player2_id")
+        for player1_id, player2_id in blocks:
+            blocked[player1_id].add(player2_id)
+
+        for player_id in missing:
+            relations = Relations(frozenset(friends[player_id]), frozenset(blocked[player_id]))
+            result[player_id] = relations
+            if self.generation == generation:
+                self._store(player_id, relations)
+        return result
+
+    async def get(self, player_id: int) -> Relations:
+        return (await self.load(player_id))[player_id]
+
+    async def is_friend(self, player: Player, other: Player) -> bool:
+        return other.pk in (await self.get(player.pk)).friends
+
+    async def is_blocked(self, player: Player, other: Player) -> bool:
+        """
+        Whether `player` blocked `other`.
+        """
+        return other.pk in (await self.get(player.pk)).blocked
+
+    async def find_block(
+        self, pairs: Iterable[tuple[Player, Player]]
+    ) -> tuple[Player, Player] | None:
+        """
+        The first block found between any of these pairs of players, in either direction.
+
+        Returns
+        -------
+        tuple[Player, Player] | None
+            The player who blocked and the blocked player, or `None` if no one blocked anyone.
+        """
+        pairs = list(pairs)
+        relations = await self.load(*{player.pk for pair in pairs for player in pair})
+        for player1, player2 in pairs:
+            if player2.pk in relations[player1.pk].blocked:
+                return player1, player2
+            if player1.pk in relations[player2.pk].blocked:
+                return player2, player1
+        return None
@@ -1,5 +1,11 @@
+import asyncio
+import logging
+from typing import Any, Callable
+
 from tortoise import Tortoise
 
+log = logging.getLogger("ballsdex.core.utils.tortoise")
+
 
 async def row_count_estimate(table_name: str, *, analyze: bool = True) -> int:
     """
@@ -37,3 +43,42 @@ async def row_count_estimate(table_name: str, *, analyze: bool = True) -> int:
         return await row_count_estimate(table_name, analyze=False)  # prevent recursion error
 
     return result
+
+
+async def listen(channels: dict[str, Callable[[str], Any]], on_lost: Callable[[], Any]):
+    """
+    Pass the payload of each notification sent on the given Postgres channels to their callback,
+    until cancelled. One connection of the pool is kept for all the channels.
+
+    Parameters
+    ----------
+    channels: dict[str, Callable[[str], Any]]
+        The callback of each channel to listen to.
+    on_lost: Callable[[], Any]
+        Called when the connection is lost, notifications may have been missed meanwhile.
+    """
+
+    def dispatch(connection: Any, pid: int, channel: str, payload: str):
+        channels[channel](payload)
+
+    while True:
+        try:
+            client = Tortoise.get_connection("default")
+            async with client.acquire_connection() as connection:
+                if not hasattr(connection, "add_listener"):
+                    log.warning(
+                        "The database does not support notifications, admin panel edits will "
+                        "only be seen once cached entries expire."
+                    )
+                    return
+                for channel in channels:
+                    await connection.add_listener(channel, dispatch)
+                try:
+                    await asyncio.Future()
+                finally:
+                    for channel in channels:
+                        await connection.remove_listener(channel, dispatch)
+        except Exception:
+            log.exception("Database notifications lost, retrying in 30 seconds.")
+            on_lost()
+            await asyncio.sleep(30)
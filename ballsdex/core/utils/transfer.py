@@ -0,0 +1,157 @@
+"""
+Transferring countryballs between players in a single transaction.
+
+However many countryballs are exchanged, a transfer takes a fixed number of round trips: the
+instances are locked and their owners checked with one `SELECT ... FOR UPDATE`, the trade and
+its objects are inserted in bulk, then all the instances are reassigned by one `UPDATE`. If
+any instance changed owner meanwhile, nothing is written.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+from tortoise.transactions import in_transaction
+
+from ballsdex.core.models import BallInstance, Player, Trade, TradeObject
+
+if TYPE_CHECKING:
+    from ballsdex.core.utils.owned import OwnedBalls
+
+# locks the rows until the end of the transaction, a queryset with values_list would not
+_OWNERS = "SELECT id, player_id FROM ballinstance WHERE id = ANY($1::bigint[]) FOR UPDATE"
+
+# when recording a trade, the previous owner is kept and favorites are reset like a trade does
+_REASSIGN = """
+UPDATE ballinstance SET
+    player_id = transfer.receiver_id,
+    trade_player_id = CASE
+        WHEN $4::boolean THEN transfer.giver_id ELSE ballinstance.trade_player_id
+    END,
+    favorite = ballinstance.favorite AND NOT $4::boolean,
+    locked = NULL
+FROM unnest($1::bigint[], $2::bigint[], $3::bigint[]) AS transfer(id, giver_id, receiver_id)
+WHERE ballinstance.id = transfer.id
+"""
+
+
+class TransferError(Exception):
+    """
+    Some of the countryballs are not owned by their giver anymore, nothing was transferred.
+    """
+
+    def __init__(self, instance_ids: list[int]):
+        self.instance_ids = instance_ids
+        super().__init__(f"Instances not owned by their giver: {instance_ids}")
+
+
+@dataclass
+class Transfer:
+    """
+    Countryballs given by a player to another.
+    """
+
+    giver: Player
+    receiver: Player
+    instances: list[BallInstance] = field(default_factory=list)
+
+    def __post_init__(self):
+        # proposals are often cleared once transferred
+        self.instances = list(self.instances)
+
+
+@dataclass
+class TransferResult:
+    transfers: list[Transfer]
+    # None if the transfer was not recorded as a trade
+    trade: Trade | None = None
+
+    @property
+    def instances(self) -> list[BallInstance]:
+        return [instance for x in self.transfers for instance in x.instances]
+
+    @property
+    def count(self) -> int:
+        return sum(len(x.instances) for x in self.transfers)
+
+    def update_owned(self, owned: OwnedBalls):
+        """
+        Reflect the transfer in the owned countryballs cache, the update bypassed its signals.
+        """
+        for transfer in self.transfers:
+            if transfer.giver.pk == transfer.receiver.pk or not transfer.instances:
+                continue
+            # the giver may have given away their last copy
+            owned.invalidate(transfer.giver.pk)
+            for instance in transfer.instances:
+                owned.add(transfer.receiver.pk, instance.ball_id)
+
+
+async def transfer_balls(transfers: Iterable[Transfer], *, trade: bool = True) -> TransferResult:
+    """
+    Give the countryballs of each transfer to its receiver, atomically. They are unlocked.
+
+    Parameters
+    ----------
+    transfers: Iterable[Transfer]
+        The countryballs to move. The trade is registered between the giver and the receiver
+        of the first one.
+    trade: bool
+        Register a trade, set the previous owner of the countryballs and reset favorites.
+        Without this, only the owner changes.
+
+    Raises
+    ------
+    TransferError
+        An instance is not owned by its giver anymore.
+    """
+    transfers = list(transfers)
+    instances = [(x, instance) for x in transfers for instance in x.instances]
+    result = TransferResult(transfers)
+    if not instances:
+        return result
+    ids = [instance.pk for _, instance in instances]
+
+    async with in_transaction() as connection:
+        rows = await connection.execute_query_dict(_OWNERS, [ids])
+        owners = {row["id"]: row["player_id"] for row in rows}
+        invalid = [
+            instance.pk
+            for transfer, instance in instances
+            if owners.get(instance.pk) != transfer.giver.pk
+        ]
+        if invalid:
+            raise TransferError(invalid)
+
+        if trade:
+            result.trade = await Trade.create(
+                player1=transfers[0].giver, player2=transfers[0].receiver, using_db=connection
+            )
+            await TradeObject.bulk_create(
+                [
+                    TradeObject(
+                        trade=result.trade, ballinstance_id=instance.pk, player=transfer.giver
+                    )
+                    for transfer, instance in instances
+                ],
+                using_db=connection,
+            )
+
+        await connection.execute_query(
+            _REASSIGN,
+            [
+                ids,
+                [transfer.giver.pk for transfer, _ in instances],
+                [transfer.receiver.pk for transfer, _ in instances],
+                trade,
+            ],
+        )
+
+    for transfer, instance in instances:
+        instance.player = transfer.receiver
+        if trade:
+            instance.trade_player = transfer.giver
+            instance.favorite = False
+        instance.locked = None  # type: ignore
+    return result
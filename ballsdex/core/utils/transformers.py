@@ -267,6 +267,16 @@ class BallTransformer(TTLModelTransformer[Ball]):
     async def load_items(self) -> Iterable[Ball]:
         return balls.values()
 
+    async def get_options(
+        self, interaction: Interaction["BallsDexBot"], value: str
+    ) -> list[app_commands.Choice[str]]:
+        await self.maybe_refresh()
+        # also matches catch names and translations, ignoring accents and punctuation variants
+        return [
+            app_commands.Choice(name=self.key(item), value=str(item.pk))
+            for item in interaction.client.name_index.search(self.items.values(), value)
+        ]
+
 
 class BallEnabledTransformer(BallTransformer):
     async def load_items(self) -> Iterable[Ball]:
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable
+
+import discord
+from cachetools import LRUCache
+
+from ballsdex.core.metrics import user_lookups
+
+log = logging.getLogger("ballsdex.core.utils.users")
+
+
+class UserCache:
+    """
+    Discord users by ID, for displaying players who may not share a server with the bot.
+
+    Users known to the gateway are taken from the bot's cache. The others are fetched with the
+    REST API, which is heavily rate-limited, then kept here.
+
+    Parameters
+    ----------
+    bot: discord.Client
+        The bot, used for getting and fetching users.
+    maxsize: int
+        Maximum number of fetched users kept.
+    """
+
+    def __init__(self, bot: discord.Client, maxsize: int = 10_000):
+        self.bot = bot
+        self.cache: LRUCache[int, discord.User] = LRUCache(maxsize)
+
+    async def get(self, user_id: int) -> discord.User:
+        if (user := self.bot.get_user(user_id)) is not None:
+            user_lookups.labels(result="gateway").inc()
+            return user
+        if (user := self.cache.get(user_id)) is not None:
+            user_lookups.labels(result="hit").inc()
+            return user
+        user_lookups.labels(result="fetch").inc()
+        user = await self.bot.fetch_user(user_id)
+        self.cache[user_id] = user
+        return user
+
+    async def get_many(self, user_ids: Iterable[int]) -> dict[int, discord.User]:
+        """
+        Several users at once, the missing ones are fetched concurrently. Users which cannot
+        be fetched, such as deleted accounts, are left out.
+        """
+        ids = list(set(user_ids))
+        results = await asyncio.gather(*map(self.get, ids), return_exceptions=True)
+        users: dict[int, discord.User] = {}
+        for user_id, result in zip(ids, results):
+            if isinstance(result, discord.HTTPException):
+                log.debug(f"Failed to fetch the user {user_id}", exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                users[user_id] = result
+        return users
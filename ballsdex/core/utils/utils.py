@@ -26,7 +26,6 @@ async def inventory_privacy(
     user_obj: Union[discord.User, discord.Member],
 ):
     privacy_policy = player.privacy_policy
-    interacting_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
     if interaction.user.id == player.discord_id:
         return True
     if is_staff(interaction):
@@ -37,7 +36,8 @@ async def inventory_privacy(
         )
         return False
     elif privacy_policy == PrivacyPolicy.FRIENDS:
-        if not await interacting_player.is_friend(player):
+        interacting_player, _ = await bot.player_cache.get_or_create(interaction.user.id)
+        if not await bot.social_graph.is_friend(interacting_player, player):
             await interaction.followup.send(
                 "This users inventory can only be viewed from users they have added as friends.",
                 ephemeral=True,
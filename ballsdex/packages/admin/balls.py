@@ -16,6 +16,7 @@ from ballsdex.core.bot import BallsDexBot
 from ballsdex.core.models import Ball, BallInstance, Player, Special, Trade, TradeObject
 from ballsdex.core.utils.buttons import ConfirmChoiceView
 from ballsdex.core.utils.logging import log_action
+from ballsdex.core.utils.sampler import RARE, regime_pool
 from ballsdex.core.utils.transformers import (
     BallTransform,
     EconomyTransform,
@@ -60,7 +61,10 @@ class GDropView(ui.View):
             return
 
 
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player, _ = await interaction.client.player_cache.get_or_create(  # type: ignore
+            interaction.user.id
+        )
+        interaction.client.owned_balls.invalidate(self.ball_instance.player_id)  # type: ignore
         self.ball_instance.player = player
         await self.ball_instance.save()
 
@@ -82,8 +86,8 @@ class GDropView(ui.View):
         
 
 
-async def give_to_user(self, user: discord.User):
-    new_owner = await Player.get_or_create(discord_id=user.id)
+async def give_to_user(self, interaction: discord.Interaction, user: discord.User):
+    new_owner = await interaction.client.player_cache.get_or_create(user.id)  # type: ignore
     self.owner = new_owner[0]
     await self.save()
 
@@ -315,15 +319,13 @@ class Balls(app_commands.Group):
             for i in range(n):
                 if not countryball:
                     # Get random rare ball for each spawn
-                    rare_balls = await Ball.filter(rarity__gte=0.03, rarity__lte=2.5, enabled=True).all()
-                    if not rare_balls:
+                    selected_ball = interaction.client.rarity_sampler.draw(RARE)
+                    if not selected_ball:
                         await interaction.followup.edit_message(
                             "@original",
                             content=f"No rare {settings.plural_collectible_name} (rarity 0.03-2.5) are available.",
                         )
                         return
-                    weights = [ball.rarity for ball in rare_balls]
-                    selected_ball = random.choices(rare_balls, weights=weights, k=1)[0]
                     ball = cog.countryball_cls(interaction.client, selected_ball)
                 else:
                     ball = cog.countryball_cls(interaction.client, countryball)
@@ -357,18 +359,14 @@ class Balls(app_commands.Group):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
         if not countryball:
-            # Get random rare ball with rarity between 0.03 and 2.5
-            rare_balls = await Ball.filter(rarity__gte=0.03, rarity__lte=2.5, enabled=True).all()
-            if not rare_balls:
+            # Get random rare ball with rarity between 0.03 and 2.5, weighted by rarity
+            selected_ball = interaction.client.rarity_sampler.draw(RARE)
+            if not selected_ball:
                 await interaction.followup.send(
                     f"No rare {settings.plural_collectible_name} (rarity 0.03-2.5) are available.",
                     ephemeral=True,
                 )
                 return
-            
-            # Select random rare ball weighted by rarity
-            weights = [ball.rarity for ball in rare_balls]
-            selected_ball = random.choices(rare_balls, weights=weights, k=1)[0]
             ball = cog.countryball_cls(interaction.client, selected_ball)
         else:
             ball = cog.countryball_cls(interaction.client, countryball)
@@ -446,8 +444,8 @@ class Balls(app_commands.Group):
             return
 
         # Check if there are any balls available for the specified regime
-        regime_balls_count = await Ball.filter(regime_id=regime.pk, enabled=True, rarity__gt=0).count()
-        if regime_balls_count == 0:
+        pool = regime_pool(regime.pk)
+        if pool not in interaction.client.rarity_sampler.pools:
             await interaction.response.send_message(
                 f"No spawnable {settings.plural_collectible_name} found for regime **{regime.name}**. "
                 f"Make sure there are enabled {settings.plural_collectible_name} with rarity > 0 for this regime.",
@@ -462,18 +460,14 @@ class Balls(app_commands.Group):
             )
             
             for i in range(n):
-                # Get random ball from specified regime
-                regime_balls = await Ball.filter(regime_id=regime.pk, enabled=True, rarity__gt=0).all()
-                if not regime_balls:
+                # Get random ball from specified regime, weighted by rarity
+                selected_ball = interaction.client.rarity_sampler.draw(pool)
+                if not selected_ball:
                     await interaction.followup.edit_message(
                         "@original",
                         content=f"No spawnable {settings.plural_collectible_name} found for regime **{regime.name}**.",
                     )
                     return
-                
-                # Weighted random selection based on rarity
-                weights = [ball.rarity for ball in regime_balls]
-                selected_ball = random.choices(regime_balls, weights=weights, k=1)[0]
                 ball = cog.countryball_cls(interaction.client, selected_ball)
                 
                 ball.special = special
@@ -504,18 +498,14 @@ class Balls(app_commands.Group):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
         
-        # Get a random ball from the specified regime
-        regime_balls = await Ball.filter(regime_id=regime.pk, enabled=True, rarity__gt=0).all()
-        if not regime_balls:
+        # Get a random ball from the specified regime, weighted by rarity
+        selected_ball = interaction.client.rarity_sampler.draw(pool)
+        if not selected_ball:
             await interaction.followup.send(
                 f"No spawnable {settings.plural_collectible_name} found for regime **{regime.name}**.",
                 ephemeral=True,
             )
             return
-        
-        # Weighted random selection based on rarity
-        weights = [ball.rarity for ball in regime_balls]
-        selected_ball = random.choices(regime_balls, weights=weights, k=1)[0]
         ball = cog.countryball_cls(interaction.client, selected_ball)
         
         ball.special = special
@@ -576,7 +566,7 @@ class Balls(app_commands.Group):
             return
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        player, created = await Player.get_or_create(discord_id=user.id)
+        player, created = await interaction.client.player_cache.get_or_create(user.id)
         instance = await BallInstance.create(
             ball=countryball,
             player=player,
@@ -752,9 +742,10 @@ class Balls(app_commands.Group):
                 f"The {settings.collectible_name} ID you gave does not exist.", ephemeral=True
             )
             return
-        player, _ = await Player.get_or_create(discord_id=user.id)
+        player, _ = await interaction.client.player_cache.get_or_create(user.id)
         ball.player = player
         await ball.save()
+        interaction.client.owned_balls.invalidate(original_player.pk)
 
         trade = await Trade.create(player1=original_player, player2=player)
         await TradeObject.create(trade=trade, ballinstance=ball, player=original_player)
@@ -851,6 +842,7 @@ class Balls(app_commands.Group):
             count = len(to_delete)
         else:
             count = await BallInstance.filter(player=player).delete()
+            interaction.client.owned_balls.invalidate(player.pk)
         await interaction.followup.send(
             f"{count} {settings.plural_collectible_name} from {user} have been deleted.",
             ephemeral=True,
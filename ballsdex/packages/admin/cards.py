@@ -0,0 +1,56 @@
+import asyncio
+
+import discord
+from discord import app_commands
+
+from ballsdex.core.bot import BallsDexBot
+from ballsdex.core.utils.logging import log_action
+from ballsdex.core.utils.transformers import BallTransform, SpecialTransform
+from ballsdex.settings import settings
+
+
+class Cards(app_commands.Group):
+    """
+    Card rendering management
+    """
+
+    @app_commands.command()
+    @app_commands.checks.has_any_role(*settings.root_role_ids)
+    async def purge(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        countryball: BallTransform | None = None,
+        special: SpecialTransform | None = None,
+    ):
+        """
+        Remove cached cards after changing artwork. Cards are cached until the asset files
+        change, use this to free the space used by outdated cards.
+
+        Parameters
+        ----------
+        countryball: Ball | None
+            Only remove the cards of this countryball.
+        special: Special | None
+            Only remove the cards of this special event.
+        """
+        card_cache = interaction.client.render_service.disk_cache
+        if card_cache is None:
+            await interaction.response.send_message("The card cache is disabled.", ephemeral=True)
+            return
+        if not countryball and not special:
+            await interaction.response.send_message(
+                f"You must provide a {settings.collectible_name} or a special.", ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        count = await asyncio.to_thread(
+            card_cache.purge,
+            ball_id=countryball.pk if countryball else None,
+            special_id=special.pk if special else None,
+        )
+        target = " and ".join(str(x) for x in (countryball, special) if x)
+        await interaction.followup.send(f"Removed {count} cached cards of {target}.")
+        await log_action(
+            f"{interaction.user} purged the cached cards of {target}.", interaction.client
+        )
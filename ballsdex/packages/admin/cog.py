@@ -13,6 +13,7 @@ from ballsdex.settings import settings
 from .balls import Balls as BallsGroup
 from .blacklist import Blacklist as BlacklistGroup
 from .blacklist import BlacklistGuild as BlacklistGuildGroup
+from .cards import Cards as CardsGroup
 from .history import History as HistoryGroup
 from .info import Info as InfoGroup
 from .logs import Logs as LogsGroup
@@ -41,6 +42,7 @@ class Admin(commands.GroupCog):
         self.__cog_app_commands_group__.add_command(HistoryGroup())
         self.__cog_app_commands_group__.add_command(LogsGroup())
         self.__cog_app_commands_group__.add_command(InfoGroup())
+        self.__cog_app_commands_group__.add_command(CardsGroup())
 
     @app_commands.command()
     @app_commands.checks.has_any_role(*settings.root_role_ids)
@@ -100,7 +102,7 @@ class Admin(commands.GroupCog):
         include_disabled: bool = False,
     ):
         """
-        Generate a list of countryballs ranked by rarity.
+        Generate a list of countryballs ranked by rarity, with their exact spawn chance.
 
         Parameters
         ----------
@@ -114,6 +116,12 @@ class Admin(commands.GroupCog):
         if not include_disabled:
             balls_queryset = balls_queryset.filter(rarity__gt=0, enabled=True)
         sorted_balls = await balls_queryset
+        chances = self.bot.rarity_sampler.probabilities()
+
+        def line(i: int, ball: Ball) -> str:
+            if ball.pk in chances:
+                return f"{i}. {ball.country} ({chances[ball.pk]:.4%})\n"
+            return f"{i}. {ball.country}\n"
 
         if chunked:
             indexes: dict[float, list[Ball]] = defaultdict(list)
@@ -122,11 +130,11 @@ class Admin(commands.GroupCog):
             i = 1
             for chunk in indexes.values():
                 for ball in chunk:
-                    text += f"{i}. {ball.country}\n"
+                    text += line(i, ball)
                 i += len(chunk)
         else:
             for i, ball in enumerate(sorted_balls, start=1):
-                text += f"{i}. {ball.country}\n"
+                text += line(i, ball)
 
         source = TextPageSource(text, prefix="```md\n", suffix="```")
         pages = Pages(source=source, interaction=interaction, compact=True)
@@ -1,6 +1,7 @@
+import asyncio
 import enum
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, List, cast
 
 
 import discord
@@ -14,13 +15,21 @@ from datetime import datetime, timedelta
 import random
 from discord import Embed, Color
 from pathlib import Path
-from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
 
-from ballsdex.core.models import BallInstance, DonationPolicy, Player, Trade, TradeObject, balls
+from ballsdex.core.models import (
+    Ball,
+    BallInstance,
+    DonationPolicy,
+    Player,
+    Regime,
+    Special,
+    balls,
+)
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.owned import BallSet
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
 from ballsdex.core.utils.sorting import SortingChoices, sort_balls
+from ballsdex.core.utils.transfer import Transfer, TransferError, transfer_balls
 from ballsdex.core.utils.transformers import (
     BallEnabledTransform,
     BallInstanceTransform,
@@ -28,9 +37,8 @@ from ballsdex.core.utils.transformers import (
     TradeCommandType,
     RegimeTransform,
 )
-from ballsdex.core.image_generator. image_gen import draw_card
 from ballsdex.core.utils.utils import inventory_privacy, is_staff
-from ballsdex.packages.balls.countryballs_paginator import CountryballsViewer
+from ballsdex.packages.balls.countryballs_paginator import CountryballsSheet, CountryballsViewer
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -70,7 +78,7 @@ class DonationRequest(View):
             )
         except discord.NotFound:
             pass
-        await self.countryball.unlock()
+        await self.bot.locked_balls.unlock([self.countryball.pk])
 
     @button(
         style=discord.ButtonStyle.success, emoji="\N{HEAVY CHECK MARK}\N{VARIATION SELECTOR-16}"
@@ -79,20 +87,25 @@ class DonationRequest(View):
         self.stop()
         for item in self.children:
             item.disabled = True  # type: ignore
-        self.countryball.favorite = False
-        self.countryball.trade_player = self.countryball.player
-        self.countryball.player = self.new_player
-        await self.countryball.save()
-        trade = await Trade.create(player1=self.countryball.trade_player, player2=self.new_player)
-        await TradeObject.create(
-            trade=trade, ballinstance=self.countryball, player=self.countryball.trade_player
-        )
+        try:
+            transfer = await transfer_balls(
+                [Transfer(self.countryball.player, self.new_player, [self.countryball])]
+            )
+        except TransferError:
+            await interaction.response.edit_message(
+                content=interaction.message.content  # type: ignore
+                + f"\n\N{CROSS MARK} This {settings.collectible_name} was given away meanwhile.",
+                view=self,
+            )
+            await self.bot.locked_balls.unlock([self.countryball.pk])
+            return
+        transfer.update_owned(self.bot.owned_balls)
+        self.bot.locked_balls.discard([self.countryball.pk])
         await interaction.response.edit_message(
             content=interaction.message.content  # type: ignore
             + "\n\N{WHITE HEAVY CHECK MARK} The donation was accepted!",
             view=self,
         )
-        await self.countryball.unlock()
 
     @button(
         style=discord.ButtonStyle.danger,
@@ -107,7 +120,7 @@ class DonationRequest(View):
             + "\n\N{CROSS MARK} The donation was denied.",
             view=self,
         )
-        await self.countryball.unlock()
+        await self.bot.locked_balls.unlock([self.countryball.pk])
 
 
 class DuplicateType(enum.Enum):
@@ -123,22 +136,25 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
 
     def __init__(self, bot: "BallsDexBot"):
         self.bot = bot
-        self.frame_memory = {}
-
-
-    async def apply_overlay(self, ball_instance: BallInstance, image_fp: BytesIO, overlay_filename: str) -> BytesIO:
-        overlay_path = self.OVERLAY_DIR / overlay_filename
-        overlay_img = Image.open(overlay_path).convert("RGBA")
 
-        # Regenerate the card using the draw_card function with the overlay
-        image, _ = draw_card(ball_instance, frame_overlay=overlay_img)
-
-        # Save to buffer
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
+    async def cog_load(self):
+        # decode the overlays once, the render workers then map the shared copy
+        if asset_store := self.bot.render_service.asset_store:
+            overlays = {(str(path), None) for path in self.OVERLAY_DIR.glob("*.png")}
+            count, size, duration = await asyncio.to_thread(asset_store.pin, overlays)
+            log.debug(
+                f"Prepared {count} frame overlays in {duration:.2f}s ({size / 1024**2:.1f}MB)"
+            )
 
+    def frame_overlay(self, ball_instance: BallInstance) -> str | None:
+        """
+        Path to the frame overlay selected for this instance, if any.
+        """
+        name = ball_instance.extra_data.get("frame")
+        if not name:
+            return None
+        path = self.OVERLAY_DIR / name
+        return str(path) if path.is_file() else None
 
     @app_commands.command(name="frame")
     @app_commands.describe(
@@ -167,67 +183,42 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
 
         await interaction.response.defer()
 
-        self.frame_memory[countryball.id] = frame.value
-
-        # Load the overlay
-        overlay_path = self.OVERLAY_DIR / frame.value
-        overlay_img = Image.open(overlay_path).convert("RGBA")
+        # the choice is kept on the instance, shown by /players info from now on
+        countryball.extra_data = {**countryball.extra_data, "frame": frame.value}
+        await countryball.save(update_fields=("extra_data",))
 
-        # Generate the image with overlay
-        image, _ = draw_card(countryball, frame_overlay=overlay_img)
-
-        # Save to buffer
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        buffer.seek(0)
+        spec = countryball.card_spec(frame_overlay=self.frame_overlay(countryball))
+        buffer = await self.bot.render_service.render(spec)
 
         # Prepare Discord file and embed
-        file = File(fp=buffer, filename="framed_footballer.png")
+        file = File(fp=buffer, filename="framed_footballer.webp")
         embed = Embed(
             title=f"{interaction.user.display_name}'s Footballer with {frame.name} Frame (Only visible in /players info)"
         )
-        embed.set_image(url="attachment://framed_footballer.png")
+        embed.set_image(url="attachment://framed_footballer.webp")
 
         await interaction.followup.send(embed=embed, file=file)
 
 
 
-    @app_commands.command()
-    @app_commands.checks.cooldown(1, 10, key=lambda i: i.user.id)
-    async def list(
+    async def fetch_collection(
         self,
         interaction: discord.Interaction["BallsDexBot"],
-        user: discord.User | None = None,
-        sort: SortingChoices | None = None,
-        reverse: bool = False,
-        countryball: BallEnabledTransform | None = None,
-        special: SpecialEnabledTransform | None = None,
-        regime: RegimeTransform | None = None,
-    ):
+        user: discord.User | None,
+        sort: SortingChoices | None,
+        reverse: bool,
+        countryball: Ball | None,
+        special: Special | None,
+        regime: Regime | None,
+    ) -> List[BallInstance] | None:
         """
-        List your countryballs.
-
-        Parameters
-        ----------
-        user: discord.User
-            The user whose collection you want to view, if not yours.
-        sort: SortingChoices
-            Choose how countryballs are sorted. Can be used to show duplicates.
-        reverse: bool
-            Reverse the output of the list.
-        countryball: Ball
-            Filter the list by a specific countryball.
-        special: Special
-            Filter the list by a specific special event.
-        regime: Regime
-            Filter the list by a specific regime.
+        Fetch and filter the collection shown by `/balls list` and `/balls sheet`. The
+        interaction must be deferred, `None` is returned after replying if there is nothing
+        to show.
         """
         user_obj = user or interaction.user
-        await interaction.response.defer(thinking=True)
-
-        try:
-            player = await Player.get(discord_id=user_obj.id)
-        except DoesNotExist:
+        player = await self.bot.player_cache.get(user_obj.id)
+        if player is None:
             if user_obj == interaction.user:
                 await interaction.followup.send(
                     f"You don't have any {settings.plural_collectible_name} yet."
@@ -236,19 +227,21 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 await interaction.followup.send(
                     f"{user_obj.name} doesn't have any {settings.plural_collectible_name} yet."
                 )
-            return
+            return None
         if user is not None:
             if await inventory_privacy(self.bot, interaction, player, user_obj) is False:
-                return
+                return None
 
-        interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        interaction_player, _ = await self.bot.player_cache.get_or_create(
+            interaction.user.id
+        )
 
-        blocked = await player.is_blocked(interaction_player)
+        blocked = await self.bot.social_graph.is_blocked(player, interaction_player)
         if blocked and not is_staff(interaction):
             await interaction.followup.send(
                 "You cannot view the list of a user that has you blocked.", ephemeral=True
             )
-            return
+            return None
 
         await player.fetch_related("balls")
         query = player.balls.all()
@@ -281,9 +274,48 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                     f"{user_obj.name} doesn't have any {combined} "
                     f"{settings.plural_collectible_name} yet."
                 )
-            return
+            return None
         if reverse:
             countryballs.reverse()
+        return countryballs
+
+    @app_commands.command()
+    @app_commands.checks.cooldown(1, 10, key=lambda i: i.user.id)
+    async def list(
+        self,
+        interaction: discord.Interaction["BallsDexBot"],
+        user: discord.User | None = None,
+        sort: SortingChoices | None = None,
+        reverse: bool = False,
+        countryball: BallEnabledTransform | None = None,
+        special: SpecialEnabledTransform | None = None,
+        regime: RegimeTransform | None = None,
+    ):
+        """
+        List your countryballs.
+
+        Parameters
+        ----------
+        user: discord.User
+            The user whose collection you want to view, if not yours.
+        sort: SortingChoices
+            Choose how countryballs are sorted. Can be used to show duplicates.
+        reverse: bool
+            Reverse the output of the list.
+        countryball: Ball
+            Filter the list by a specific countryball.
+        special: Special
+            Filter the list by a specific special event.
+        regime: Regime
+            Filter the list by a specific regime.
+        """
+        user_obj = user or interaction.user
+        await interaction.response.defer(thinking=True)
+        countryballs = await self.fetch_collection(
+            interaction, user, sort, reverse, countryball, special, regime
+        )
+        if countryballs is None:
+            return
 
         paginator = CountryballsViewer(interaction, countryballs)
         if user_obj == interaction.user:
@@ -293,6 +325,52 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 content=f"Viewing {user_obj.name}'s {settings.plural_collectible_name}"
             )
 
+    @app_commands.command()
+    @app_commands.checks.cooldown(1, 30, key=lambda i: i.user.id)
+    async def sheet(
+        self,
+        interaction: discord.Interaction["BallsDexBot"],
+        user: discord.User | None = None,
+        sort: SortingChoices | None = None,
+        reverse: bool = False,
+        countryball: BallEnabledTransform | None = None,
+        special: SpecialEnabledTransform | None = None,
+        regime: RegimeTransform | None = None,
+    ):
+        """
+        View a page of your countryballs as a single image.
+
+        Parameters
+        ----------
+        user: discord.User
+            The user whose collection you want to view, if not yours.
+        sort: SortingChoices
+            Choose how countryballs are sorted. Can be used to show duplicates.
+        reverse: bool
+            Reverse the output of the list.
+        countryball: Ball
+            Filter the list by a specific countryball.
+        special: Special
+            Filter the list by a specific special event.
+        regime: Regime
+            Filter the list by a specific regime.
+        """
+        user_obj = user or interaction.user
+        await interaction.response.defer(thinking=True)
+        countryballs = await self.fetch_collection(
+            interaction, user, sort, reverse, countryball, special, regime
+        )
+        if countryballs is None:
+            return
+
+        paginator = CountryballsSheet(interaction, countryballs)
+        if user_obj == interaction.user:
+            await paginator.start()
+        else:
+            await paginator.start(
+                content=f"Viewing {user_obj.name}'s {settings.plural_collectible_name}"
+            )
+
     @app_commands.command()
     @app_commands.checks.cooldown(1, 60, key=lambda i: i.user.id)
     async def completion(
@@ -315,18 +393,19 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         await interaction.response.defer(thinking=True)
         extra_text = f"{special.name} " if special else ""
         if user is not None:
-            try:
-                player = await Player.get(discord_id=user_obj.id)
-            except DoesNotExist:
+            player = await self.bot.player_cache.get(user_obj.id)
+            if player is None:
                 await interaction.followup.send(
                     f"{user_obj.name} doesn't have any "
                     f"{extra_text}{settings.plural_collectible_name} yet."
                 )
                 return
 
-            interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+            interaction_player, _ = await self.bot.player_cache.get_or_create(
+                interaction.user.id
+            )
 
-            blocked = await player.is_blocked(interaction_player)
+            blocked = await self.bot.social_graph.is_blocked(player, interaction_player)
             if blocked and not is_staff(interaction):
                 await interaction.followup.send(
                     "You cannot view the completion of a user that has blocked you.",
@@ -357,12 +436,21 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             )
             return
 
-        owned_countryballs = set(
-            x[0]
-            for x in await BallInstance.filter(**filters)
-            .distinct()  # Do not query everything
-            .values_list("ball_id")
-        )
+        owned_countryballs: set[int] | BallSet
+        if special:
+            owned_countryballs = set(
+                x[0]
+                for x in await BallInstance.filter(**filters)
+                .distinct()  # Do not query everything
+                .values_list("ball_id")
+            )
+        else:
+            # owned balls are cached for every special, only enabled ones are kept
+            if user is None:
+                player = await self.bot.player_cache.get(user_obj.id)
+            owned_countryballs = (
+                await self.bot.owned_balls.get(player.pk) if player else BallSet()
+            ) & BallSet.from_ids(bot_countryballs)
 
         entries: list[tuple[str, str]] = []
 
@@ -546,25 +634,11 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             return
         await interaction.response.defer(thinking=True)
 
-        # Get embed content, image file, and view
-        content, original_file, view = await countryball.prepare_for_message(interaction)
-
-        # Read image bytes into buffer
-        original_file.fp.seek(0)
-        file_bytes = BytesIO(original_file.fp.read())
-        original_file.close()
-
-        frame_name = self.frame_memory.get(countryball.id)
-        if frame_name:
-            # Apply the frame overlay
-            framed_buffer = await self.apply_overlay(countryball, file_bytes, frame_name)
-            file = discord.File(fp=framed_buffer, filename="framed_footballer.png")
-            image_filename = "framed_footballer.png"
-        else:
-            # Use original image
-            file_bytes.seek(0)
-            file = discord.File(fp=file_bytes, filename="footballer.png")
-            image_filename = "footballer.png"
+        # Get embed content, image file with the selected frame, and view
+        content, file, view = await countryball.prepare_for_message(
+            interaction, frame_overlay=self.frame_overlay(countryball)
+        )
+        image_filename = file.filename
 
         # Create embed
         embed = Embed(
@@ -599,9 +673,8 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         """
         user_obj = user if user else interaction.user
         await interaction.response.defer(thinking=True)
-        try:
-            player = await Player.get(discord_id=user_obj.id)
-        except DoesNotExist:
+        player = await self.bot.player_cache.get(user_obj.id)
+        if player is None:
             msg = f"{'You do' if user is None else f'{user_obj.display_name} does'}"
             await interaction.followup.send(
                 f"{msg} not have any {settings.plural_collectible_name} yet.",
@@ -613,9 +686,11 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             if await inventory_privacy(self.bot, interaction, player, user_obj) is False:
                 return
 
-        interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        interaction_player, _ = await self.bot.player_cache.get_or_create(
+            interaction.user.id
+        )
 
-        blocked = await player.is_blocked(interaction_player)
+        blocked = await self.bot.social_graph.is_blocked(player, interaction_player)
         if blocked and not is_staff(interaction):
             await interaction.followup.send(
                 f"You cannot view the last caught {settings.collectible_name} "
@@ -738,7 +813,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         if user.bot:
             await interaction.response.send_message("You cannot donate to bots.", ephemeral=True)
             return
-        if await countryball.is_locked():
+        if countryball.pk in self.bot.locked_balls:
             await interaction.response.send_message(
                 f"This {settings.collectible_name} is currently locked for a trade. "
                 "Please try again later.",
@@ -764,45 +839,52 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             interaction = view.interaction_response
         else:
             await interaction.response.defer()
-        await countryball.lock_for_trade()
-        new_player, _ = await Player.get_or_create(discord_id=user.id)
+        if not await self.bot.locked_balls.lock([countryball.pk]):
+            await interaction.followup.send(
+                f"This {settings.collectible_name} is currently locked for a trade. "
+                "Please try again later.",
+                ephemeral=True,
+            )
+            return
+        new_player, _ = await self.bot.player_cache.get_or_create(user.id)
         old_player = countryball.player
 
         if new_player == old_player:
             await interaction.followup.send(
                 f"You cannot give a {settings.collectible_name} to yourself.", ephemeral=True
             )
-            await countryball.unlock()
+            await self.bot.locked_balls.unlock([countryball.pk])
             return
         if new_player.donation_policy == DonationPolicy.ALWAYS_DENY:
             await interaction.followup.send(
                 "This player does not accept donations. You can use trades instead.",
                 ephemeral=True,
             )
-            await countryball.unlock()
+            await self.bot.locked_balls.unlock([countryball.pk])
             return
 
-        friendship = await new_player.is_friend(old_player)
+        relations = await self.bot.social_graph.get(new_player.pk)
+        friendship = old_player.pk in relations.friends
         if new_player.donation_policy == DonationPolicy.FRIENDS_ONLY:
             if not friendship:
                 await interaction.followup.send(
                     "This player only accepts donations from friends, use trades instead.",
                     ephemeral=True,
                 )
-                await countryball.unlock()
+                await self.bot.locked_balls.unlock([countryball.pk])
                 return
-        blocked = await new_player.is_blocked(old_player)
+        blocked = old_player.pk in relations.blocked
         if blocked:
             await interaction.followup.send(
                 "You cannot interact with a user that has blocked you.", ephemeral=True
             )
-            await countryball.unlock()
+            await self.bot.locked_balls.unlock([countryball.pk])
             return
         if new_player.discord_id in self.bot.blacklist:
             await interaction.followup.send(
                 "You cannot donate to a blacklisted user.", ephemeral=True
             )
-            await countryball.unlock()
+            await self.bot.locked_balls.unlock([countryball.pk])
             return
         elif new_player.donation_policy == DonationPolicy.REQUEST_APPROVAL:
             await interaction.followup.send(
@@ -814,13 +896,16 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             )
             return
 
-        countryball.player = new_player
-        countryball.trade_player = old_player
-        countryball.favorite = False
-        await countryball.save()
-
-        trade = await Trade.create(player1=old_player, player2=new_player)
-        await TradeObject.create(trade=trade, ballinstance=countryball, player=old_player)
+        try:
+            transfer = await transfer_balls([Transfer(old_player, new_player, [countryball])])
+        except TransferError:
+            await interaction.followup.send(
+                f"This {settings.collectible_name} is not yours anymore.", ephemeral=True
+            )
+            await self.bot.locked_balls.unlock([countryball.pk])
+            return
+        transfer.update_owned(self.bot.owned_balls)
+        self.bot.locked_balls.discard([countryball.pk])
 
         cb_txt = (
             countryball.description(short=True, include_emoji=True, bot=self.bot, is_trade=True)
@@ -851,7 +936,6 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 content=f"{interaction.user.mention} you just gave a {settings.collectible_name} to {user.mention}!",
                 allowed_mentions=discord.AllowedMentions(users=new_player.can_be_mentioned)
             )
-        await countryball.unlock()
 
     @app_commands.command()
     async def count(
@@ -914,7 +998,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         """
         await interaction.response.defer(thinking=True, ephemeral=True)
 
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         await player.fetch_related("balls")
         is_special = type.value == "specials"
         queryset = BallInstance.filter(player=player)
@@ -990,9 +1074,8 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             await interaction.followup.send("You cannot compare with yourself.", ephemeral=True)
             return
 
-        try:
-            player = await Player.get(discord_id=user.id)
-        except DoesNotExist:
+        player = await self.bot.player_cache.get(user.id)
+        if player is None:
             await interaction.followup.send(
                 f"{user.display_name} doesn't have any {settings.plural_collectible_name} yet."
             )
@@ -1009,41 +1092,51 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 if y.enabled and (special.end_date is None or y.created_at < special.end_date)
             }
 
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
 
-        blocked = await player.is_blocked(player1)
+        relations = await self.bot.social_graph.get(player.pk)
+        blocked = player1.pk in relations.blocked
         if blocked and not is_staff(interaction):
             await interaction.followup.send(
                 "You cannot compare with a user that has you blocked.", ephemeral=True
             )
             return
 
-        blocked = await player.is_blocked(player2)
+        blocked = player2.pk in relations.blocked
         if blocked and not is_staff(interaction):
             await interaction.followup.send(
                 "You cannot compare with a user that has you blocked.", ephemeral=True
             )
             return
-        queryset = BallInstance.filter(ball__enabled=True).distinct()
+        enabled = BallSet.from_ids(bot_countryballs)
         if special:
-            queryset = queryset.filter(special=special)
-        user1_balls = cast(
-            list[int],
-            await queryset.filter(player=player1).values_list("ball_id", flat=True),
-        )
-        user2_balls = cast(
-            list[int],
-            await queryset.filter(player=player2).values_list("ball_id", flat=True),
-        )
-        both = set(user1_balls) & set(user2_balls)
-        user1_only = set(user1_balls) - set(user2_balls)
-        user2_only = set(user2_balls) - set(user1_balls)
-        neither = set(bot_countryballs.keys()) - both - user1_only - user2_only
+            queryset = BallInstance.filter(ball__enabled=True, special=special).distinct()
+            user1_balls = BallSet.from_ids(
+                cast(
+                    list[int],
+                    await queryset.filter(player=player1).values_list("ball_id", flat=True),
+                )
+            )
+            user2_balls = BallSet.from_ids(
+                cast(
+                    list[int],
+                    await queryset.filter(player=player2).values_list("ball_id", flat=True),
+                )
+            )
+        else:
+            user1_balls = await self.bot.owned_balls.get(player1.pk)
+            user2_balls = await self.bot.owned_balls.get(player2.pk)
+        user1_balls &= enabled
+        user2_balls &= enabled
+        both = user1_balls & user2_balls
+        user1_only = user1_balls - user2_balls
+        user2_only = user2_balls - user1_balls
+        neither = enabled - user1_balls - user2_balls
 
         entries = []
 
-        def fill_fields(title: str, ids: set[int]):
+        def fill_fields(title: str, ids: BallSet):
             first_field_added = False
             buffer = ""
 
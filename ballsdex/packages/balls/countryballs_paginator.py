@@ -74,6 +74,51 @@ class CountryballsViewer(CountryballsSelector):
         file.close()
 
 
+class CountryballsSheetSource(CountryballsSource):
+    # same pages as the list, as a single image instead of a select menu
+    async def format_page(  # type: ignore
+        self, menu: CountryballsSheet, balls: List[BallInstance]
+    ):
+        buffer = await menu.bot.render_service.render_sheet([x.card_spec() for x in balls])
+        offset = menu.current_page * self.per_page
+        embed = discord.Embed(
+            title=f"{settings.plural_collectible_name.title()} "
+            f"{offset + 1}-{offset + len(balls)} of {len(self.entries)}",
+            description="\n".join(
+                f"`{offset + i:>3}` "
+                + ball.description(short=True, include_emoji=True, bot=menu.bot)
+                for i, ball in enumerate(balls, start=1)
+            ),
+        )
+        embed.set_image(url="attachment://sheet.webp")
+        return {"embed": embed, "attachments": [discord.File(buffer, "sheet.webp")]}
+
+
+class CountryballsSheet(Pages):
+    """
+    Paginated grid of card thumbnails, one image per page instead of one render per card.
+    """
+
+    def __init__(self, interaction: discord.Interaction["BallsDexBot"], balls: List[BallInstance]):
+        super().__init__(CountryballsSheetSource(balls), interaction=interaction)
+
+    async def send(self, *args, attachments: List[discord.File], **kwargs):
+        # page edits replace the attachments, but the first message needs them as files
+        await super().send(*args, files=attachments, **kwargs)
+
+    async def show_page(
+        self, interaction: discord.Interaction["BallsDexBot"], page_number: int
+    ) -> None:
+        # rendering a page of thumbnails can take longer than an interaction may wait
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+        page = await self.source.get_page(page_number)
+        self.current_page = page_number
+        kwargs = await self._get_kwargs_from_page(page)
+        self._update_labels(page_number)
+        await interaction.edit_original_response(**kwargs, view=self)
+
+
 class DuplicateSource(menus.ListPageSource):
     def __init__(self, entries: List[str]):
         super().__init__(entries, per_page=25)
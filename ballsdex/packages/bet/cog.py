@@ -9,7 +9,7 @@ from discord.ext import commands
 from discord.utils import MISSING
 from tortoise.expressions import Q
 
-from ballsdex.core.models import BallInstance, Player
+from ballsdex.core.models import BallInstance
 from ballsdex.core.utils.buttons import ConfirmChoiceView
 from ballsdex.core.utils.paginator import Pages
 from ballsdex.core.utils.sorting import SortingChoices, sort_balls
@@ -116,16 +116,15 @@ class Bet(commands.GroupCog):
                 "You cannot bet with yourself.", ephemeral=True
             )
             return
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
-        blocked = await player1.is_blocked(player2)
-        if blocked:
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
+        block = await self.bot.social_graph.find_block([(player1, player2)])
+        if block and block[0] == player1:
             await interaction.response.send_message(
                 "You cannot begin a bet with a user that you have blocked.", ephemeral=True
             )
             return
-        blocked2 = await player2.is_blocked(player1)
-        if blocked2:
+        if block:
             await interaction.response.send_message(
                 "You cannot begin a bet with a user that has blocked you.", ephemeral=True
             )
@@ -144,8 +143,8 @@ class Bet(commands.GroupCog):
             )
             return
 
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
         if player2.discord_id in self.bot.blacklist:
             await interaction.response.send_message(
                 "You cannot bet with a blacklisted user.", ephemeral=True
@@ -217,7 +216,7 @@ class Bet(commands.GroupCog):
                 ephemeral=True,
             )
             return
-        if await countryball.is_locked():
+        if not await self.bot.locked_balls.lock([countryball.pk]):
             await interaction.followup.send(
                 f"This {settings.collectible_name} is currently in an active bet or donation, "
                 "please try again later.",
@@ -225,7 +224,6 @@ class Bet(commands.GroupCog):
             )
             return
 
-        await countryball.lock_for_trade()
         bettor.proposal.append(countryball)
         await interaction.followup.send(
             f"{countryball.countryball.country} added.", ephemeral=True
@@ -328,7 +326,7 @@ class Bet(commands.GroupCog):
         await interaction.response.send_message(
             f"{countryball.countryball.country} removed.", ephemeral=True
         )
-        await countryball.unlock()
+        await self.bot.locked_balls.unlock([countryball.pk])
 
     @app_commands.command()
     async def cancel(self, interaction: discord.Interaction["ballsdexBot"]):
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 import discord
 
+from ballsdex.core.utils.proposals import EMBED_LENGTH
 from ballsdex.packages.bet.bet_user import BettingUser
 
 if TYPE_CHECKING:
@@ -29,31 +30,12 @@ def _get_bettor_name(bettor: BettingUser, is_admin: bool = False) -> str:
 
 def _build_list_of_strings(
     bettor: BettingUser, bot: "ballsdexBot", short: bool = False
-) -> list[str]:
+) -> tuple[list[str], int]:
     # this builds a list of strings always lower than 1024 characters
-    # while not cutting in the middle of a line
-    proposal: list[str] = [""]
-    i = 0
-
-    for countryball in bettor.proposal:
-        cb_text = countryball.description(short=short, include_emoji=True, bot=bot, is_trade=True)
-        if bettor.locked:
-            text = f"- *{cb_text}*\n"
-        else:
-            text = f"- {cb_text}\n"
-        if bettor.cancelled:
-            text = f"~~{text}~~"
-
-        if len(text) + len(proposal[i]) > 950:
-            # move to a new list element
-            i += 1
-            proposal.append("")
-        proposal[i] += text
-
-    if not proposal[0]:
-        proposal[0] = "*Empty*"
-
-    return proposal
+    # while not cutting in the middle of a line, and their total length
+    return bot.proposal_text.fields(
+        bot, bettor.proposal, short=short, locked=bettor.locked, cancelled=bettor.cancelled
+    )
 
 
 def fill_bet_embed_fields(
@@ -87,8 +69,11 @@ def fill_bet_embed_fields(
     # first, build embed strings
     # to play around the limit of 1024 characters per field, we'll be using multiple fields
     # these vars are list of fields, being a list of lines to include
-    bettor1_proposal = _build_list_of_strings(bettor1, bot, compact)
-    bettor2_proposal = _build_list_of_strings(bettor2, bot, compact)
+    bettor1_proposal, length1 = _build_list_of_strings(bettor1, bot, compact)
+    bettor2_proposal, length2 = _build_list_of_strings(bettor2, bot, compact)
+    if not compact and length1 + length2 > EMBED_LENGTH:
+        # cannot fit whatever the rest of the embed is, skip to the compact display
+        return fill_bet_embed_fields(embed, bot, bettor1, bettor2, compact=True, is_admin=is_admin)
 
     # then display the text. first page is easy
     embed.add_field(
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import random
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, List, Set, cast
+from typing import TYPE_CHECKING, Hashable, List, Set, cast
 
 import discord
 from discord.ui import Button, View, button
@@ -14,6 +13,7 @@ from ballsdex.core.models import BallInstance, Player, TradeCooldownPolicy
 from ballsdex.core.utils import menus
 from ballsdex.core.utils.buttons import ConfirmChoiceView
 from ballsdex.core.utils.paginator import Pages
+from ballsdex.core.utils.transfer import Transfer, transfer_balls
 from ballsdex.packages.balls.countryballs_paginator import CountryballsViewer
 from ballsdex.packages.bet.bet_user import BettingUser
 from ballsdex.packages.bet.display import fill_bet_embed_fields
@@ -101,8 +101,7 @@ class BetView(View):
             )
             return
 
-        for countryball in bettor.proposal:
-            await countryball.unlock()
+        await interaction.client.locked_balls.unlock(x.pk for x in bettor.proposal)
 
         bettor.proposal.clear()
         await interaction.followup.send("Proposal cleared.", ephemeral=True)
@@ -223,7 +222,6 @@ class BetMenu:
         self.bettor1 = bettor1
         self.bettor2 = bettor2
         self.embed = discord.Embed()
-        self.task: asyncio.Task | None = None
         self.current_view: BetView | ConfirmView = BetView(self)
         self.message: discord.Message
         self.cooldown_start_time: datetime | None = None
@@ -257,33 +255,31 @@ class BetMenu:
             "but you can keep on editing your proposal."
         )
 
-    async def update_message_loop(self):
+    def refresh_state(self) -> Hashable:
+        return tuple(
+            (tuple(x.pk for x in user.proposal), user.locked, user.cancelled, user.accepted)
+            for user in (self.bettor1, self.bettor2)
+        )
+
+    async def refresh(self):
         """
-        A loop task that updates each 15 second the menu with the new content.
+        Update the menu with the new content, called by the menu refresher when it changed.
         """
+        try:
+            fill_bet_embed_fields(self.embed, self.bot, self.bettor1, self.bettor2)
+            await self.message.edit(embed=self.embed)
+        except Exception:
+            log.exception(
+                "Failed to refresh the bet menu "
+                f"guild={self.message.guild.id} "  # type: ignore
+                f"bettor1={self.bettor1.user.id} bettor2={self.bettor2.user.id}"
+            )
+            self.embed.colour = discord.Colour.dark_red()
+            await self.cancel("The bet timed out")
 
-        assert self.task
-        start_time = datetime.utcnow()
-
-        while True:
-            await asyncio.sleep(15)
-            if datetime.utcnow() - start_time > timedelta(minutes=15):
-                self.embed.colour = discord.Colour.dark_red()
-                await self.cancel("The bet timed out")
-                return
-
-            try:
-                fill_bet_embed_fields(self.embed, self.bot, self.bettor1, self.bettor2)
-                await self.message.edit(embed=self.embed)
-            except Exception:
-                log.exception(
-                    "Failed to refresh the bet menu "
-                    f"guild={self.message.guild.id} "  # type: ignore
-                    f"bettor1={self.bettor1.user.id} bettor2={self.bettor2.user.id}"
-                )
-                self.embed.colour = discord.Colour.dark_red()
-                await self.cancel("The bet timed out")
-                return
+    async def refresh_timeout(self):
+        self.embed.colour = discord.Colour.dark_red()
+        await self.cancel("The bet timed out")
 
     async def start(self):
         """
@@ -298,17 +294,17 @@ class BetMenu:
             view=self.current_view,
             allowed_mentions=discord.AllowedMentions(users=self.bettor2.player.can_be_mentioned),
         )
-        self.task = self.bot.loop.create_task(self.update_message_loop())
+        self.bot.menu_refresher.add(self, timeout=15 * 60)
 
     async def cancel(self, reason: str = "The bet has been cancelled."):
         """
         Cancel the bet immediately.
         """
-        if self.task:
-            self.task.cancel()
+        self.bot.menu_refresher.remove(self)
 
-        for countryball in self.bettor1.proposal + self.bettor2.proposal:
-            await countryball.unlock()
+        await self.bot.locked_balls.unlock(
+            x.pk for x in self.bettor1.proposal + self.bettor2.proposal
+        )
 
         self.current_view.stop()
         for item in self.current_view.children:
@@ -346,8 +342,7 @@ class BetMenu:
 
         if self.bettor1.accepted and self.bettor2.accepted:
             # Execute the FootballDex Bet
-            if self.task:
-                self.task.cancel()
+            self.bot.menu_refresher.remove(self)
 
             # Random winner selection (50/50)
             winner = random.choice([self.bettor1, self.bettor2])
@@ -357,11 +352,15 @@ class BetMenu:
 
             try:
                 # Transfer all balls to winner
-                all_balls = self.bettor1.proposal + self.bettor2.proposal
-                for ball in all_balls:
-                    ball.player = winner.player
-                    await ball.save()
-                    await ball.unlock()
+                transfer = await transfer_balls(
+                    [
+                        Transfer(self.bettor1.player, winner.player, self.bettor1.proposal),
+                        Transfer(self.bettor2.player, winner.player, self.bettor2.proposal),
+                    ],
+                    trade=False,
+                )
+                transfer.update_owned(self.bot.owned_balls)
+                self.bot.locked_balls.discard(x.pk for x in transfer.instances)
 
                 # Clear proposals
                 self.bettor1.proposal.clear()
@@ -373,7 +372,7 @@ class BetMenu:
                     f"**FootballDex Bet concluded!**\n\n"
                     f"🏆 **{winner.user.name}** won the bet!\n"
                     f"💸 **{loser.user.name}** lost the bet.\n\n"
-                    f"**Winner takes all {len(all_balls)} balls!**"
+                    f"**Winner takes all {transfer.count} balls!**"
                 )
                 self.embed.color = discord.Colour.green()
 
@@ -397,7 +396,7 @@ class BetMenu:
                     )
                     log_embed.add_field(
                         name="Balls Won", 
-                        value=str(len(all_balls)), 
+                        value=str(transfer.count), 
                         inline=True
                     )
                     await log_channel.send(embed=log_embed)
@@ -413,8 +412,9 @@ class BetMenu:
             except Exception as e:
                 log.exception(f"Error executing FootballDex Bet: {e}")
                 # Unlock all balls on error
-                for ball in self.bettor1.proposal + self.bettor2.proposal:
-                    await ball.unlock()
+                await self.bot.locked_balls.unlock(
+                    x.pk for x in self.bettor1.proposal + self.bettor2.proposal
+                )
                 return False
 
         return True
@@ -479,11 +479,11 @@ class CountryballsSelector(Pages):
     async def select_ball_menu(
         self, interaction: discord.Interaction["ballsdexBot"], item: discord.ui.Select
     ):
-        for value in item.values:
-            ball_instance = await BallInstance.get(id=int(value)).prefetch_related(
+        self.balls_selected.update(
+            await BallInstance.filter(id__in=[int(x) for x in item.values]).prefetch_related(
                 "ball", "player"
             )
-            self.balls_selected.add(ball_instance)
+        )
         await interaction.response.defer()
 
     @discord.ui.button(label="Select Page", style=discord.ButtonStyle.secondary)
@@ -491,12 +491,11 @@ class CountryballsSelector(Pages):
         self, interaction: discord.Interaction["ballsdexBot"], button: Button
     ):
         await interaction.response.defer(thinking=True, ephemeral=True)
-        for ball in self.select_ball_menu.options:
-            ball_instance = await BallInstance.get(id=int(ball.value)).prefetch_related(
-                "ball", "player"
-            )
-            if ball_instance not in self.balls_selected:
-                self.balls_selected.add(ball_instance)
+        self.balls_selected.update(
+            await BallInstance.filter(
+                id__in=[int(x.value) for x in self.select_ball_menu.options]
+            ).prefetch_related("ball", "player")
+        )
         await interaction.followup.send(
             (
                 f"All {settings.plural_collectible_name} on this page have been selected.\n"
@@ -541,25 +540,34 @@ class CountryballsSelector(Pages):
                     f"{settings.collectible_name.title()} #{ball.pk:0X} is not tradeable.",
                     ephemeral=True,
                 )
-            if await ball.is_locked():
-                return await interaction.followup.send(
-                    f"{settings.collectible_name.title()} #{ball.pk:0X} is locked "
-                    "for bet and won't be added to the proposal.",
-                    ephemeral=True,
-                )
+        ids = [ball.pk for ball in self.balls_selected]
+        if locked := self.bot.locked_balls.locked_among(ids):
+            return await interaction.followup.send(
+                f"{settings.collectible_name.title()} #{min(locked):0X} is locked "
+                "for bet and won't be added to the proposal.",
+                ephemeral=True,
+            )
+        if any(ball.favorite for ball in self.balls_selected):
             view = ConfirmChoiceView(interaction)
-            if ball.favorite:
-                await interaction.followup.send(
-                    f"One or more of the {settings.plural_collectible_name} is favorited, "
-                    "are you sure you want to add it to the bet?",
-                    view=view,
-                    ephemeral=True,
-                )
-                await view.wait()
-                if not view.value:
-                    return
-            bettor.proposal.append(ball)
-            await ball.lock_for_trade()
+            await interaction.followup.send(
+                f"One or more of the {settings.plural_collectible_name} is favorited, "
+                "are you sure you want to add it to the bet?",
+                view=view,
+                ephemeral=True,
+            )
+            await view.wait()
+            if not view.value:
+                return
+        locked = await self.bot.locked_balls.lock(ids)
+        if len(locked) != len(ids):
+            # some were locked elsewhere while confirming
+            await self.bot.locked_balls.unlock(locked)
+            return await interaction.followup.send(
+                f"Some of the {settings.plural_collectible_name} were locked meanwhile, "
+                "nothing was added to the proposal.",
+                ephemeral=True,
+            )
+        bettor.proposal.extend(self.balls_selected)
         grammar = (
             f"{settings.collectible_name}"
             if len(self.balls_selected) == 1
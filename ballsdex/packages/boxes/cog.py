@@ -9,6 +9,7 @@ from PIL import Image, ImageFilter, ImageEnhance, ImageDraw, ImageFont
 from discord.ui import View
 import asyncio
 import logging
+from ballsdex.core.utils.sampler import PACK
 logger = logging.getLogger(__name__)
 from ballsdex.core.utils.transformers import (
     BallTransform,
@@ -79,41 +80,15 @@ class Claim(commands.GroupCog, name="packs"):
         self.bot_walletturorial_seen = set()
         super().__init__()
 
-    async def get_random_special(self) -> Special | None:
+    def get_random_special(self) -> Special | None:
         """
         Get a random special based on rarity probability and date restrictions.
         Returns None if no special is selected or available.
         """
-        now = datetime.now(timezone.utc)
-        
-        # Get all active specials that respect date restrictions
-        try:
-            from tortoise.expressions import Q
-            active_specials = await Special.filter(
-                # Check start_date and end_date constraints
-                Q(start_date__isnull=True) | Q(start_date__lte=now),
-                Q(end_date__isnull=True) | Q(end_date__gte=now),
-                # Only include specials that are not hidden
-                hidden=False
-            ).all()
-        except:
-            # Fallback if Q import fails
-            active_specials = await Special.all()
-        
-        if not active_specials:
-            return None
-        
-        # Apply rarity probability for each special
-        for special in active_specials:
-            if random.random() < special.rarity:
-                return special
-        
-        return None
+        return self.bot.special_schedule.draw(PACK)
 
     async def get_random_ball(self, player: Player) -> Ball | None:
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.03, rarity__lte=30.0, enabled=True).all()
 
         if not all_balls:
@@ -206,9 +181,7 @@ class Claim(commands.GroupCog, name="packs"):
         return cooldown_end - now
 
     async def getdasigmaballmate(self, player: Player) -> Ball | None:
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.03, rarity__lte=5.0, enabled=True).all()
 
         if not all_balls:
@@ -280,7 +253,7 @@ class Claim(commands.GroupCog, name="packs"):
         
         # Get updated remaining uses after incrementing
         _, new_remaining = self.check_daily_usage(user_id)
-        player, _ = await Player.get_or_create(discord_id=str(user_id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         ball = await self.get_random_ball(player)
 
         if not ball:
@@ -288,7 +261,7 @@ class Claim(commands.GroupCog, name="packs"):
             return
 
         # Get random special for this pack
-        special = await self.get_random_special()
+        special = self.get_random_special()
 
         instance = await BallInstance.create(
             ball=ball,
@@ -385,7 +358,7 @@ class Claim(commands.GroupCog, name="packs"):
         last_claim = last_weekly_times.get(user_id)
 
 
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         ball = await self.getdasigmaballmate(player)
 
         if not ball:
@@ -393,7 +366,7 @@ class Claim(commands.GroupCog, name="packs"):
             return
 
         # Get random special for this pack
-        special = await self.get_random_special()
+        special = self.get_random_special()
 
         instance = await BallInstance.create(
             ball=ball,
@@ -505,7 +478,7 @@ class Claim(commands.GroupCog, name="packs"):
         wallet_balance[user_id] -= 1
 
         # Assign a random ball to the user
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         ball = await self.get_random_ball(player)
 
         if not ball:
@@ -513,7 +486,7 @@ class Claim(commands.GroupCog, name="packs"):
             return
 
         # Get random special for this pack
-        special = await self.get_random_special()
+        special = self.get_random_special()
 
         # Create an instance of the ball for the user
         instance = await BallInstance.create(
@@ -628,7 +601,7 @@ class Claim(commands.GroupCog, name="packs"):
 
         # Reveal footballers one by one
         for _ in range(packs):
-            player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+            player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
             ball = await self.get_random_ball(player)
 
             if not ball:
@@ -636,7 +609,7 @@ class Claim(commands.GroupCog, name="packs"):
                 return
 
             # Get random special for this pack
-            special = await self.get_random_special()
+            special = self.get_random_special()
 
             # Create an instance of the ball for the user
             instance = await BallInstance.create(
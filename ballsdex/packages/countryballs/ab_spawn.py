@@ -1,8 +1,10 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from ballsdex.packages.countryballs.spawn import BaseSpawnManager
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     import discord
 
     from ballsdex.core.bot import BallsDexBot
@@ -86,3 +88,14 @@ class ABSpawner(BaseSpawnManager):
             f"{a_or_b} (`{manager.__class__.__name__}`) ({percentage}% chance)",
             ephemeral=True,
         )
+
+    def evict(self, before: "datetime") -> int:
+        return self.manager_a.evict(before) + self.manager_b.evict(before)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"a": self.manager_a.snapshot(), "b": self.manager_b.snapshot()}
+
+    def restore(self, data: dict[str, Any]) -> int:
+        return self.manager_a.restore(data.get("a", {})) + self.manager_b.restore(
+            data.get("b", {})
+        )
@@ -0,0 +1,136 @@
+"""
+Catching a countryball in a single database round trip.
+
+Both statements below create the player if missing, give them the countryball and tell if
+this is their first copy, all at once. Postgres runs a statement atomically, and the unique
+spawn message ID (new instances) or the previous owner check (existing instances) guarantee
+that a spawn is caught at most once, even if several submissions race.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from tortoise import Tortoise
+
+from ballsdex.core.models import BallInstance, Player
+from ballsdex.core.utils.player_cache import PLAYER_UPSERT, player_values
+
+# the ball is not counted as owned if inserted or transferred by the same statement
+_RESULT = """
+SELECT
+    instance.*,
+    row_to_json(player_row)::text AS catch_player,
+    NOT EXISTS (
+        SELECT 1 FROM ballinstance owned
+        WHERE owned.player_id = player_row.id AND owned.ball_id = $7
+    ) AS catch_is_new
+FROM player_row LEFT JOIN instance ON true
+"""
+
+CATCH_NEW = (
+    PLAYER_UPSERT
+    + """, instance AS (
+    INSERT INTO ballinstance (
+        ball_id, player_id, special_id, attack_bonus, health_bonus, server_id, spawned_time,
+        spawn_message_id, catch_date, favorite, tradeable, extra_data
+    )
+    SELECT
+        $7::bigint, player_row.id, $8::bigint, $9::integer, $10::integer, $11::bigint,
+        $12::timestamptz, $13::bigint, now(), false, true, '{}'
+    FROM player_row
+    ON CONFLICT (spawn_message_id) DO NOTHING
+    RETURNING *
+)"""
+    + _RESULT
+)
+
+# the transfer is registered as a trade to avoid bypasses
+CATCH_EXISTING = (
+    PLAYER_UPSERT
+    + """, instance AS (
+    UPDATE ballinstance SET player_id = player_row.id, trade_player_id = $9, locked = NULL
+    FROM player_row
+    WHERE ballinstance.id = $8 AND ballinstance.player_id = $9
+    RETURNING ballinstance.*
+), trade AS (
+    INSERT INTO trade (player1_id, player2_id, date)
+    SELECT $9::bigint, player_row.id, now() FROM player_row, instance
+    RETURNING id
+), trade_object AS (
+    INSERT INTO tradeobject (trade_id, ballinstance_id, player_id)
+    SELECT trade.id, $8::bigint, $9::bigint FROM trade
+)"""
+    + _RESULT
+)
+
+
+class CatchResult(NamedTuple):
+    player: Player
+    # None if the spawn was already caught
+    instance: BallInstance | None
+    is_new: bool
+
+
+async def _execute(query: str, values: list[Any]) -> CatchResult:
+    connection = Tortoise.get_connection("default")
+    for _ in range(2):
+        _, rows = await connection.execute_query(query, values)
+        if rows:
+            break
+        # the player was created by a concurrent statement, it is visible now
+    else:
+        raise RuntimeError("Could not create the player catching this countryball")
+
+    row = dict(rows[0])
+    player = Player._init_from_db(**json.loads(row.pop("catch_player")))
+    is_new = row.pop("catch_is_new")
+    if row["id"] is None:
+        return CatchResult(player, None, is_new)
+    instance = BallInstance._init_from_db(**row)
+    instance.player = player
+    return CatchResult(player, instance, is_new)
+
+
+async def catch_new(
+    discord_id: int,
+    *,
+    ball_id: int,
+    special_id: int | None,
+    attack_bonus: int,
+    health_bonus: int,
+    server_id: int | None,
+    spawned_time: datetime | None,
+    spawn_message_id: int | None,
+) -> CatchResult:
+    """
+    Create a new ball instance for the player with this discord ID, creating the player too
+    if needed. Nothing is created if a ball was already caught from this spawn message.
+    """
+    return await _execute(
+        CATCH_NEW,
+        player_values(discord_id)
+        + [
+            ball_id,
+            special_id,
+            attack_bonus,
+            health_bonus,
+            server_id,
+            spawned_time,
+            spawn_message_id,
+        ],
+    )
+
+
+async def catch_existing(discord_id: int, instance: BallInstance) -> CatchResult:
+    """
+    Transfer an existing ball instance to the player with this discord ID, creating the player
+    too if needed, and register it as a trade. Nothing happens if the instance changed owner
+    since it was spawned.
+    """
+    return await _execute(
+        CATCH_EXISTING,
+        player_values(discord_id) + [instance.ball_id, instance.pk, instance.player_id],
+    )
@@ -1,6 +1,11 @@
+import asyncio
 import importlib
+import json
 import logging
-from typing import TYPE_CHECKING, cast
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
 
 import discord
 from discord.ext import commands
@@ -8,7 +13,9 @@ from tortoise.exceptions import DoesNotExist
 
 from ballsdex.core.models import GuildConfig
 from ballsdex.packages.countryballs.countryball import BallSpawnView
+from ballsdex.packages.countryballs.fast_path import MessageFastPath, RawMessage
 from ballsdex.packages.countryballs.spawn import BaseSpawnManager
+from ballsdex.packages.countryballs.spawn_assets import SpawnAssetCache
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -24,6 +31,9 @@ class CountryBallsSpawner(commands.Cog):
         self.bot = bot
         self.cache: dict[int, int] = {}
         self.countryball_cls = BallSpawnView
+        self.spawn_assets = SpawnAssetCache(
+            settings.spawn_asset_cache_size * 1024 * 1024, settings.spawn_asset_variants
+        )
 
         module_path, class_name = settings.spawn_manager.rsplit(".", 1)
         module = importlib.import_module(module_path)
@@ -31,6 +41,22 @@ class CountryBallsSpawner(commands.Cog):
         importlib.reload(module)
         spawn_manager = getattr(module, class_name)
         self.spawn_manager = spawn_manager(bot)
+        self.state_task: asyncio.Task | None = None
+        self.fast_path = MessageFastPath(bot, self.cache) if settings.spawn_fast_path else None
+
+    async def cog_load(self):
+        if self.fast_path:
+            self.fast_path.install()
+
+    async def cog_unload(self):
+        if self.fast_path:
+            self.fast_path.uninstall()
+        self.spawn_assets.clear()
+        if self.state_task:
+            self.state_task.cancel()
+            self.state_task = None
+        # keep the progress across reloads and shutdowns
+        await self.save_state()
 
     async def load_cache(self):
         i = 0
@@ -42,6 +68,57 @@ class CountryBallsSpawner(commands.Cog):
         grammar = "" if i == 1 else "s"
         log.info(f"Loaded {i} guild{grammar} in cache.")
 
+        await self.restore_state()
+        if self.state_task is None:
+            self.state_task = self.bot.loop.create_task(self.state_loop())
+
+    async def restore_state(self):
+        """
+        Restore the spawn manager state saved before the last shutdown, so that guilds resume
+        their progress instead of all starting over at once.
+        """
+        if not settings.spawn_state_path:
+            return
+        path = Path(settings.spawn_state_path)
+        try:
+            content = await asyncio.to_thread(path.read_text)
+        except FileNotFoundError:
+            return
+        try:
+            data = json.loads(content)
+            if data["manager"] != settings.spawn_manager:
+                log.info("Spawn manager changed, ignoring the saved spawn state.")
+                return
+            restored = self.spawn_manager.restore(data["state"])
+        except Exception:
+            log.warning(f"Failed to restore the spawn state from {path}", exc_info=True)
+            return
+        evicted = self.evict()
+        log.info(f"Restored the spawn state of {restored - evicted} guilds.")
+
+    async def save_state(self):
+        if not settings.spawn_state_path:
+            return
+        state = {"manager": settings.spawn_manager, "state": self.spawn_manager.snapshot()}
+        try:
+            await asyncio.to_thread(_write_state, Path(settings.spawn_state_path), state)
+        except Exception:
+            log.warning("Failed to save the spawn state", exc_info=True)
+
+    def evict(self) -> int:
+        if not settings.spawn_idle_timeout:
+            return 0
+        before = discord.utils.utcnow() - timedelta(hours=settings.spawn_idle_timeout)
+        return self.spawn_manager.evict(before)
+
+    async def state_loop(self):
+        while True:
+            await asyncio.sleep(settings.spawn_state_interval * 60)
+            evicted = self.evict()
+            if evicted:
+                log.debug(f"Evicted the spawn state of {evicted} idle guilds.")
+            await self.save_state()
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot or message.webhook_id is not None:
@@ -53,8 +130,16 @@ class CountryBallsSpawner(commands.Cog):
             return
         if guild.id in self.bot.blacklist_guild:
             return
+        await self.handle_message(message)
 
-        result = await self.spawn_manager.handle_message(message)
+    @commands.Cog.listener()
+    async def on_ballsdex_raw_message(self, message: RawMessage):
+        # already filtered by the fast path
+        await self.handle_message(message)
+
+    async def handle_message(self, message: discord.Message | RawMessage):
+        guild = cast(discord.Guild, message.guild)
+        result = await self.spawn_manager.handle_message(cast(discord.Message, message))
         if result is False:
             return
 
@@ -96,3 +181,11 @@ class CountryBallsSpawner(commands.Cog):
                 del self.cache[guild.id]
             elif channel:
                 self.cache[guild.id] = channel.id
+
+
+def _write_state(path: Path, state: dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write then rename, a crash while saving must not corrupt the previous state
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, separators=(",", ":")))
+    os.replace(tmp, path)
@@ -4,29 +4,23 @@ import logging
 import math
 import random
 import string
-from datetime import datetime
-from typing import TYPE_CHECKING
+from io import BytesIO
+from typing import TYPE_CHECKING, cast
 
 import discord
 from discord.ui import Button, Modal, TextInput, View, button
-from tortoise.timezone import get_default_timezone
-from tortoise.timezone import now as tortoise_now
 
+from ballsdex.core.image_generator.image_gen import MEDIA_PATH
 from ballsdex.core.metrics import caught_balls
-from ballsdex.core.models import (
-    Ball,
-    BallInstance,
-    Player,
-    Special,
-    Trade,
-    TradeObject,
-    balls,
-    specials,
-)
+from ballsdex.core.models import Ball, BallInstance, Player, Special
+from ballsdex.core.utils.sampler import SPAWN
+from ballsdex.packages.countryballs.catch import catch_existing, catch_new
+from ballsdex.packages.countryballs.spawn_assets import spawn_upload_bytes
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
+    from ballsdex.packages.countryballs.cog import CountryBallsSpawner
 
 log = logging.getLogger("ballsdex.packages.countryballs")
 
@@ -58,7 +52,23 @@ class CountryballNamePrompt(Modal, title=f"Catch this {settings.collectible_name
     async def on_submit(self, interaction: discord.Interaction["BallsDexBot"]):
         await interaction.response.defer(thinking=True)
 
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        if not self.view.caught and self.view.is_name_valid(self.name.value):
+            try:
+                ball, has_caught_before = await self.view.catch_ball(
+                    interaction.user, player=None, guild=interaction.guild
+                )
+            except RuntimeError:
+                # caught by someone else in the meantime
+                pass
+            else:
+                await interaction.followup.send(
+                    self.view.get_catch_message(ball, has_caught_before, interaction.user.mention),
+                    allowed_mentions=discord.AllowedMentions(users=ball.player.can_be_mentioned),
+                )
+                await interaction.followup.edit_message(self.view.message.id, view=self.view)
+                return
+
+        player, _ = await interaction.client.player_cache.get_or_create(interaction.user.id)
         if self.view.caught:
             slow_message = random.choice(settings.slow_messages).format(
                 user=interaction.user.mention,
@@ -74,38 +84,26 @@ class CountryballNamePrompt(Modal, title=f"Catch this {settings.collectible_name
             )
             return
 
-        if not self.view.is_name_valid(self.name.value):
-            if len(self.name.value) > 500:
-                wrong_name = self.name.value[:500] + "..."
-            else:
-                wrong_name = self.name.value
-
-            wrong_message = random.choice(settings.wrong_messages).format(
-                user=interaction.user.mention,
-                collectible=settings.collectible_name,
-                ball=self.view.name,
-                collectibles=settings.plural_collectible_name,
-                wrong=wrong_name,
-            )
-
-            await interaction.followup.send(
-                wrong_message,
-                allowed_mentions=discord.AllowedMentions(
-                    users=player.can_be_mentioned, everyone=False, roles=False
-                ),
-                ephemeral=False,
-            )
-            return
-
-        ball, has_caught_before = await self.view.catch_ball(
-            interaction.user, player=player, guild=interaction.guild
+        if len(self.name.value) > 500:
+            wrong_name = self.name.value[:500] + "..."
+        else:
+            wrong_name = self.name.value
+
+        wrong_message = random.choice(settings.wrong_messages).format(
+            user=interaction.user.mention,
+            collectible=settings.collectible_name,
+            ball=self.view.name,
+            collectibles=settings.plural_collectible_name,
+            wrong=wrong_name,
         )
 
         await interaction.followup.send(
-            self.view.get_catch_message(ball, has_caught_before, interaction.user.mention),
-            allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
+            wrong_message,
+            allowed_mentions=discord.AllowedMentions(
+                users=player.can_be_mentioned, everyone=False, roles=False
+            ),
+            ephemeral=False,
         )
-        await interaction.followup.edit_message(self.view.message.id, view=self.view)
 
 
 class BallSpawnView(View):
@@ -162,7 +160,7 @@ class BallSpawnView(View):
             except discord.HTTPException:
                 pass
         if self.ballinstance and not self.caught:
-            await self.ballinstance.unlock()
+            await self.bot.locked_balls.unlock([self.ballinstance.pk])
 
     @button(style=discord.ButtonStyle.primary, label="Catch me!")
     async def catch_button(self, interaction: discord.Interaction["BallsDexBot"], button: Button):
@@ -180,11 +178,9 @@ class BallSpawnView(View):
         The ball instance must be unlocked from trades, and will be locked until caught or timed
         out.
         """
-        if await ball_instance.is_locked():
-            raise RuntimeError("This countryball is locked for a trade")
-
         # prevent countryball from being traded while spawned
-        await ball_instance.lock_for_trade()
+        if not await bot.locked_balls.lock([ball_instance.pk]):
+            raise RuntimeError("This countryball is locked for a trade")
 
         view = cls(bot, ball_instance.ball)
         view.ballinstance = ball_instance
@@ -196,11 +192,9 @@ class BallSpawnView(View):
         """
         Get a new instance with a random countryball. Rarity values are taken into account.
         """
-        countryballs = list(filter(lambda m: m.enabled, balls.values()))
-        if not countryballs:
+        cb = bot.rarity_sampler.draw()
+        if not cb:
             raise RuntimeError("No ball to spawn")
-        rarities = [x.rarity for x in countryballs]
-        cb = random.choices(population=countryballs, weights=rarities, k=1)[0]
         return cls(bot, cb)
 
     @property
@@ -208,30 +202,7 @@ class BallSpawnView(View):
         return self.model.country
 
     def get_random_special(self) -> Special | None:
-        population = [
-            x
-            for x in specials.values()
-            # handle null start/end dates with infinity times
-            if (x.start_date or datetime.min.replace(tzinfo=get_default_timezone()))
-            <= tortoise_now()
-            <= (x.end_date or datetime.max.replace(tzinfo=get_default_timezone()))
-        ]
-
-        if not population:
-            return None
-
-        common_weight: float = 1 - sum(x.rarity for x in population)
-
-        if common_weight < 0:
-            common_weight = 0
-
-        weights = [x.rarity for x in population] + [common_weight]
-        # None is added representing the common countryball
-        special: Special | None = random.choices(
-            population=population + [None], weights=weights, k=1
-        )[0]
-
-        return special
+        return self.bot.special_schedule.draw(SPAWN)
 
     async def spawn(self, channel: discord.TextChannel) -> bool:
         """
@@ -255,7 +226,6 @@ class BallSpawnView(View):
             return "".join(random.choices(source, k=15))
 
         extension = self.model.wild_card.split(".")[-1]
-        file_location = "./admin_panel/media/" + self.model.wild_card
         file_name = f"nt_{generate_random_name()}.{extension}"
         try:
             permissions = channel.permissions_for(channel.guild.me)
@@ -266,11 +236,18 @@ class BallSpawnView(View):
                     collectibles=settings.plural_collectible_name,
                 )
 
+                cog = cast("CountryBallsSpawner | None", self.bot.get_cog("CountryBallsSpawner"))
+                if cog:
+                    data = await cog.spawn_assets.get(self.model)
+                else:
+                    with open(MEDIA_PATH + self.model.wild_card, "rb") as f:
+                        data = f.read()
                 self.message = await channel.send(
                     spawn_message,
                     view=self,
-                    file=discord.File(file_location, filename=file_name),
+                    file=discord.File(BytesIO(data), filename=file_name),
                 )
+                spawn_upload_bytes.inc(len(data))
                 return True
             else:
                 log.error("Missing permission to spawn ball in channel %s.", channel)
@@ -287,27 +264,15 @@ class BallSpawnView(View):
         Parameters
         ----------
         text: str
-            The text entered by the user. It will be lowered and stripped of enclosing blank
-            characters.
+            The text entered by the user. Case, accents, quote and dash variants and blank
+            characters are ignored.
 
         Returns
         -------
         bool
             Whether the name matches or not.
         """
-        if self.model.catch_names:
-            possible_names = (self.name.lower(), *self.model.catch_names.split(";"))
-        else:
-            possible_names = (self.name.lower(),)
-        if self.model.translations:
-            possible_names += tuple(x.lower() for x in self.model.translations.split(";"))
-        cname = text.lower().strip()
-        # Remove fancy unicode characters like ’ to replace to '
-        cname = cname.replace("\u2019", "'")
-        cname = cname.replace("\u2018", "'")
-        cname = cname.replace("\u201c", '"')
-        cname = cname.replace("\u201d", '"')
-        return cname in possible_names
+        return self.bot.name_index.matches(self.model, text)
 
     async def catch_ball(
         self,
@@ -324,8 +289,9 @@ class BallSpawnView(View):
         ----------
         user: discord.User | discord.Member
             The user that will obtain the new countryball.
-        player: Player
-            If already fetched, add the player model here to avoid an additional query.
+        player: Player | None
+            Unused, the player is fetched or created along with the countryball. Kept for
+            compatibility.
         guild: discord.Guild | None
             If caught in a guild, specify here for additional logs. Will be extracted from `user`
             if it's a member object.
@@ -341,28 +307,29 @@ class BallSpawnView(View):
         Raises
         ------
         RuntimeError
-            The `caught` attribute is already set to `True`. You should always check before calling
-            this function that the ball was not caught.
+            The `caught` attribute is already set to `True`, or the countryball was caught from
+            another process. You should always check before calling this function that the ball
+            was not caught.
         """
         if self.caught:
             raise RuntimeError("This ball was already caught!")
         self.caught = True
         self.catch_button.disabled = True
-        player = player or (await Player.get_or_create(discord_id=user.id))[0]
-        is_new = not await BallInstance.filter(player=player, ball=self.model).exists()
 
         if self.ballinstance:
             # if specified, do not create a countryball but switch owner
-            # it's important to register this as a trade to avoid bypass
-            trade = await Trade.create(player1=self.ballinstance.player, player2=player)
-            await TradeObject.create(
-                trade=trade, player=self.ballinstance.player, ballinstance=self.ballinstance
-            )
+            # the player, the transfer and its trade entry are all written in one statement
+            result = await catch_existing(user.id, self.ballinstance)
+            self.bot.player_cache.put(result.player)
+            if result.instance is None:
+                raise RuntimeError("This ball was already caught!")
+            self.bot.owned_balls.invalidate(self.ballinstance.player_id)
+            self.bot.owned_balls.add(result.player.pk, self.ballinstance.ball_id)
             self.ballinstance.trade_player = self.ballinstance.player
-            self.ballinstance.player = player
+            self.ballinstance.player = result.player
             self.ballinstance.locked = None  # type: ignore
-            await self.ballinstance.save(update_fields=("player_id", "trade_player_id", "locked"))
-            return self.ballinstance, is_new
+            self.bot.locked_balls.discard([self.ballinstance.pk])
+            return self.ballinstance, result.is_new
 
         # stat may vary by +/- 20% of base stat
         bonus_attack = (
@@ -382,15 +349,25 @@ class BallSpawnView(View):
         if not special:
             special = self.get_random_special()
 
-        ball = await BallInstance.create(
-            ball=self.model,
-            player=player,
-            special=special,
+        # the player, the countryball and the completion check in a single round trip
+        result = await catch_new(
+            user.id,
+            ball_id=self.model.pk,
+            special_id=special.pk if special else None,
             attack_bonus=bonus_attack,
             health_bonus=bonus_health,
             server_id=guild.id if guild else None,
-            spawned_time=self.message.created_at,
+            spawned_time=self.message.created_at if self.message else None,
+            spawn_message_id=self.message.id if self.message else None,
         )
+        self.bot.player_cache.put(result.player)
+        if result.instance is None:
+            # another process already created a countryball for this spawn message
+            raise RuntimeError("This ball was already caught!")
+        ball = result.instance
+        self.bot.owned_balls.add(result.player.pk, self.model.pk)
+        ball.ball = self.model
+        ball.special = special
 
         # logging and stats
         log.log(
@@ -406,7 +383,7 @@ class BallSpawnView(View):
                 spawn_algo=self.algo,
             ).inc()
 
-        return ball, is_new
+        return ball, result.is_new
 
     def get_catch_message(self, ball: BallInstance, new_ball: bool, mention: str) -> str:
         """
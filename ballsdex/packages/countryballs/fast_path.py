@@ -0,0 +1,136 @@
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Container
+
+import discord
+from discord.utils import snowflake_time
+
+if TYPE_CHECKING:
+    from ballsdex.core.bot import BallsDexBot
+
+log = logging.getLogger("ballsdex.packages.countryballs.fast_path")
+
+# custom event dispatched with a RawMessage
+EVENT = "ballsdex_raw_message"
+
+
+class RawAuthor:
+    __slots__ = ("id", "bot")
+
+    def __init__(self, id: int, bot: bool):
+        self.id = id
+        self.bot = bot
+
+
+class RawMessage:
+    """
+    The parts of a message used by the spawn managers, read straight from the gateway
+    payload. Stands in for `discord.Message` when the spawn fast path is enabled.
+
+    Attributes
+    ----------
+    id: int
+        The message ID.
+    guild: discord.Guild
+        The guild the message was sent in, from the library cache.
+    author: RawAuthor
+        ID and bot flag of the author.
+    content: str
+        The message content, empty without the message content intent.
+    webhook_id: int | None
+        The webhook that sent the message, if any.
+    """
+
+    __slots__ = ("id", "guild", "author", "content", "webhook_id", "_state")
+
+    def __init__(
+        self,
+        id: int,
+        guild: discord.Guild,
+        author: RawAuthor,
+        content: str,
+        webhook_id: int | None,
+        state: Any,
+    ):
+        self.id = id
+        self.guild = guild
+        self.author = author
+        self.content = content
+        self.webhook_id = webhook_id
+        # kept for the message content intent check
+        self._state = state
+
+    @property
+    def created_at(self) -> datetime:
+        return snowflake_time(self.id)
+
+
+class MessageFastPath:
+    """
+    Replaces the MESSAGE_CREATE parser of discord.py to count messages for spawns without
+    building a `discord.Message` for each of them.
+
+    Messages from guilds without spawn, from blacklisted guilds, from bots and from webhooks
+    are dropped from the payload alone. The others are dispatched as `RawMessage` with the
+    `ballsdex_raw_message` event. Owners' messages and direct messages still go through the
+    original parser, so that text commands keep working.
+
+    Other `on_message` listeners will only receive owners' messages, and channels' last
+    message ID is not updated.
+
+    Parameters
+    ----------
+    bot: BallsDexBot
+        The bot whose parser is replaced.
+    guilds: Container[int]
+        IDs of the guilds where spawn is enabled.
+    """
+
+    def __init__(self, bot: "BallsDexBot", guilds: Container[int]):
+        self.bot = bot
+        self.guilds = guilds
+        self.parser: Callable[[Any], None] | None = None
+
+    def install(self):
+        parsers = self.bot._connection.parsers
+        if self.parser is not None:
+            return
+        self.parser = parsers["MESSAGE_CREATE"]
+        parsers["MESSAGE_CREATE"] = self.parse_message_create
+        log.info("Spawn fast path enabled, messages are read from the gateway payloads.")
+
+    def uninstall(self):
+        if self.parser is None:
+            return
+        parsers = self.bot._connection.parsers
+        if parsers.get("MESSAGE_CREATE") == self.parse_message_create:
+            parsers["MESSAGE_CREATE"] = self.parser
+        self.parser = None
+
+    def parse_message_create(self, data: dict[str, Any]):
+        assert self.parser
+        author = data["author"]
+        author_id = int(author["id"])
+        guild_id = data.get("guild_id")
+        if guild_id is None or author_id in (self.bot.owner_ids or ()):
+            self.parser(data)
+            return
+
+        guild_id = int(guild_id)
+        if guild_id not in self.guilds or guild_id in self.bot.blacklist_guild:
+            return
+        if author.get("bot", False) or data.get("webhook_id") is not None:
+            return
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+
+        message = RawMessage(
+            int(data["id"]),
+            guild,
+            RawAuthor(author_id, False),
+            data.get("content", ""),
+            None,
+            self.bot._connection,
+        )
+        self.bot.dispatch(EVENT, message)
@@ -2,10 +2,10 @@ import asyncio
 import logging
 import random
 from abc import abstractmethod
-from collections import deque, namedtuple
+from array import array
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import TYPE_CHECKING, Literal
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Literal
 
 import discord
 from discord.utils import format_dt
@@ -18,8 +18,8 @@ if TYPE_CHECKING:
 log = logging.getLogger("ballsdex.packages.countryballs")
 
 SPAWN_CHANCE_RANGE = (40, 55)
-
-CachedMessage = namedtuple("CachedMessage", ["content", "author_id"])
+# messages shorter than this are penalized
+SHORT_MESSAGE_LENGTH = 5
 
 
 class BaseSpawnManager:
@@ -75,8 +75,112 @@ class BaseSpawnManager:
         """
         raise NotImplementedError
 
+    def evict(self, before: datetime) -> int:
+        """
+        Forget the state of the guilds that have not sent a message since the given time.
+        Called periodically to keep memory bounded, does nothing by default.
+
+        Parameters
+        ----------
+        before: datetime
+            Guilds idle since before this time should be dropped.
+
+        Returns
+        -------
+        int
+            The number of guilds dropped.
+        """
+        return 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Export the state worth keeping across restarts, as JSON serializable data. It is saved
+        periodically and passed to `restore` on the next start. Empty by default.
+        """
+        return {}
+
+    def restore(self, data: dict[str, Any]) -> int:
+        """
+        Load the state exported by `snapshot`. Guilds that already have a state, because they
+        sent messages in the meantime, should be kept as is.
+
+        Returns
+        -------
+        int
+            The number of guilds restored.
+        """
+        return 0
+
+
+class MessageCache:
+    """
+    Ring buffer of the most recent messages of a guild, storing only the author ID and the
+    content length in flat arrays. The number of messages per author and the number of short
+    messages are updated on each insertion, so the spam heuristics never walk the buffer.
+
+    Parameters
+    ----------
+    maxlen: int
+        Number of messages kept, the oldest one is dropped when a new one is added.
+    """
+
+    __slots__ = ("maxlen", "authors", "lengths", "counts", "short", "position", "size")
+
+    def __init__(self, maxlen: int = 100):
+        self.maxlen = maxlen
+        self.authors = array("Q", bytes(8 * maxlen))
+        self.lengths = array("H", bytes(2 * maxlen))
+        # only authors with at least one message in the buffer
+        self.counts: dict[int, int] = {}
+        self.short = 0
+        self.position = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, author_id: int, length: int):
+        i = self.position
+        if self.size == self.maxlen:
+            oldest = self.authors[i]
+            count = self.counts[oldest] - 1
+            if count:
+                self.counts[oldest] = count
+            else:
+                del self.counts[oldest]
+            if self.lengths[i] < SHORT_MESSAGE_LENGTH:
+                self.short -= 1
+        else:
+            self.size += 1
+        length = min(length, 0xFFFF)
+        self.authors[i] = author_id
+        self.lengths[i] = length
+        self.counts[author_id] = self.counts.get(author_id, 0) + 1
+        if length < SHORT_MESSAGE_LENGTH:
+            self.short += 1
+        self.position = (i + 1) % self.maxlen
+
+    @property
+    def chatters(self) -> int:
+        """
+        Number of distinct authors in the buffer.
+        """
+        return len(self.counts)
+
+    def share(self, author_id: int) -> float:
+        """
+        Messages of this author relative to the capacity of the buffer.
+        """
+        return self.counts.get(author_id, 0) / self.maxlen
+
+    def top_share(self) -> float:
+        """
+        Highest `share` among the authors in the buffer.
+        """
+        return max(self.counts.values(), default=0) / self.maxlen
+
 
-@dataclass
+@dataclass(slots=True)
 class SpawnCooldown:
     """
     Represents the default spawn internal system per guild. Contains the counters that will
@@ -92,19 +196,25 @@ class SpawnCooldown:
     threshold: int
         The number `scaled_message_count` has to reach for spawn.
         Determined randomly with `SPAWN_CHANCE_RANGE`
+    last_message: datetime
+        Time of the last message received, used to evict idle guilds
     lock: asyncio.Lock
         Used to ratelimit messages and ignore fast spam
-    message_cache: ~collections.deque[CachedMessage]
-        A list of recent messages used to reduce the spawn chance when too few different chatters
-        are present. Limited to the 100 most recent messages in the guild.
+    message_cache: MessageCache
+        Authors and lengths of recent messages, used to reduce the spawn chance when too few
+        different chatters are present. Limited to the 100 most recent messages in the guild.
     """
 
     time: datetime
     # initialize partially started, to reduce the dead time after starting the bot
     scaled_message_count: float = field(default=SPAWN_CHANCE_RANGE[0] // 2)
     threshold: int = field(default_factory=lambda: random.randint(*SPAWN_CHANCE_RANGE))
+    last_message: datetime = field(init=False)
     lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
-    message_cache: deque[CachedMessage] = field(default_factory=lambda: deque(maxlen=100))
+    message_cache: MessageCache = field(default_factory=MessageCache)
+
+    def __post_init__(self):
+        self.last_message = self.time
 
     def reset(self, time: datetime):
         self.scaled_message_count = 1.0
@@ -116,12 +226,10 @@ class SpawnCooldown:
         self.time = time
 
     async def increase(self, message: discord.Message) -> bool:
-        # this is a deque, not a list
-        # its property is that, once the max length is reached (100 for us),
-        # the oldest element is removed, thus we only have the last 100 messages in memory
-        self.message_cache.append(
-            CachedMessage(content=message.content, author_id=message.author.id)
-        )
+        self.last_message = message.created_at
+        # once the max length is reached (100 for us), the oldest message is overwritten,
+        # thus we only have the last 100 messages in memory
+        self.message_cache.append(message.author.id, len(message.content))
 
         if self.lock.locked():
             return False
@@ -130,12 +238,14 @@ class SpawnCooldown:
             message_multiplier = 1
             if message.guild.member_count < 5 or message.guild.member_count > 1000:  # type: ignore
                 message_multiplier /= 2
-            if message._state.intents.message_content and len(message.content) < 5:
+            if (
+                message._state.intents.message_content
+                and len(message.content) < SHORT_MESSAGE_LENGTH
+            ):
                 message_multiplier /= 2
-            if len(set(x.author_id for x in self.message_cache)) < 4 or (
-                len(list(filter(lambda x: x.author_id == message.author.id, self.message_cache)))
-                / self.message_cache.maxlen  # type: ignore
-                > 0.4
+            if (
+                self.message_cache.chatters < 4
+                or self.message_cache.share(message.author.id) > 0.4
             ):
                 message_multiplier /= 2
             self.scaled_message_count += message_multiplier
@@ -188,6 +298,43 @@ class SpawnManager(BaseSpawnManager):
         cooldown.reset(message.created_at)
         return True
 
+    def evict(self, before: datetime) -> int:
+        idle = [
+            guild_id
+            for guild_id, cooldown in self.cooldowns.items()
+            if cooldown.last_message < before
+        ]
+        for guild_id in idle:
+            del self.cooldowns[guild_id]
+        return len(idle)
+
+    def snapshot(self) -> dict[str, Any]:
+        # the message cache is not saved, it would be outdated after a restart anyway
+        return {
+            "guilds": {
+                str(guild_id): [
+                    cooldown.scaled_message_count,
+                    cooldown.threshold,
+                    cooldown.time.timestamp(),
+                    cooldown.last_message.timestamp(),
+                ]
+                for guild_id, cooldown in self.cooldowns.items()
+            }
+        }
+
+    def restore(self, data: dict[str, Any]) -> int:
+        restored = 0
+        for guild_id, (count, threshold, time, last_message) in data.get("guilds", {}).items():
+            if int(guild_id) in self.cooldowns:
+                continue
+            cooldown = SpawnCooldown(
+                datetime.fromtimestamp(time, tz=timezone.utc), float(count), int(threshold)
+            )
+            cooldown.last_message = datetime.fromtimestamp(last_message, tz=timezone.utc)
+            self.cooldowns[int(guild_id)] = cooldown
+            restored += 1
+        return restored
+
     async def admin_explain(
         self, interaction: discord.Interaction["BallsDexBot"], guild: discord.Guild
     ):
@@ -227,20 +374,14 @@ class SpawnManager(BaseSpawnManager):
         penalities: list[str] = []
         if guild.member_count < 5 or guild.member_count > 1000:
             penalities.append("Server has less than 5 or more than 1000 members")
-        if any(len(x.content) < 5 for x in cooldown.message_cache):
-            penalities.append("Some cached messages are less than 5 characters long")
+        if cooldown.message_cache.short:
+            penalities.append(
+                f"Some cached messages are less than {SHORT_MESSAGE_LENGTH} characters long"
+            )
 
-        authors_set = set(x.author_id for x in cooldown.message_cache)
-        low_chatters = len(authors_set) < 4
+        low_chatters = cooldown.message_cache.chatters < 4
         # check if one author has more than 40% of messages in cache
-        major_chatter = any(
-            (
-                len(list(filter(lambda x: x.author_id == author, cooldown.message_cache)))
-                / cooldown.message_cache.maxlen  # type: ignore
-                > 0.4
-            )
-            for author in authors_set
-        )
+        major_chatter = cooldown.message_cache.top_share() > 0.4
         # this mess is needed since either conditions make up to a single penality
         if low_chatters:
             if not major_chatter:
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import os
+import random
+from dataclasses import dataclass
+from io import BytesIO
+
+from cachetools import LRUCache
+from PIL import Image
+from prometheus_client import Counter
+
+from ballsdex.core.image_generator.image_gen import MEDIA_PATH
+from ballsdex.core.models import Ball
+
+log = logging.getLogger("ballsdex.packages.countryballs.spawn_assets")
+
+spawn_upload_bytes = Counter("spawn_upload_bytes", "Bytes of artwork uploaded by spawn messages")
+spawn_asset_hits = Counter("spawn_asset_cache_hits", "Spawn artworks served from memory")
+spawn_asset_misses = Counter("spawn_asset_cache_misses", "Spawn artworks read from disk")
+
+# number of pixels altered in each variant
+PERTURBED_PIXELS = 16
+
+
+@dataclass(slots=True)
+class SpawnAsset:
+    path: str
+    mtime: int
+    data: bytes
+    # None until generated, stays empty if the image cannot be altered
+    variants: list[bytes] | None = None
+    index: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + sum(len(x) for x in self.variants or ())
+
+    def next(self) -> bytes:
+        if not self.variants:
+            return self.data
+        self.index = (self.index + 1) % len(self.variants)
+        return self.variants[self.index]
+
+
+class SpawnAssetCache:
+    """
+    In-memory cache of the spawn artworks, keyed on the ball and invalidated when its wild
+    card is changed or replaced.
+
+    When variants are enabled, a pool of copies with a few pixels changed by one level is
+    generated in the background on the first spawn of a ball, then rotated through. The
+    original artwork is used until the pool is ready.
+
+    Parameters
+    ----------
+    max_size: int
+        Memory budget in bytes, the least recently spawned balls are dropped first.
+    variants: int
+        Number of variants per ball, 0 to always use the original artwork.
+    """
+
+    def __init__(self, max_size: int, variants: int = 0):
+        self.variants = variants
+        self.assets: LRUCache[int, SpawnAsset] = LRUCache(
+            maxsize=max_size, getsizeof=lambda asset: asset.size
+        )
+        self.tasks: dict[int, asyncio.Task] = {}
+
+    def _store(self, ball_id: int, asset: SpawnAsset):
+        try:
+            self.assets[ball_id] = asset
+        except ValueError:
+            pass  # larger than the whole cache
+
+    async def get(self, ball: Ball) -> bytes:
+        """
+        Get the artwork to upload for a spawn of this ball.
+        """
+        path = MEDIA_PATH + ball.wild_card
+        mtime = os.stat(path).st_mtime_ns
+        asset = self.assets.get(ball.pk)
+        if asset is None or asset.path != path or asset.mtime != mtime:
+            spawn_asset_misses.inc()
+            data = await asyncio.to_thread(_read, path)
+            asset = SpawnAsset(path, mtime, data)
+            self._store(ball.pk, asset)
+        else:
+            spawn_asset_hits.inc()
+
+        if self.variants and asset.variants is None and ball.pk not in self.tasks:
+            task = asyncio.create_task(self._generate_variants(ball.pk, asset))
+            self.tasks[ball.pk] = task
+            task.add_done_callback(lambda _: self.tasks.pop(ball.pk, None))
+        return asset.next()
+
+    async def _generate_variants(self, ball_id: int, asset: SpawnAsset):
+        try:
+            variants = await asyncio.to_thread(perturb, asset.data, self.variants)
+        except Exception:
+            log.warning(f"Failed to generate spawn variants of {asset.path}", exc_info=True)
+            variants = []
+        if self.assets.get(ball_id) is not asset:
+            return  # replaced or evicted meanwhile
+        asset.variants = variants
+        # inserting again updates the size held by the cache
+        self._store(ball_id, asset)
+        log.debug(f"Generated {len(variants)} spawn variants of {asset.path}")
+
+    def clear(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+        self.assets.clear()
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _webp_lossless(data: bytes) -> bool:
+    # the first image chunk after the RIFF header is VP8L for lossless, VP8 for lossy
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk = data[offset : offset + 4]
+        if chunk in (b"VP8L", b"VP8 "):
+            return chunk == b"VP8L"
+        size = int.from_bytes(data[offset + 4 : offset + 8], "little")
+        offset += 8 + size + (size & 1)
+    return False
+
+
+def _perturb_palette(image: Image.Image) -> Image.Image:
+    # changing a palette index could change the color entirely, the palette entries of a few
+    # used colors are changed by one level instead
+    variant = image.copy()
+    palette = variant.getpalette()
+    if not palette:
+        return variant
+    transparency = image.info.get("transparency")
+    used = [x for _, x in variant.getcolors(256) or () if x != transparency]
+    for index in random.sample(used, min(len(used), PERTURBED_PIXELS)):
+        palette[index * 3] ^= 1
+    variant.putpalette(palette)
+    return variant
+
+
+def perturb(data: bytes, count: int) -> list[bytes]:
+    """
+    Generate copies of an image with a few random pixels (or palette colors) changed by one
+    level, invisible but enough to change the file's hash. Animated images are left untouched.
+    """
+    with Image.open(BytesIO(data)) as source:
+        if getattr(source, "is_animated", False):
+            return []
+        format = source.format
+        if source.mode in ("RGB", "RGBA", "L", "LA", "P"):
+            image = source.copy()
+        else:
+            image = source.convert("RGBA")
+        info = source.info
+
+    save_kwargs: dict = {}
+    if format == "WEBP" and _webp_lossless(data):
+        save_kwargs = {"lossless": True}
+    elif format in ("JPEG", "WEBP"):
+        save_kwargs = {"quality": 95}
+    if image.mode == "P":
+        save_kwargs["optimize"] = False
+        if "transparency" in info:
+            save_kwargs["transparency"] = info["transparency"]
+
+    variants: list[bytes] = []
+    for _ in range(count):
+        if image.mode == "P":
+            variant = _perturb_palette(image)
+        else:
+            variant = image.copy()
+            for _ in range(PERTURBED_PIXELS):
+                xy = (random.randrange(variant.width), random.randrange(variant.height))
+                pixel = variant.getpixel(xy)
+                if isinstance(pixel, int):
+                    variant.putpixel(xy, pixel ^ 1)
+                else:
+                    # keep the alpha channel as is
+                    colors = len(pixel) - 1 if variant.mode in ("RGBA", "LA") else len(pixel)
+                    variant.putpixel(xy, tuple(x ^ 1 for x in pixel[:colors]) + pixel[colors:])
+        buffer = BytesIO()
+        variant.save(buffer, format=format, **save_kwargs)
+        variants.append(buffer.getvalue())
+    return variants
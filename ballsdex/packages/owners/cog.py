@@ -54,7 +54,7 @@ class Owners(commands.GroupCog, name="owners"):
         super().__init__()
 
     async def get_random_ball(self, player: Player) -> Ball | None:
-        owned_ids = await BallInstance.filter(player=player).values_list("ball_id", flat=True)
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.5, rarity__lte=30.0).all()
 
         if not all_balls:
@@ -81,7 +81,7 @@ class Owners(commands.GroupCog, name="owners"):
         return random.choice(choices)
 
     async def getdasigmaballmate(self, player: Player) -> Ball | None:
-        owned_ids = await BallInstance.filter(player=player).values_list("ball_id", flat=True)
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.05, rarity__lte=5.0).all() # same with the get_random_balls
 
         if not all_balls:
@@ -117,7 +117,7 @@ class Owners(commands.GroupCog, name="owners"):
                 "❌ You’re not allowed to use this command.", ephemeral=True)
             return
 
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         ball = await self.get_random_ball(player)
 
         if not ball:
@@ -167,7 +167,7 @@ class Owners(commands.GroupCog, name="owners"):
             return
 
 
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         ball = await self.getdasigmaballmate(player)
 
         if not ball:
@@ -170,9 +170,7 @@ class Picks(commands.GroupCog, name="picks"):
 
     async def get_random_balls_for_daily(self, player: Player, count: int = 5) -> list[Ball]:
         """Get random balls for daily picks with rarity range 0.1-30.0"""
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.1, rarity__lte=30.0, enabled=True).all()
 
         if not all_balls:
@@ -227,9 +225,7 @@ class Picks(commands.GroupCog, name="picks"):
 
     async def get_random_balls_for_weekly(self, player: Player, count: int = 5) -> list[Ball]:
         """Get random balls for weekly picks with rarity range 0.03-2.5"""
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.03, rarity__lte=2.5, enabled=True).all()
 
         if not all_balls:
@@ -282,9 +278,7 @@ class Picks(commands.GroupCog, name="picks"):
 
     async def get_random_balls_for_picks(self, player: Player, count: int = 5) -> list[Ball]:
         """Get random balls for picks pick with rarity range 0.1-30.0 (0.1 very hard to get)"""
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(rarity__gte=0.1, rarity__lte=30.0, enabled=True).all()
 
         if not all_balls:
@@ -343,9 +337,7 @@ class Picks(commands.GroupCog, name="picks"):
 
     async def get_random_ball_any(self, player: Player) -> Ball | None:
         """Get any random ball for wallet picks (no rarity restrictions)"""
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(enabled=True).all()
 
         if not all_balls:
@@ -478,7 +470,7 @@ class Picks(commands.GroupCog, name="picks"):
 
         await interaction.response.defer()
         
-        player, _ = await Player.get_or_create(discord_id=str(user_id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         balls = await self.get_random_balls_for_daily(player, 5)
 
         if len(balls) < 5:
@@ -614,7 +606,7 @@ class Picks(commands.GroupCog, name="picks"):
 
         await interaction.response.defer()
         
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         balls = await self.get_random_balls_for_weekly(player, 5)
 
         if len(balls) < 5:
@@ -725,9 +717,7 @@ class Picks(commands.GroupCog, name="picks"):
 
     async def get_random_balls_for_wallet(self, player: Player, count: int = 5) -> list[Ball]:
         """Get random balls for wallet picks (no rarity restrictions)"""
-        owned_ids = set(
-            await BallInstance.filter(player=player).values_list("ball__id", flat=True)
-        )
+        owned_ids = await self.bot.owned_balls.get(player.pk)
         all_balls = await Ball.filter(enabled=True).all()
 
         if not all_balls:
@@ -804,7 +794,7 @@ class Picks(commands.GroupCog, name="picks"):
         
         await interaction.response.defer()
         
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         balls = await self.get_random_balls_for_picks(player, 5)
 
         if len(balls) < 5:
@@ -27,6 +27,7 @@ from ballsdex.core.utils.enums import (
     PRIVATE_POLICY_MAP,
 )
 from ballsdex.core.utils.enums import TRADE_COOLDOWN_POLICY_MAP as TRADE_POLICY_MAP
+from ballsdex.core.utils.owned import BallSet
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
 from ballsdex.settings import settings
 
@@ -71,14 +72,14 @@ class Player(commands.GroupCog):
         policy: PrivacyPolicy
             The new privacy policy to choose.
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         if policy == PrivacyPolicy.SAME_SERVER and not self.bot.intents.members:
             await interaction.response.send_message(
                 "I need the `members` intent to use this policy.", ephemeral=True
             )
             return
         player.privacy_policy = PrivacyPolicy(policy.value)
-        await player.save()
+        await player.save(update_fields=("privacy_policy",))
         await interaction.response.send_message(
             f"Your privacy policy has been set to **{policy.name}**.", ephemeral=True
         )
@@ -107,7 +108,7 @@ class Player(commands.GroupCog):
         policy: DonationPolicy
             The new policy for accepting donations
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         player.donation_policy = DonationPolicy(policy.value)
         if policy.value == DonationPolicy.ALWAYS_ACCEPT:
             await interaction.response.send_message(
@@ -137,7 +138,8 @@ class Player(commands.GroupCog):
         else:
             await interaction.response.send_message("Invalid input!", ephemeral=True)
             return
-        await player.save()  # do not save if the input is invalid
+        # do not save if the input is invalid
+        await player.save(update_fields=("donation_policy",))
 
     @policy.command()
     @app_commands.choices(
@@ -157,9 +159,9 @@ class Player(commands.GroupCog):
         policy: MentionPolicy
             The new policy for mentions
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         player.mention_policy = policy
-        await player.save()
+        await player.save(update_fields=("mention_policy",))
         await interaction.response.send_message(
             f"Your mention policy has been set to **{policy.name.lower()}**.", ephemeral=True
         )
@@ -180,9 +182,9 @@ class Player(commands.GroupCog):
         policy: FriendPolicy
             The new policy for friend requests.
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         player.friend_policy = policy
-        await player.save()
+        await player.save(update_fields=("friend_policy",))
         await interaction.response.send_message(
             f"Your friend request policy has been set to **{policy.name.lower()}**.",
             ephemeral=True,
@@ -208,9 +210,9 @@ class Player(commands.GroupCog):
         policy: TradeCooldownPolicy
             The new policy for trade acceptance cooldown.
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         player.trade_cooldown_policy = policy
-        await player.save()
+        await player.save(update_fields=("trade_cooldown_policy",))
         await interaction.response.send_message(
             f"Your trade acceptance cooldown policy has been set to **{policy.name.lower()}**.",
             ephemeral=True,
@@ -228,8 +230,9 @@ class Player(commands.GroupCog):
         await view.wait()
         if view.value is None or not view.value:
             return
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
         await player.delete()
+        interaction.client.owned_balls.invalidate(player.pk)
 
     @friend.command(name="add")
     async def friend_add(
@@ -243,8 +246,8 @@ class Player(commands.GroupCog):
         user: discord.User
             The user you want to add as a friend.
         """
-        player1, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await PlayerModel.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
 
         if player1 == player2:
             await interaction.response.send_message(
@@ -265,8 +268,9 @@ class Player(commands.GroupCog):
             )
             return
 
-        blocked = await player1.is_blocked(player2)
-        player2_blocked = await player2.is_blocked(player1)
+        relations = await self.bot.social_graph.load(player1.pk, player2.pk)
+        blocked = player2.pk in relations[player1.pk].blocked
+        player2_blocked = player1.pk in relations[player2.pk].blocked
 
         if blocked:
             player_unblock = self.block_remove.extras.get("mention", "/player block remove")
@@ -281,7 +285,7 @@ class Player(commands.GroupCog):
             )
             return
 
-        friended = await player1.is_friend(player2)
+        friended = player2.pk in relations[player1.pk].friends
         if friended:
             await interaction.response.send_message(
                 "You are already friends with this user!", ephemeral=True
@@ -336,8 +340,8 @@ class Player(commands.GroupCog):
         user: discord.User
             The user you want to remove as a friend.
         """
-        player1, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await PlayerModel.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
 
         if player1 == player2:
             await interaction.response.send_message("You cannot remove yourself.", ephemeral=True)
@@ -346,7 +350,7 @@ class Player(commands.GroupCog):
             await interaction.response.send_message("You cannot remove a bot.", ephemeral=True)
             return
 
-        friendship_exists = await player1.is_friend(player2)
+        friendship_exists = await self.bot.social_graph.is_friend(player1, player2)
         if not friendship_exists:
             await interaction.response.send_message(
                 "You are not friends with this user.", ephemeral=True
@@ -357,6 +361,7 @@ class Player(commands.GroupCog):
                 (Q(player1=player1) & Q(player2=player2))
                 | (Q(player1=player2) & Q(player2=player1))
             ).delete()
+            self.bot.social_graph.invalidate(player1.pk, player2.pk)
             await interaction.response.send_message(
                 f"{user.name} has been removed as a friend.", ephemeral=True
             )
@@ -366,7 +371,7 @@ class Player(commands.GroupCog):
         """
         View all your friends.
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
 
         friendships = (
             await Friendship.filter(Q(player1=player) | Q(player2=player))
@@ -412,8 +417,8 @@ class Player(commands.GroupCog):
         user: discord.User
             The user you want to block.
         """
-        player1, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await PlayerModel.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
 
         await interaction.response.defer(ephemeral=True, thinking=True)
 
@@ -424,8 +429,8 @@ class Player(commands.GroupCog):
             await interaction.followup.send("You cannot block a bot.", ephemeral=True)
             return
 
-        blocked = await player1.is_blocked(player2)
-        if blocked:
+        relations = await self.bot.social_graph.get(player1.pk)
+        if player2.pk in relations.blocked:
             await interaction.followup.send("You have already blocked this user.", ephemeral=True)
             return
         if self.active_friend_requests.get((player1.discord_id, player2.discord_id)):
@@ -435,8 +440,7 @@ class Player(commands.GroupCog):
             )
             return
 
-        friended = await player1.is_friend(player2)
-        if friended:
+        if player2.pk in relations.friends:
             view = ConfirmChoiceView(
                 interaction,
                 accept_message="User has been blocked.",
@@ -456,6 +460,7 @@ class Player(commands.GroupCog):
                     (Q(player1=player1) & Q(player2=player2))
                     | (Q(player1=player2) & Q(player2=player1))
                 ).delete()
+                self.bot.social_graph.invalidate(player1.pk, player2.pk)
 
         await Block.create(player1=player1, player2=player2)
         await interaction.followup.send(f"You have now blocked {user.name}.", ephemeral=True)
@@ -472,8 +477,8 @@ class Player(commands.GroupCog):
         user: discord.User
             The user you want to unblock.
         """
-        player1, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await PlayerModel.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
 
         if player1 == player2:
             await interaction.response.send_message("You cannot unblock yourself.", ephemeral=True)
@@ -482,13 +487,14 @@ class Player(commands.GroupCog):
             await interaction.response.send_message("You cannot unblock a bot.", ephemeral=True)
             return
 
-        blocked = await player1.is_blocked(player2)
+        blocked = await self.bot.social_graph.is_blocked(player1, player2)
 
         if not blocked:
             await interaction.response.send_message("This user isn't blocked.", ephemeral=True)
             return
         else:
             await Block.filter((Q(player1=player1) & Q(player2=player2))).delete()
+            self.bot.social_graph.invalidate(player1.pk, player2.pk)
             await interaction.response.send_message(
                 f"{user.name} has been unblocked.", ephemeral=True
             )
@@ -498,7 +504,7 @@ class Player(commands.GroupCog):
         """
         View all the users you have blocked.
         """
-        player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
+        player, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
 
         blocked_relations = (
             await Block.filter(player1=player)
@@ -556,11 +562,8 @@ class Player(commands.GroupCog):
         user = interaction.user
         bot_countryballs = {x: y.emoji_id for x, y in balls.items() if y.enabled}
         total_countryballs = len(bot_countryballs)
-        owned_countryballs = set(
-            x[0]
-            for x in await player.balls.filter(ball__enabled=True)
-            .distinct()
-            .values_list("ball_id")
+        owned_countryballs = await self.bot.owned_balls.get(player.pk) & BallSet.from_ids(
+            bot_countryballs
         )
 
         if total_countryballs > 0:
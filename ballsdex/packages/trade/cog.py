@@ -9,7 +9,7 @@ from discord.ext import commands
 from discord.utils import MISSING
 from tortoise.expressions import Q
 
-from ballsdex.core.models import BallInstance, Player
+from ballsdex.core.models import BallInstance
 from ballsdex.core.models import Trade as TradeModel
 from ballsdex.core.utils.buttons import ConfirmChoiceView
 from ballsdex.core.utils.paginator import Pages
@@ -118,16 +118,15 @@ class Trade(commands.GroupCog):
                 "You cannot trade with yourself.", ephemeral=True
             )
             return
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
-        blocked = await player1.is_blocked(player2)
-        if blocked:
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
+        block = await self.bot.social_graph.find_block([(player1, player2)])
+        if block and block[0] == player1:
             await interaction.response.send_message(
                 "You cannot begin a trade with a user that you have blocked.", ephemeral=True
             )
             return
-        blocked2 = await player2.is_blocked(player1)
-        if blocked2:
+        if block:
             await interaction.response.send_message(
                 "You cannot begin a trade with a user that has blocked you.", ephemeral=True
             )
@@ -146,8 +145,8 @@ class Trade(commands.GroupCog):
             )
             return
 
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
+        player1, _ = await self.bot.player_cache.get_or_create(interaction.user.id)
+        player2, _ = await self.bot.player_cache.get_or_create(user.id)
         if player2.discord_id in self.bot.blacklist:
             await interaction.response.send_message(
                 "You cannot trade with a blacklisted user.", ephemeral=True
@@ -219,7 +218,7 @@ class Trade(commands.GroupCog):
                 ephemeral=True,
             )
             return
-        if await countryball.is_locked():
+        if not await self.bot.locked_balls.lock([countryball.pk]):
             await interaction.followup.send(
                 f"This {settings.collectible_name} is currently in an active trade or donation, "
                 "please try again later.",
@@ -227,7 +226,6 @@ class Trade(commands.GroupCog):
             )
             return
 
-        await countryball.lock_for_trade()
         trader.proposal.append(countryball)
         await interaction.followup.send(
             f"{countryball.countryball.country} added.", ephemeral=True
@@ -334,7 +332,7 @@ class Trade(commands.GroupCog):
         await interaction.response.send_message(
             f"{countryball.countryball.country} removed.", ephemeral=True
         )
-        await countryball.unlock()
+        await self.bot.locked_balls.unlock([countryball.pk])
 
     @app_commands.command()
     async def cancel(self, interaction: discord.Interaction["BallsDexBot"]):
@@ -413,12 +411,8 @@ class Trade(commands.GroupCog):
         if special:
             queryset = queryset.filter(Q(tradeobjects__ballinstance__special=special)).distinct()
 
-        history = await queryset.order_by(sort_value).prefetch_related(
-            "player1",
-            "player2",
-            "tradeobjects__ballinstance__ball",
-            "tradeobjects__ballinstance__special",
-        )
+        # the countryballs of each trade are loaded by pages
+        history = await queryset.order_by(sort_value).prefetch_related("player1", "player2")
 
         if not history:
             await interaction.followup.send("No history found.", ephemeral=True)
@@ -2,14 +2,20 @@ from typing import TYPE_CHECKING, Iterable
 
 import discord
 
+from ballsdex.core.models import BallInstance
 from ballsdex.core.models import Trade as TradeModel
+from ballsdex.core.models import TradeObject
 from ballsdex.core.utils import menus
 from ballsdex.core.utils.paginator import Pages
+from ballsdex.core.utils.proposals import EMBED_LENGTH
 from ballsdex.packages.trade.trade_user import TradingUser
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
 
+# number of trades loaded together around the page shown
+HISTORY_WINDOW = 10
+
 
 class TradeViewFormat(menus.ListPageSource):
     def __init__(
@@ -24,8 +30,39 @@ class TradeViewFormat(menus.ListPageSource):
         self.url = url
         self.bot = bot
         self.is_admin = is_admin
+        # trade ID to the countryballs given by each player ID
+        self.proposals: dict[int, dict[int, list[BallInstance]]] = {}
         super().__init__(entries, per_page=1)
 
+    async def load_window(self, page_number: int):
+        """
+        Load the trades around a page at once: their countryballs with a single query, and
+        their players, so that the next page flips need no query and no REST call.
+        """
+        start = max(0, page_number - HISTORY_WINDOW // 2)
+        trades: list[TradeModel] = [
+            x for x in self.entries[start : start + HISTORY_WINDOW] if x.pk not in self.proposals
+        ]
+        if not trades:
+            return
+        proposals = {x.pk: {x.player1.pk: [], x.player2.pk: []} for x in trades}
+        for trade_object in await TradeObject.filter(
+            trade_id__in=list(proposals.keys())
+        ).select_related("ballinstance"):
+            proposals[trade_object.trade_id].setdefault(trade_object.player_id, []).append(
+                trade_object.ballinstance
+            )
+        self.proposals.update(proposals)
+        # a user who cannot be fetched is left to fail on their own page
+        await self.bot.user_cache.get_many(
+            player.discord_id for x in trades for player in (x.player1, x.player2)
+        )
+
+    async def get_page(self, page_number: int) -> TradeModel:
+        if self.entries[page_number].pk not in self.proposals:
+            await self.load_window(page_number)
+        return await super().get_page(page_number)
+
     async def format_page(self, menu: Pages, trade: TradeModel) -> discord.Embed:
         embed = discord.Embed(
             title=f"Trade history for {self.header}",
@@ -39,8 +76,20 @@ class TradeViewFormat(menus.ListPageSource):
         fill_trade_embed_fields(
             embed,
             self.bot,
-            await TradingUser.from_trade_model(trade, trade.player1, self.bot, self.is_admin),
-            await TradingUser.from_trade_model(trade, trade.player2, self.bot, self.is_admin),
+            await TradingUser.from_trade_model(
+                trade,
+                trade.player1,
+                self.bot,
+                self.is_admin,
+                self.proposals[trade.pk][trade.player1.pk],
+            ),
+            await TradingUser.from_trade_model(
+                trade,
+                trade.player2,
+                self.bot,
+                self.is_admin,
+                self.proposals[trade.pk][trade.player2.pk],
+            ),
             is_admin=self.is_admin,
         )
         return embed
@@ -67,31 +116,12 @@ def _get_trader_name(trader: TradingUser, is_admin: bool = False) -> str:
 
 def _build_list_of_strings(
     trader: TradingUser, bot: "BallsDexBot", short: bool = False
-) -> list[str]:
+) -> tuple[list[str], int]:
     # this builds a list of strings always lower than 1024 characters
-    # while not cutting in the middle of a line
-    proposal: list[str] = [""]
-    i = 0
-
-    for countryball in trader.proposal:
-        cb_text = countryball.description(short=short, include_emoji=True, bot=bot, is_trade=True)
-        if trader.locked:
-            text = f"- *{cb_text}*\n"
-        else:
-            text = f"- {cb_text}\n"
-        if trader.cancelled:
-            text = f"~~{text}~~"
-
-        if len(text) + len(proposal[i]) > 950:
-            # move to a new list element
-            i += 1
-            proposal.append("")
-        proposal[i] += text
-
-    if not proposal[0]:
-        proposal[0] = "*Empty*"
-
-    return proposal
+    # while not cutting in the middle of a line, and their total length
+    return bot.proposal_text.fields(
+        bot, trader.proposal, short=short, locked=trader.locked, cancelled=trader.cancelled
+    )
 
 
 def fill_trade_embed_fields(
@@ -125,8 +155,13 @@ def fill_trade_embed_fields(
     # first, build embed strings
     # to play around the limit of 1024 characters per field, we'll be using multiple fields
     # these vars are list of fields, being a list of lines to include
-    trader1_proposal = _build_list_of_strings(trader1, bot, compact)
-    trader2_proposal = _build_list_of_strings(trader2, bot, compact)
+    trader1_proposal, length1 = _build_list_of_strings(trader1, bot, compact)
+    trader2_proposal, length2 = _build_list_of_strings(trader2, bot, compact)
+    if not compact and length1 + length2 > EMBED_LENGTH:
+        # cannot fit whatever the rest of the embed is, skip to the compact display
+        return fill_trade_embed_fields(
+            embed, bot, trader1, trader2, compact=True, is_admin=is_admin
+        )
 
     # then display the text. first page is easy
     embed.add_field(
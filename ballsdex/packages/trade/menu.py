@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, List, Set, cast
+from typing import TYPE_CHECKING, Hashable, List, Set, cast
 
 import discord
 from discord.ui import Button, View, button
 from discord.utils import format_dt, utcnow
 
-from ballsdex.core.models import BallInstance, Player, Trade, TradeCooldownPolicy, TradeObject
+from ballsdex.core.models import BallInstance, Player, TradeCooldownPolicy
 from ballsdex.core.utils import menus
 from ballsdex.core.utils.buttons import ConfirmChoiceView
 from ballsdex.core.utils.paginator import Pages
+from ballsdex.core.utils.transfer import Transfer, TransferError, TransferResult, transfer_balls
 from ballsdex.packages.balls.countryballs_paginator import CountryballsViewer
 from ballsdex.packages.trade.display import fill_trade_embed_fields
 from ballsdex.packages.trade.trade_user import TradingUser
@@ -100,8 +100,7 @@ class TradeView(View):
             )
             return
 
-        for countryball in trader.proposal:
-            await countryball.unlock()
+        await interaction.client.locked_balls.unlock(x.pk for x in trader.proposal)
 
         trader.proposal.clear()
         await interaction.followup.send("Proposal cleared.", ephemeral=True)
@@ -222,7 +221,6 @@ class TradeMenu:
         self.trader1 = trader1
         self.trader2 = trader2
         self.embed = discord.Embed()
-        self.task: asyncio.Task | None = None
         self.current_view: TradeView | ConfirmView = TradeView(self)
         self.message: discord.Message
         self.cooldown_start_time: datetime | None = None
@@ -256,33 +254,31 @@ class TradeMenu:
             "but you can keep on editing your proposal."
         )
 
-    async def update_message_loop(self):
+    def refresh_state(self) -> Hashable:
+        return tuple(
+            (tuple(x.pk for x in user.proposal), user.locked, user.cancelled, user.accepted)
+            for user in (self.trader1, self.trader2)
+        )
+
+    async def refresh(self):
         """
-        A loop task that updates each 5 second the menu with the new content.
+        Update the menu with the new content, called by the menu refresher when it changed.
         """
+        try:
+            fill_trade_embed_fields(self.embed, self.bot, self.trader1, self.trader2)
+            await self.message.edit(embed=self.embed)
+        except Exception:
+            log.exception(
+                "Failed to refresh the trade menu "
+                f"guild={self.message.guild.id} "  # type: ignore
+                f"trader1={self.trader1.user.id} trader2={self.trader2.user.id}"
+            )
+            self.embed.colour = discord.Colour.dark_red()
+            await self.cancel("The trade timed out")
 
-        assert self.task
-        start_time = datetime.utcnow()
-
-        while True:
-            await asyncio.sleep(15)
-            if datetime.utcnow() - start_time > timedelta(minutes=15):
-                self.embed.colour = discord.Colour.dark_red()
-                await self.cancel("The trade timed out")
-                return
-
-            try:
-                fill_trade_embed_fields(self.embed, self.bot, self.trader1, self.trader2)
-                await self.message.edit(embed=self.embed)
-            except Exception:
-                log.exception(
-                    "Failed to refresh the trade menu "
-                    f"guild={self.message.guild.id} "  # type: ignore
-                    f"trader1={self.trader1.user.id} trader2={self.trader2.user.id}"
-                )
-                self.embed.colour = discord.Colour.dark_red()
-                await self.cancel("The trade timed out")
-                return
+    async def refresh_timeout(self):
+        self.embed.colour = discord.Colour.dark_red()
+        await self.cancel("The trade timed out")
 
     async def start(self):
         """
@@ -297,17 +293,17 @@ class TradeMenu:
             view=self.current_view,
             allowed_mentions=discord.AllowedMentions(users=self.trader2.player.can_be_mentioned),
         )
-        self.task = self.bot.loop.create_task(self.update_message_loop())
+        self.bot.menu_refresher.add(self, timeout=15 * 60)
 
     async def cancel(self, reason: str = "The trade has been cancelled."):
         """
         Cancel the trade immediately.
         """
-        if self.task:
-            self.task.cancel()
+        self.bot.menu_refresher.remove(self)
 
-        for countryball in self.trader1.proposal + self.trader2.proposal:
-            await countryball.unlock()
+        await self.bot.locked_balls.unlock(
+            x.pk for x in self.trader1.proposal + self.trader2.proposal
+        )
 
         self.current_view.stop()
         for item in self.current_view.children:
@@ -324,8 +320,7 @@ class TradeMenu:
         """
         trader.locked = True
         if self.trader1.locked and self.trader2.locked:
-            if self.task:
-                self.task.cancel()
+            self.bot.menu_refresher.remove(self)
             self.current_view.stop()
             fill_trade_embed_fields(self.embed, self.bot, self.trader1, self.trader2)
 
@@ -345,39 +340,20 @@ class TradeMenu:
         self.embed.colour = discord.Colour.red()
         await self.cancel()
 
-    async def perform_trade(self):
-        valid_transferable_countryballs: list[BallInstance] = []
-
-        trade = await Trade.create(player1=self.trader1.player, player2=self.trader2.player)
-
-        for countryball in self.trader1.proposal:
-            await countryball.refresh_from_db()
-            if countryball.player.discord_id != self.trader1.player.discord_id:
-                # This is a invalid mutation, the player is not the owner of the countryball
-                raise InvalidTradeOperation()
-            countryball.player = self.trader2.player
-            countryball.trade_player = self.trader1.player
-            countryball.favorite = False
-            valid_transferable_countryballs.append(countryball)
-            await TradeObject.create(
-                trade=trade, ballinstance=countryball, player=self.trader1.player
-            )
-
-        for countryball in self.trader2.proposal:
-            if countryball.player.discord_id != self.trader2.player.discord_id:
-                # This is a invalid mutation, the player is not the owner of the countryball
-                raise InvalidTradeOperation()
-            countryball.player = self.trader1.player
-            countryball.trade_player = self.trader2.player
-            countryball.favorite = False
-            valid_transferable_countryballs.append(countryball)
-            await TradeObject.create(
-                trade=trade, ballinstance=countryball, player=self.trader2.player
+    async def perform_trade(self) -> TransferResult:
+        try:
+            result = await transfer_balls(
+                [
+                    Transfer(self.trader1.player, self.trader2.player, self.trader1.proposal),
+                    Transfer(self.trader2.player, self.trader1.player, self.trader2.proposal),
+                ]
             )
-
-        for countryball in valid_transferable_countryballs:
-            await countryball.unlock()
-            await countryball.save()
+        except TransferError as e:
+            # This is a invalid mutation, a player is not the owner of the countryball anymore
+            raise InvalidTradeOperation() from e
+        result.update_owned(self.bot.owned_balls)
+        self.bot.locked_balls.discard(x.pk for x in result.instances)
+        return result
 
     async def confirm(self, trader: TradingUser) -> bool:
         """
@@ -389,18 +365,16 @@ class TradeMenu:
         trader.accepted = True
         fill_trade_embed_fields(self.embed, self.bot, self.trader1, self.trader2)
         if self.trader1.accepted and self.trader2.accepted:
-            if self.task and not self.task.cancelled():
-                # shouldn't happen but just in case
-                self.task.cancel()
+            # shouldn't be refreshed anymore but just in case
+            self.bot.menu_refresher.remove(self)
 
-            self.embed.description = "Trade concluded!"
             self.embed.colour = discord.Colour.green()
             self.current_view.stop()
             for item in self.current_view.children:
                 item.disabled = True  # type: ignore
 
             try:
-                await self.perform_trade()
+                transfer = await self.perform_trade()
             except InvalidTradeOperation:
                 log.warning(f"Illegal trade operation between {self.trader1=} and {self.trader2=}")
                 self.embed.description = (
@@ -414,6 +388,13 @@ class TradeMenu:
                 self.embed.description = "An error occured when concluding the trade."
                 self.embed.colour = discord.Colour.red()
                 result = False
+            else:
+                name = (
+                    settings.collectible_name
+                    if transfer.count == 1
+                    else settings.plural_collectible_name
+                )
+                self.embed.description = f"Trade concluded! {transfer.count} {name} exchanged."
 
         await self.message.edit(content=None, embed=self.embed, view=self.current_view)
         return result
@@ -471,11 +452,11 @@ class CountryballsSelector(Pages):
     async def select_ball_menu(
         self, interaction: discord.Interaction["BallsDexBot"], item: discord.ui.Select
     ):
-        for value in item.values:
-            ball_instance = await BallInstance.get(id=int(value)).prefetch_related(
+        self.balls_selected.update(
+            await BallInstance.filter(id__in=[int(x) for x in item.values]).prefetch_related(
                 "ball", "player"
             )
-            self.balls_selected.add(ball_instance)
+        )
         await interaction.response.defer()
 
     @discord.ui.button(label="Select Page", style=discord.ButtonStyle.secondary)
@@ -483,12 +464,11 @@ class CountryballsSelector(Pages):
         self, interaction: discord.Interaction["BallsDexBot"], button: Button
     ):
         await interaction.response.defer(thinking=True, ephemeral=True)
-        for ball in self.select_ball_menu.options:
-            ball_instance = await BallInstance.get(id=int(ball.value)).prefetch_related(
-                "ball", "player"
-            )
-            if ball_instance not in self.balls_selected:
-                self.balls_selected.add(ball_instance)
+        self.balls_selected.update(
+            await BallInstance.filter(
+                id__in=[int(x.value) for x in self.select_ball_menu.options]
+            ).prefetch_related("ball", "player")
+        )
         await interaction.followup.send(
             (
                 f"All {settings.plural_collectible_name} on this page have been selected.\n"
@@ -533,25 +513,34 @@ class CountryballsSelector(Pages):
                     f"{settings.collectible_name.title()} #{ball.pk:0X} is not tradeable.",
                     ephemeral=True,
                 )
-            if await ball.is_locked():
-                return await interaction.followup.send(
-                    f"{settings.collectible_name.title()} #{ball.pk:0X} is locked "
-                    "for trade and won't be added to the proposal.",
-                    ephemeral=True,
-                )
+        ids = [ball.pk for ball in self.balls_selected]
+        if locked := self.bot.locked_balls.locked_among(ids):
+            return await interaction.followup.send(
+                f"{settings.collectible_name.title()} #{min(locked):0X} is locked "
+                "for trade and won't be added to the proposal.",
+                ephemeral=True,
+            )
+        if any(ball.favorite for ball in self.balls_selected):
             view = ConfirmChoiceView(interaction)
-            if ball.favorite:
-                await interaction.followup.send(
-                    f"One or more of the {settings.plural_collectible_name} is favorited, "
-                    "are you sure you want to add it to the trade?",
-                    view=view,
-                    ephemeral=True,
-                )
-                await view.wait()
-                if not view.value:
-                    return
-            trader.proposal.append(ball)
-            await ball.lock_for_trade()
+            await interaction.followup.send(
+                f"One or more of the {settings.plural_collectible_name} is favorited, "
+                "are you sure you want to add it to the trade?",
+                view=view,
+                ephemeral=True,
+            )
+            await view.wait()
+            if not view.value:
+                return
+        locked = await self.bot.locked_balls.lock(ids)
+        if len(locked) != len(ids):
+            # some were locked elsewhere while confirming
+            await self.bot.locked_balls.unlock(locked)
+            return await interaction.followup.send(
+                f"Some of the {settings.plural_collectible_name} were locked meanwhile, "
+                "nothing was added to the proposal.",
+                ephemeral=True,
+            )
+        trader.proposal.extend(self.balls_selected)
         grammar = (
             f"{settings.collectible_name}"
             if len(self.balls_selected) == 1
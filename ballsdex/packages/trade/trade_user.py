@@ -1,8 +1,6 @@
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from ballsdex.core.models import BlacklistedID
-
 if TYPE_CHECKING:
     import discord
 
@@ -22,11 +20,19 @@ class TradingUser:
 
     @classmethod
     async def from_trade_model(
-        cls, trade: "Trade", player: "Player", bot: "BallsDexBot", is_admin: bool = False
+        cls,
+        trade: "Trade",
+        player: "Player",
+        bot: "BallsDexBot",
+        is_admin: bool = False,
+        proposal: list["BallInstance"] | None = None,
     ):
-        proposal = await trade.tradeobjects.filter(player=player).prefetch_related("ballinstance")
-        user = await bot.fetch_user(player.discord_id)
-        blacklisted = (
-            await BlacklistedID.exists(discord_id=player.discord_id) if is_admin else None
-        )
-        return cls(user, player, [x.ballinstance for x in proposal], blacklisted=blacklisted)
+        """
+        Build the side of a past trade. Pass the proposal if it was already loaded.
+        """
+        if proposal is None:
+            objects = await trade.tradeobjects.filter(player=player).select_related("ballinstance")
+            proposal = [x.ballinstance for x in objects]
+        user = await bot.user_cache.get(player.discord_id)
+        blacklisted = player.discord_id in bot.blacklist if is_admin else None
+        return cls(user, player, proposal, blacklisted=blacklisted)
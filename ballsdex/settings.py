@@ -62,6 +62,40 @@ class Settings:
         List of packages the bot will load upon startup
     spawn_manager: str
         Python path to a class implementing `BaseSpawnManager`, handling cooldowns and anti-cheat
+    render_workers: int
+        Number of processes rendering cards, 0 to render in a thread of the bot process
+    render_queue_size: int
+        Maximum number of cards waiting to be rendered before new requests are rejected
+    render_layer_cache_size: int
+        Memory budget in megabytes of the pre-composited card layers, per render worker
+    render_disk_cache_path: str | None
+        Directory where encoded cards are cached, None to disable
+    render_disk_cache_size: int
+        Maximum size in megabytes of the encoded cards cache
+    render_asset_cache_path: str | None
+        Directory where decoded card assets are stored to be shared by the workers
+    render_preload_assets: bool
+        Prepare all card assets when loading the cache instead of on first use
+    spawn_asset_cache_size: int
+        Memory budget in megabytes of the spawn artworks kept in memory
+    spawn_asset_variants: int
+        Number of slightly altered copies of each spawn artwork to rotate through, 0 to disable
+    spawn_idle_timeout: int
+        Hours without messages after which the spawn state of a guild is dropped, 0 to disable
+    spawn_state_path: str | None
+        File where the spawn state of the guilds is saved to survive restarts
+    spawn_state_interval: int
+        Minutes between two saves of the spawn state and evictions of idle guilds
+    spawn_fast_path: bool
+        Count messages for spawns from the raw gateway payloads and disable the message cache
+    player_cache_owned_size: int
+        Memory budget in megabytes of the sets of countryballs owned by each player
+    player_cache_players: int
+        Maximum number of players whose ID and policies are kept in memory, 0 to disable
+    player_cache_relations: int
+        Maximum number of players whose friends and blocked users are kept in memory
+    player_cache_ttl: int
+        Seconds after which a cached player, their relations or collectibles are fetched again
     webhook_url: str | None
         URL of a Discord webhook for admin notifications
     client_id: str
@@ -110,8 +144,31 @@ class Settings:
     prometheus_host: str = "0.0.0.0"
     prometheus_port: int = 15260
 
+    # card rendering
+    render_workers: int = 2
+    render_queue_size: int = 64
+    render_layer_cache_size: int = 128
+    render_disk_cache_path: str | None = "./cache/cards"
+    render_disk_cache_size: int = 1024
+    render_asset_cache_path: str | None = "./cache/assets"
+    render_preload_assets: bool = True
+
     spawn_manager: str = "ballsdex.packages.countryballs.spawn.SpawnManager"
 
+    # spawns
+    spawn_asset_cache_size: int = 64
+    spawn_asset_variants: int = 0
+    spawn_idle_timeout: int = 24
+    spawn_state_path: str | None = "./cache/spawn-state.json"
+    spawn_state_interval: int = 5
+    spawn_fast_path: bool = False
+
+    # per-player caches
+    player_cache_owned_size: int = 16
+    player_cache_players: int = 50000
+    player_cache_relations: int = 50000
+    player_cache_ttl: int = 300
+
     # django admin panel
     webhook_url: str | None = None
     admin_url: str | None = None
@@ -166,6 +223,15 @@ def read_settings(path: "Path"):
     settings.prometheus_host = content["prometheus"]["host"]
     settings.prometheus_port = content["prometheus"]["port"]
 
+    if render := content.get("render"):
+        settings.render_workers = render.get("workers", 2)
+        settings.render_queue_size = render.get("queue-size", 64)
+        settings.render_layer_cache_size = render.get("layer-cache-size", 128)
+        settings.render_disk_cache_path = render.get("disk-cache-path", "./cache/cards")
+        settings.render_disk_cache_size = render.get("disk-cache-size", 1024)
+        settings.render_asset_cache_path = render.get("asset-cache-path", "./cache/assets")
+        settings.render_preload_assets = render.get("preload-assets", True)
+
     settings.max_favorites = content.get("max-favorites", 50)
     settings.max_attack_bonus = content.get("max-attack-bonus", 20)
     settings.max_health_bonus = content.get("max-health-bonus", 20)
@@ -184,6 +250,20 @@ def read_settings(path: "Path"):
         "spawn-manager", "ballsdex.packages.countryballs.spawn.SpawnManager"
     )
 
+    if spawn := content.get("spawn"):
+        settings.spawn_asset_cache_size = spawn.get("asset-cache-size", 64)
+        settings.spawn_asset_variants = spawn.get("asset-variants", 0)
+        settings.spawn_idle_timeout = spawn.get("idle-timeout", 24)
+        settings.spawn_state_path = spawn.get("state-path", "./cache/spawn-state.json")
+        settings.spawn_state_interval = spawn.get("state-interval", 5)
+        settings.spawn_fast_path = spawn.get("fast-path", False)
+
+    if player_cache := content.get("player-cache"):
+        settings.player_cache_owned_size = player_cache.get("owned-size", 16)
+        settings.player_cache_players = player_cache.get("players", 50000)
+        settings.player_cache_relations = player_cache.get("relations", 50000)
+        settings.player_cache_ttl = player_cache.get("ttl", 300)
+
     if admin := content.get("admin-panel"):
         settings.webhook_url = admin.get("webhook-url")
         settings.client_id = admin.get("client-id")
@@ -323,8 +403,62 @@ prometheus:
   host: "0.0.0.0"
   port: 15260
 
+# card rendering, done in separate processes to keep the bot responsive
+render:
+  # number of worker processes, 0 renders cards in a thread of the bot process
+  workers: 2
+  # maximum number of cards waiting to be rendered before new requests are rejected
+  queue-size: 64
+  # memory budget in megabytes of the pre-composited card layers, per worker
+  # a card layer is about 11MB, popular cards will always be served from memory
+  layer-cache-size: 128
+  # directory where encoded cards are kept to avoid rendering them again, leave empty to disable
+  disk-cache-path: ./cache/cards
+  # maximum size in megabytes of the encoded cards directory
+  disk-cache-size: 1024
+  # directory where decoded artworks and backgrounds are shared between workers
+  # leave empty to decode them on every render
+  asset-cache-path: ./cache/assets
+  # decode all assets when loading the cache, disable if you have thousands of collectibles
+  # to prepare them on first use instead
+  preload-assets: true
+
 spawn-manager: ballsdex.packages.countryballs.spawn.SpawnManager
 
+# spawned collectibles
+spawn:
+  # memory budget in megabytes of the spawn artworks kept in memory
+  asset-cache-size: 64
+  # number of slightly altered copies of each spawn artwork, generated in the background and
+  # rotated through so that two spawns of the same collectible never upload the same file
+  # 0 uploads the original artwork every time
+  asset-variants: 0
+  # hours without messages after which the spawn progress of a server is forgotten
+  # 0 keeps every server in memory
+  idle-timeout: 24
+  # file where the spawn progress of the servers is saved to survive restarts
+  # leave empty to start from scratch on every restart, use a different file per cluster
+  state-path: ./cache/spawn-state.json
+  # minutes between two saves of the spawn progress
+  state-interval: 5
+  # count messages for spawns straight from the gateway payloads, without building full
+  # message objects, and disable the message cache. Saves CPU and memory on large bots
+  # other packages listening to messages will only receive the owners' messages
+  fast-path: false
+
+# data about the players kept in memory
+player-cache:
+  # memory budget in megabytes of the collectibles owned by each player, used for completion
+  # and comparisons. A player takes about 400 bytes with 1000 collectibles, 0 to disable
+  owned-size: 16
+  # number of players whose ID and policies are kept to avoid a query on most commands
+  # a player takes about 300 bytes, 0 to disable
+  players: 50000
+  # number of players whose friends and blocked users are kept, for friendship and block checks
+  relations: 50000
+  # seconds after which a player is fetched again, in case of edits not seen by the bot
+  ttl: 300
+
 # sentry details, leave empty if you don't know what this is
 # https://sentry.io/ for error tracking
 sentry:
@@ -374,6 +508,9 @@ def update_settings(path: "Path"):
     add_django = "Admin panel related settings" not in content
     add_sentry = "sentry:" not in content
     add_catch_messages = "catch:" not in content
+    add_render = "render:" not in content
+    add_spawn = "spawn:" not in content
+    add_player_cache = "player-cache:" not in content
 
     for line in content.splitlines():
         if line.startswith("owners:"):
@@ -499,6 +636,69 @@ catch:
     - "{user} Sorry, this {collectible} was caught already!"
 """
 
+    if add_render:
+        content += """
+# card rendering, done in separate processes to keep the bot responsive
+render:
+  # number of worker processes, 0 renders cards in a thread of the bot process
+  workers: 2
+  # maximum number of cards waiting to be rendered before new requests are rejected
+  queue-size: 64
+  # memory budget in megabytes of the pre-composited card layers, per worker
+  # a card layer is about 11MB, popular cards will always be served from memory
+  layer-cache-size: 128
+  # directory where encoded cards are kept to avoid rendering them again, leave empty to disable
+  disk-cache-path: ./cache/cards
+  # maximum size in megabytes of the encoded cards directory
+  disk-cache-size: 1024
+  # directory where decoded artworks and backgrounds are shared between workers
+  # leave empty to decode them on every render
+  asset-cache-path: ./cache/assets
+  # decode all assets when loading the cache, disable if you have thousands of collectibles
+  # to prepare them on first use instead
+  preload-assets: true
+"""
+
+    if add_spawn:
+        content += """
+# spawned collectibles
+spawn:
+  # memory budget in megabytes of the spawn artworks kept in memory
+  asset-cache-size: 64
+  # number of slightly altered copies of each spawn artwork, generated in the background and
+  # rotated through so that two spawns of the same collectible never upload the same file
+  # 0 uploads the original artwork every time
+  asset-variants: 0
+  # hours without messages after which the spawn progress of a server is forgotten
+  # 0 keeps every server in memory
+  idle-timeout: 24
+  # file where the spawn progress of the servers is saved to survive restarts
+  # leave empty to start from scratch on every restart, use a different file per cluster
+  state-path: ./cache/spawn-state.json
+  # minutes between two saves of the spawn progress
+  state-interval: 5
+  # count messages for spawns straight from the gateway payloads, without building full
+  # message objects, and disable the message cache. Saves CPU and memory on large bots
+  # other packages listening to messages will only receive the owners' messages
+  fast-path: false
+"""
+
+    if add_player_cache:
+        content += """
+# data about the players kept in memory
+player-cache:
+  # memory budget in megabytes of the collectibles owned by each player, used for completion
+  # and comparisons. A player takes about 400 bytes with 1000 collectibles, 0 to disable
+  owned-size: 16
+  # number of players whose ID and policies are kept to avoid a query on most commands
+  # a player takes about 300 bytes, 0 to disable
+  players: 50000
+  # number of players whose friends and blocked users are kept, for friendship and block checks
+  relations: 50000
+  # seconds after which a player is fetched again, in case of edits not seen by the bot
+  ttl: 300
+"""
+
     if any(
         (
             add_owners,
@@ -512,6 +712,9 @@ catch:
             add_django,
             add_sentry,
             add_catch_messages,
+            add_render,
+            add_spawn,
+            add_player_cache,
         )
     ):
         path.write_text(content)